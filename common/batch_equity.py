@@ -0,0 +1,192 @@
+"""
+This module computes heads-up equity matrices for every pair of starting
+hands with NumPy.
+
+For each complete board, all 1326 combos are evaluated at once with array
+lookups into the evaluator's tables, and the whole 1326x1326 win/loss matrix
+for that board is a single broadcast comparison. Combos that collide with the
+board are given a sentinel value and corrected for afterwards with matrix
+products over the per-board validity masks, so no per-pair Python code runs.
+
+NumPy is an optional dependency; it is only needed by this module.
+"""
+import itertools
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError('common.batch_equity requires NumPy (pip install numpy).') from error
+
+import common.cards
+import common.evaluator
+import common.hands
+
+
+DEFAULT_NUMBER_OF_BOARDS = 5_000
+BOARD_CHUNK_SIZE = 256
+
+_LOOKUPS = {}
+
+
+def equity_matrix(board=(), dead=(), number_of_boards: int = DEFAULT_NUMBER_OF_BOARDS, rng=None,
+                  by_hand_class: bool = False) -> 'np.ndarray':
+    """
+    Returns the matrix of row-hand equity against column-hand.
+
+    With three or more board cards every runout is enumerated. Preflop,
+    number_of_boards boards are sampled uniformly.
+
+    Args:
+        board: The board cards dealt so far (0, 3, 4 or 5).
+        dead: Cards that cannot appear in either hand or on the board.
+        number_of_boards: Number of boards to sample preflop.
+        rng: A numpy.random.Generator used for preflop sampling.
+        by_hand_class: Return the 169x169 hand class matrix (see
+          common.hands.HAND_CLASSES) instead of the 1326x1326 combo matrix.
+
+    Returns:
+        A float64 array. Entry [i, j] is hand i's equity against hand j; it is
+        NaN where the two hands share a card or either collides with the board
+        or dead cards.
+    """
+    board_codes = common.cards.to_codes(board)
+    if len(board_codes) not in (0, 3, 4, 5):
+        raise ValueError(f'A board of {len(board_codes)} cards is not valid.')
+    dead_mask = common.cards.to_mask(board_codes) | common.cards.to_mask(dead)
+    boards = _boards(board_codes=board_codes, dead_mask=dead_mask,
+                     number_of_boards=number_of_boards, rng=rng)
+
+    dead_combos = _combo_masks() & np.uint64(dead_mask) != 0
+    score = np.zeros((common.hands.NUMBER_OF_COMBOS, common.hands.NUMBER_OF_COMBOS), dtype=np.int64)
+    # Per-board comparisons run on int16 dense ranks, which keeps the hot
+    # loop in narrow integers; a chunk never exceeds the int16 range.
+    chunk_score = np.zeros_like(score, dtype=np.int16)
+    difference = np.empty_like(chunk_score)
+    valid_counts = []
+    for i_start in range(0, len(boards), BOARD_CHUNK_SIZE):
+        i_values = evaluate_combos(boards=boards[i_start:i_start + BOARD_CHUNK_SIZE])
+        i_values[:, dead_combos] = -1
+        chunk_score.fill(0)
+        for i_board_ranks in _dense_ranks(values=i_values):
+            np.subtract.outer(i_board_ranks, i_board_ranks, out=difference)
+            np.sign(difference, out=difference)
+            chunk_score += difference
+        score += chunk_score
+        valid_counts.append(i_values >= 0)
+
+    valid = np.concatenate(valid_counts).astype(np.float64)
+    invalid = 1.0 - valid
+    # Valid-vs-invalid pairs scored +1 and invalid-vs-valid -1; take them out.
+    score = score - valid.T @ invalid + invalid.T @ valid
+    count = valid.T @ valid
+
+    if by_hand_class:
+        class_matrix = _class_indicator()
+        score = class_matrix.T @ (score * _no_conflicts()) @ class_matrix
+        count = class_matrix.T @ (count * _no_conflicts()) @ class_matrix
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        equity = (score / count + 1.0) / 2.0
+    equity[count == 0] = np.nan
+    if not by_hand_class:
+        equity[~_no_conflicts().astype(bool)] = np.nan
+    return equity
+
+
+def evaluate_combos(boards: 'np.ndarray') -> 'np.ndarray':
+    """
+    Returns an int64 array of shape (number of boards, 1326) with the value of
+    every combo on every five-card board. Entries for combos that share a card
+    with their board are -1.
+    """
+    rank_keys, suit_keys, rank_bits, non_flush_keys, non_flush_values, flush_table = _lookups()
+    boards = np.asarray(boards, dtype=np.int64)
+    combos = np.asarray(common.hands.COMBOS, dtype=np.int64)
+
+    board_rank_key = rank_keys[boards].sum(axis=1)
+    board_suit_key = suit_keys[boards].sum(axis=1)
+    rank_key = board_rank_key[:, None] + rank_keys[combos].sum(axis=1)[None, :]
+    suit_key = common.evaluator.SUIT_KEY_START + board_suit_key[:, None] + suit_keys[combos].sum(axis=1)[None, :]
+
+    # Keys of combos that collide with the board may be missing; they are
+    # overwritten below, so just keep the search in bounds.
+    key_positions = np.minimum(np.searchsorted(non_flush_keys, rank_key), len(non_flush_keys) - 1)
+    values = non_flush_values[key_positions]
+    for i_suit in range(4):
+        i_is_flush = (suit_key >> (4 * i_suit + 3)) & 1 == 1
+        if not i_is_flush.any():
+            continue
+        i_board_mask = np.where(boards & 3 == i_suit, rank_bits[boards], 0).sum(axis=1)
+        i_combo_mask = np.where(combos & 3 == i_suit, rank_bits[combos], 0).sum(axis=1)
+        i_rank_mask = i_board_mask[:, None] | i_combo_mask[None, :]
+        values = np.where(i_is_flush, flush_table[i_rank_mask], values)
+
+    board_masks = (np.uint64(1) << boards.astype(np.uint64)).sum(axis=1, dtype=np.uint64)
+    collides = board_masks[:, None] & _combo_masks()[None, :] != 0
+    values[collides] = -1
+    return values
+
+
+# Helpers
+
+def _dense_ranks(values: 'np.ndarray') -> 'np.ndarray':
+    """
+    Replaces each row of values by int16 dense ranks (0 for the lowest value),
+    which order the combos exactly as the values do.
+    """
+    order = np.argsort(values, axis=1)
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    steps = np.zeros(values.shape, dtype=np.int16)
+    steps[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+    ranks = np.empty_like(steps)
+    np.put_along_axis(ranks, order, np.cumsum(steps, axis=1, dtype=np.int16), axis=1)
+    return ranks
+
+
+def _boards(board_codes: list[int], dead_mask: int, number_of_boards: int, rng) -> 'np.ndarray':
+    live = [i_code for i_code in range(52) if not dead_mask >> i_code & 1]
+    runout_size = 5 - len(board_codes)
+    if board_codes:
+        runouts = np.array(list(itertools.combinations(live, runout_size)), dtype=np.int64)
+        runouts = runouts.reshape(len(runouts), runout_size)
+        prefix = np.broadcast_to(np.asarray(board_codes, dtype=np.int64), (len(runouts), len(board_codes)))
+        return np.concatenate([prefix, runouts], axis=1)
+    rng = rng or np.random.default_rng()
+    keys = rng.random((number_of_boards, len(live)))
+    return np.asarray(live, dtype=np.int64)[np.argpartition(keys, 5, axis=1)[:, :5]]
+
+
+def _lookups() -> tuple:
+    if not _LOOKUPS:
+        non_flush_table, flush_table = common.evaluator.lookup_tables()
+        non_flush_keys = np.array(sorted(non_flush_table), dtype=np.int64)
+        _LOOKUPS['tables'] = (
+            np.array(common.evaluator.RANK_KEYS, dtype=np.int64),
+            np.array(common.evaluator.SUIT_KEYS, dtype=np.int64),
+            np.array(common.evaluator.RANK_BITS, dtype=np.int64),
+            non_flush_keys,
+            np.array([non_flush_table[i_key] for i_key in non_flush_keys.tolist()], dtype=np.int64),
+            np.array(flush_table, dtype=np.int64),
+        )
+        masks = np.array(common.hands.COMBO_MASKS, dtype=np.uint64)
+        _LOOKUPS['combo_masks'] = masks
+        _LOOKUPS['no_conflicts'] = (masks[:, None] & masks[None, :] == 0).astype(np.float64)
+        indicator = np.zeros((common.hands.NUMBER_OF_COMBOS, common.hands.NUMBER_OF_HAND_CLASSES))
+        indicator[np.arange(common.hands.NUMBER_OF_COMBOS), common.hands.COMBO_HAND_CLASSES] = 1.0
+        _LOOKUPS['class_indicator'] = indicator
+    return _LOOKUPS['tables']
+
+
+def _combo_masks() -> 'np.ndarray':
+    _lookups()
+    return _LOOKUPS['combo_masks']
+
+
+def _no_conflicts() -> 'np.ndarray':
+    _lookups()
+    return _LOOKUPS['no_conflicts']
+
+
+def _class_indicator() -> 'np.ndarray':
+    _lookups()
+    return _LOOKUPS['class_indicator']
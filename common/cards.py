@@ -1,53 +1,175 @@
+"""
+This module contains the Card and Deck classes.
+
+Cards are encoded as small integers (0-51): code = rank_index * 4 + suit_index,
+with ranks ordered deuce to ace and suits ordered clubs, diamonds, hearts,
+spades. Only 52 Card objects ever exist; Card(rank, suit) returns the interned
+instance for that code, so dealing, comparing and hashing cards never
+allocates. Anything that wants to work on the integer encoding directly can
+use Card.code / Card.mask and Card.from_code().
+"""
 import random
 
 
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A')
+SUITS = ('c', 'd', 'h', 's')
+
+_RANK_INDEX = {}
+for _i, _rank in enumerate(RANKS):
+    _RANK_INDEX[_rank] = _i
+    _RANK_INDEX[_rank.lower()] = _i
+
+_SUIT_INDEX = {}
+for _i, _suit in enumerate(SUITS):
+    _SUIT_INDEX[_suit] = _i
+    _SUIT_INDEX[_suit.upper()] = _i
+
+
 class Card:
+    """
+    This class represents a single playing card.
 
-    def __init__(self, rank: str, suit: str) -> None:
-        self._verify_rank(value=rank)
-        self._verify_suit(value=suit)
-        self._rank = rank
-        self._suit = suit
-        self._dealt = False
-        return
+    Card objects are flyweights: there is exactly one instance per card, so
+    Card('A', 's') is Card('a', 'S'). A Card carries no per-deck state; whether
+    a card has been dealt is tracked by the Deck that dealt it.
+
+    Attributes:
+        rank: A string with the card's rank ('2'-'9', 'T', 'J', 'Q', 'K', 'A').
+        suit: A string with the card's suit ('c', 'd', 'h', 's').
+        code: An integer (0-51) encoding the card.
+    """
+
+    __slots__ = ('_code',)
+
+    def __new__(cls, rank: str, suit: str) -> 'Card':
+        rank_index = cls._verify_rank(value=rank)
+        suit_index = cls._verify_suit(value=suit)
+        return CARDS[rank_index * 4 + suit_index]
+
+    @classmethod
+    def from_code(cls, code: int) -> 'Card':
+        return CARDS[code]
+
+    @classmethod
+    def from_string(cls, value: str) -> 'Card':
+        """
+        Returns the Card for a two-character string such as 'As' or 'td'.
+        """
+        if len(value) != 2:
+            raise ValueError(f"Invalid card '{value}' given.")
+        return cls(rank=value[0], suit=value[1])
 
     @property
     def rank(self) -> str:
-        return self._rank.upper()
+        return RANKS[self._code >> 2]
 
     @property
     def suit(self) -> str:
-        return self._suit.lower()
+        return SUITS[self._code & 3]
 
     @property
-    def dealt(self) -> bool:
-        return self._dealt
+    def code(self) -> int:
+        return self._code
 
-    @dealt.setter
-    def dealt(self, value) -> None:
-        self._dealt = value
-        return
+    @property
+    def rank_index(self) -> int:
+        return self._code >> 2
+
+    @property
+    def suit_index(self) -> int:
+        return self._code & 3
+
+    @property
+    def mask(self) -> int:
+        return 1 << self._code
 
     @staticmethod
-    def _verify_rank(value: str) -> None:
-        if value.upper() not in ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']:
-            raise ValueError(f"Invalid card rank '{value}' given.")
-        return
+    def _verify_rank(value: str) -> int:
+        try:
+            return _RANK_INDEX[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid card rank '{value}' given.") from None
 
     @staticmethod
-    def _verify_suit(value: str) -> None:
-        if value.lower() not in ['c', 'd', 'h', 's']:
-            raise ValueError(f"Invalid card suit '{value}' given.")
-        return
+    def _verify_suit(value: str) -> int:
+        try:
+            return _SUIT_INDEX[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid card suit '{value}' given.") from None
+
+    def __int__(self) -> int:
+        return self._code
+
+    def __lt__(self, other: 'Card') -> bool:
+        return self._code < other._code
+
+    def __reduce__(self) -> tuple:
+        return Card.from_code, (self._code,)
+
+    def __copy__(self) -> 'Card':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Card':
+        return self
 
     def __repr__(self) -> str:
         return f'{self.rank}{self.suit}'
 
 
+def _build_cards() -> tuple:
+    cards = []
+    for i_code in range(52):
+        i_card = object.__new__(Card)
+        i_card._code = i_code
+        cards.append(i_card)
+    return tuple(cards)
+
+
+CARDS = _build_cards()
+
+
+def to_codes(cards) -> list[int]:
+    """
+    Returns the integer codes for an iterable of Cards and/or integer codes.
+    """
+    return [i_card if type(i_card) is int else i_card.code for i_card in cards]
+
+
+def to_mask(cards) -> int:
+    """
+    Returns the 52-bit mask for an iterable of Cards and/or integer codes.
+    """
+    mask = 0
+    for i_code in to_codes(cards):
+        mask |= 1 << i_code
+    return mask
+
+
+_IDENTITY_POSITIONS = tuple(range(52))
+
+
 class Deck:
+    """
+    This class represents a deck of cards.
+
+    The deck is a single 52-slot array split by a live boundary: the cards in
+    front of the boundary have not been dealt, the cards behind it have. Dealing
+    swaps a random live card to the end of the live section and moves the
+    boundary down (one step of a Fisher-Yates shuffle); returning a card swaps
+    it back in front of the boundary using a code-to-position index. Both are
+    O(1), as are the dealt/not dealt counters.
+
+    Attributes:
+        rng: The random.Random-like generator cards are dealt with (see
+          common.rng). Defaults to the random module.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, rng=None) -> None:
+        self.rng = rng or random
         self._cards = []
+        self._positions = []
+        self._number_not_dealt = 0
+        self._dealt_mask = 0
         self.shuffle()
         return
 
@@ -59,33 +181,50 @@ class Deck:
 
     @property
     def list_of_all_cards_dealt(self) -> list[Card]:
-        card_list = []
-        for i_card in self.list_of_all_cards:
-            if i_card.dealt:
-                card_list.append(i_card)
-        return card_list
+        return self._cards[self._number_not_dealt:]
 
     @property
     def list_of_all_cards_not_dealt(self) -> list[Card]:
-        card_list = []
-        for i_card in self.list_of_all_cards:
-            if not i_card.dealt:
-                card_list.append(i_card)
-        return card_list
+        return self._cards[:self._number_not_dealt]
+
+    @property
+    def dealt_mask(self) -> int:
+        return self._dealt_mask
 
     @property
     def number_of_cards_dealt(self) -> int:
-        return len(self.list_of_all_cards_dealt)
+        return 52 - self._number_not_dealt
 
     @property
     def number_of_cards_not_dealt(self) -> int:
-        return len(self.list_of_all_cards_not_dealt)
+        return self._number_not_dealt
+
+    def is_dealt(self, card: Card) -> bool:
+        return self._positions[card.code] >= self._number_not_dealt
 
     # Actions
 
     def deal_card(self) -> Card:
-        card = random.choice(self.list_of_all_cards_not_dealt)
-        card.dealt = True
+        if self._number_not_dealt == 0:
+            raise RuntimeError("No cards left in the deck.")
+        last = self._number_not_dealt - 1
+        # int(random() * n) rather than randrange(n): one C call per card.
+        self._swap(i=int(self.rng.random() * self._number_not_dealt), j=last)
+        self._number_not_dealt = last
+        card = self._cards[last]
+        self._dealt_mask |= 1 << card.code
+        return card
+
+    def deal_specific_card(self, card: Card) -> Card:
+        """
+        Deals the given card (e.g. one picked from a range) out of the deck.
+        """
+        if self.is_dealt(card=card):
+            raise ValueError(f"Card {card} has already been dealt.")
+        last = self._number_not_dealt - 1
+        self._swap(i=self._positions[card.code], j=last)
+        self._number_not_dealt = last
+        self._dealt_mask |= 1 << card.code
         return card
 
     def deal_cards(self, number_of_cards) -> list[Card]:
@@ -96,18 +235,48 @@ class Deck:
 
     def return_card_to_deck(self, card: Card) -> None:
         self._verify_card_belongs_to_this_deck(card=card)
-        card.dealt = False
+        self._swap(i=self._positions[card.code], j=self._number_not_dealt)
+        self._number_not_dealt += 1
+        self._dealt_mask &= ~(1 << card.code)
         return
 
     def shuffle(self) -> None:
-        self._cards = []
-        for i_rank in ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']:
-            for i_suit in ['c', 'd', 'h', 's']:
-                i_card = Card(rank=i_rank, suit=i_suit)
-                self._cards.append(i_card)
+        """
+        Gathers every card back into the deck, reusing the deck's lists.
+        """
+        self._cards[:] = CARDS
+        self._positions[:] = _IDENTITY_POSITIONS
+        self._number_not_dealt = 52
+        self._dealt_mask = 0
+        return
+
+    def restore(self, dealt_mask: int) -> None:
+        """
+        Gathers the deck and deals exactly the cards in dealt_mask out of it
+        again (e.g. to return to a Table snapshot).
+        """
+        self.shuffle()
+        while dealt_mask:
+            low_bit = dealt_mask & -dealt_mask
+            self.deal_specific_card(card=CARDS[low_bit.bit_length() - 1])
+            dealt_mask ^= low_bit
+        return
+
+    def _swap(self, i: int, j: int) -> None:
+        cards = self._cards
+        card_i = cards[i]
+        card_j = cards[j]
+        cards[i] = card_j
+        cards[j] = card_i
+        self._positions[card_j.code] = i
+        self._positions[card_i.code] = j
         return
 
     def _verify_card_belongs_to_this_deck(self, card: Card) -> None:
-        if card not in self._cards:
-            raise ValueError(f"Card {card} belongs to a different deck.")
+        """
+        Cards are shared between decks, so a card "belongs" to this deck only
+        while it is dealt out of it.
+        """
+        if not self.is_dealt(card=card):
+            raise ValueError(f"Card {card} was not dealt from this deck.")
         return
@@ -0,0 +1,451 @@
+"""
+This module computes Hero's equity against Villain.
+
+calculate_equity() picks the method: when the number of (Villain hand, runout)
+pairs is at most ENUMERATION_THRESHOLD, every one of them is enumerated for an
+exact answer (enumerate_equity()); otherwise they are sampled
+(monte_carlo_equity()).
+
+Villain may be given as a single hand, as a collection of hands (sampled
+uniformly), as a common.ranges.Range (sampled by weight) or as None (any two
+cards not otherwise dead). The board may
+hold 0, 3, 4 or 5 cards; the remaining board cards are drawn from whatever is
+not dead.
+
+multiway_equity() does the same against several Villains at once. Every
+runout is evaluated once per player and Hero's value is compared with the
+best Villain value, so the cost grows linearly with the number of players.
+"""
+import itertools
+import math
+import random
+import time
+
+import common.cards
+import common.evaluator
+import common.hands
+import common.ranges
+
+
+DEFAULT_MAX_TRIALS = 200_000
+BATCH_SIZE = 500
+ENUMERATION_THRESHOLD = 50_000
+# Redraws of a Villain hand that collides with another Villain's before giving up.
+MAX_VILLAIN_DRAWS = 1000
+
+
+class EquityResult:
+    """
+    Accumulated showdown outcomes from Hero's point of view.
+
+    Attributes:
+        wins: Number of runouts Hero wins outright.
+        ties: Number of runouts that split the pot.
+        losses: Number of runouts Hero loses.
+        trials: Total number of runouts counted.
+        tie_equity: Hero's total share of the split pots: half per tie
+          heads-up, 1/k per k-way split in a multi-way pot.
+        equity: Hero's share of the pot.
+        standard_error: Standard error of equity (0.0 for exact results).
+        exact: True if every runout was enumerated instead of sampled.
+
+    Counts are fractional when runouts are weighted by a Villain range.
+    """
+
+    def __init__(self, wins: int = 0, ties: int = 0, losses: int = 0, exact: bool = False) -> None:
+        self._wins = wins
+        self._ties = ties
+        self._losses = losses
+        self._tie_equity = 0.5 * ties
+        # Sum of squared tie shares, for the standard error.
+        self._tie_equity_squares = 0.25 * ties
+        self._exact = exact
+        return
+
+    @property
+    def wins(self) -> int:
+        return self._wins
+
+    @property
+    def ties(self) -> int:
+        return self._ties
+
+    @property
+    def losses(self) -> int:
+        return self._losses
+
+    @property
+    def trials(self) -> int:
+        return self._wins + self._ties + self._losses
+
+    @property
+    def tie_equity(self) -> float:
+        return self._tie_equity
+
+    @property
+    def tie_equity_squares(self) -> float:
+        return self._tie_equity_squares
+
+    @property
+    def exact(self) -> bool:
+        return self._exact
+
+    @property
+    def equity(self) -> float:
+        if self.trials == 0:
+            return 0.0
+        return (self._wins + self._tie_equity) / self.trials
+
+    @property
+    def standard_error(self) -> float:
+        trials = self.trials
+        if self._exact or trials < 2:
+            return 0.0
+        mean = self.equity
+        mean_of_squares = (self._wins + self._tie_equity_squares) / trials
+        variance = max(mean_of_squares - mean * mean, 0.0)
+        return math.sqrt(variance / trials)
+
+    def add(self, wins: int, ties: int, losses: int, tie_equity: float = None,
+            tie_equity_squares: float = None) -> None:
+        """
+        Adds outcomes. tie_equity (and its squares) default to heads-up
+        splits, half a pot per tie.
+        """
+        self._wins += wins
+        self._ties += ties
+        self._losses += losses
+        self._tie_equity += 0.5 * ties if tie_equity is None else tie_equity
+        self._tie_equity_squares += 0.25 * ties if tie_equity_squares is None else tie_equity_squares
+        return
+
+    def __str__(self) -> str:
+        if self._exact:
+            return f'Equity: {self.equity:.2%} (exact, {round(self.trials)} runouts)'
+        return f'Equity: {self.equity:.2%} ± {self.standard_error:.2%} ({round(self.trials)} trials)'
+
+
+def calculate_equity(hero, villain=None, board=(), dead=(),
+                     enumeration_threshold: int = ENUMERATION_THRESHOLD, **kwargs) -> EquityResult:
+    """
+    Returns Hero's equity, exact if the enumeration is small enough and
+    sampled otherwise.
+
+    Args:
+        enumeration_threshold: Largest number of runouts to enumerate.
+        **kwargs: Passed to monte_carlo_equity() if sampling is used.
+        See monte_carlo_equity() for the other arguments.
+    """
+    if count_runouts(hero=hero, villain=villain, board=board, dead=dead) <= enumeration_threshold:
+        return enumerate_equity(hero=hero, villain=villain, board=board, dead=dead)
+    return monte_carlo_equity(hero=hero, villain=villain, board=board, dead=dead, **kwargs)
+
+
+# Enumeration
+
+def count_runouts(hero, villain=None, board=(), dead=()) -> int:
+    """
+    Returns the number of (Villain hand, board runout) pairs that
+    enumerate_equity() would visit.
+    """
+    hero_codes, board_codes, dead_mask = verify_cards(hero=hero, board=board, dead=dead)
+    villain_combos = len(villain_range(villain=villain, dead_mask=dead_mask))
+    number_of_live_cards = 52 - bin(dead_mask).count('1')
+    return villain_combos * math.comb(number_of_live_cards - 2, 5 - len(board_codes))
+
+
+def enumerate_equity(hero, villain=None, board=(), dead=()) -> EquityResult:
+    """
+    Computes Hero's exact equity by visiting every Villain hand and every
+    board runout from the cards that are not dead. Runouts are generated
+    lazily, one at a time. Arguments are as for monte_carlo_equity().
+
+    With a weighted Villain range, each runout counts as the weight of the
+    Villain hand it was dealt against, so the counts may be fractional.
+    """
+    hero_codes, board_codes, dead_mask = verify_cards(hero=hero, board=board, dead=dead)
+    villain_combos, villain_weights = combos_and_weights(
+        villain_range=villain_range(villain=villain, dead_mask=dead_mask))
+    live = [i_code for i_code in range(52) if not dead_mask >> i_code & 1]
+    runout_size = 5 - len(board_codes)
+    evaluate_codes = common.evaluator.evaluate_codes
+
+    result = EquityResult(exact=True)
+    for (i_villain_codes, i_weight) in zip(villain_combos, villain_weights or itertools.repeat(1)):
+        i_live = [i_code for i_code in live if i_code not in i_villain_codes]
+        wins = ties = losses = 0
+        for i_runout in itertools.combinations(i_live, runout_size):
+            i_full_board = board_codes + list(i_runout)
+            hero_value = evaluate_codes(hero_codes + i_full_board)
+            villain_value = evaluate_codes(i_villain_codes + i_full_board)
+            if hero_value > villain_value:
+                wins += 1
+            elif hero_value == villain_value:
+                ties += 1
+            else:
+                losses += 1
+        result.add(wins=wins * i_weight, ties=ties * i_weight, losses=losses * i_weight)
+    return result
+
+
+# Monte Carlo
+
+def monte_carlo_equity(hero, villain=None, board=(), dead=(), target_standard_error: float = None,
+                       time_budget: float = None, max_trials: int = DEFAULT_MAX_TRIALS,
+                       rng=None) -> EquityResult:
+    """
+    Estimates Hero's equity by sampling Villain hands and board runouts.
+
+    Sampling runs in batches and stops at the first batch boundary where
+    max_trials is reached, the standard error drops to target_standard_error,
+    or time_budget seconds have elapsed.
+
+    Args:
+        hero: Hero's two hole cards (Cards or integer codes).
+        villain: Villain's hand, a collection of hands, a Range, or None for
+          any hand.
+        board: The board cards dealt so far.
+        dead: Other cards that can appear neither in Villain's hand nor on the
+          board (e.g. Deck.list_of_all_cards_dealt). May overlap hero/board
+          but must not include Villain's own cards.
+        target_standard_error: Stop once the standard error is this small.
+        time_budget: Stop after roughly this many seconds.
+        max_trials: Hard cap on the number of trials.
+        rng: A random.Random-like object. Defaults to the random module.
+    """
+    hero_codes, board_codes, dead_mask = verify_cards(hero=hero, board=board, dead=dead)
+    villain_combos, villain_weights = combos_and_weights(
+        villain_range=villain_range(villain=villain, dead_mask=dead_mask))
+    cumulative_weights = None if villain_weights is None else list(itertools.accumulate(villain_weights))
+    rng = rng or random
+
+    live = [i_code for i_code in range(52) if not dead_mask >> i_code & 1]
+    runout_size = 5 - len(board_codes)
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    result = EquityResult()
+    while result.trials < max_trials:
+        batch_size = min(BATCH_SIZE, max_trials - result.trials)
+        result.add(*_sample_batch(hero_codes=hero_codes, board_codes=board_codes,
+                                  villain_combos=villain_combos, cumulative_weights=cumulative_weights, live=live,
+                                  runout_size=runout_size, batch_size=batch_size, rng=rng))
+        if target_standard_error is not None and result.standard_error <= target_standard_error:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return result
+
+
+def _sample_batch(hero_codes: list, board_codes: list, villain_combos: list, cumulative_weights: list,
+                  live: list, runout_size: int, batch_size: int, rng) -> tuple[int, int, int]:
+    evaluate_codes = common.evaluator.evaluate_codes
+    sample = rng.sample
+    if cumulative_weights is None:
+        randrange = rng.randrange
+        number_of_combos = len(villain_combos)
+        villain_hands = (villain_combos[randrange(number_of_combos)] for _ in range(batch_size))
+    else:
+        villain_hands = rng.choices(villain_combos, cum_weights=cumulative_weights, k=batch_size)
+    wins = ties = losses = 0
+    for villain_codes in villain_hands:
+        # Draw two spare cards so that Villain's cards can be skipped.
+        drawn = sample(live, runout_size + 2)
+        runout = [i_code for i_code in drawn if i_code not in villain_codes][:runout_size]
+        full_board = board_codes + runout
+        hero_value = evaluate_codes(hero_codes + full_board)
+        villain_value = evaluate_codes(villain_codes + full_board)
+        if hero_value > villain_value:
+            wins += 1
+        elif hero_value == villain_value:
+            ties += 1
+        else:
+            losses += 1
+    return wins, ties, losses
+
+
+# Multi-way
+
+def multiway_equity(hero, villains: list, board=(), dead=(), enumeration_threshold: int = ENUMERATION_THRESHOLD,
+                    target_standard_error: float = None, time_budget: float = None,
+                    max_trials: int = DEFAULT_MAX_TRIALS, rng=None) -> EquityResult:
+    """
+    Returns Hero's equity against several Villains. Hero wins a runout by
+    beating every Villain and splits it k ways when tied with k - 1 of the
+    best Villains.
+
+    If every Villain holds a known hand and there are at most
+    enumeration_threshold runouts, they are all enumerated; otherwise Villain
+    hands and runouts are sampled (with the stopping rules of
+    monte_carlo_equity()).
+
+    Args:
+        villains: One entry per Villain, each anything villain_range()
+          accepts (a hand, a collection of hands, a Range or None).
+        See monte_carlo_equity() for the other arguments. dead must not
+          include any Villain's own cards.
+    """
+    hero_codes, board_codes, dead_mask = verify_cards(hero=hero, board=board, dead=dead)
+    if not villains:
+        raise ValueError('At least one villain must be given.')
+    villain_ranges = [villain_range(villain=i_villain, dead_mask=dead_mask) for i_villain in villains]
+    runout_size = 5 - len(board_codes)
+
+    if all(len(i_range) == 1 for i_range in villain_ranges):
+        villain_hands = [combos_and_weights(villain_range=i_range)[0][0] for i_range in villain_ranges]
+        used_codes = [i_code for i_hand in villain_hands for i_code in i_hand]
+        if len(set(used_codes)) != len(used_codes):
+            raise ValueError('Two villains share a card.')
+        live = [i_code for i_code in range(52) if not dead_mask >> i_code & 1 and i_code not in used_codes]
+        if math.comb(len(live), runout_size) <= enumeration_threshold:
+            result = EquityResult(exact=True)
+            result.add(*_showdowns(hero_codes=hero_codes, board_codes=board_codes, villain_hands=villain_hands,
+                                   runouts=itertools.combinations(live, runout_size)))
+            return result
+
+    villain_samplers = []
+    for i_range in villain_ranges:
+        i_combos, i_weights = combos_and_weights(villain_range=i_range)
+        i_cumulative = None if i_weights is None else list(itertools.accumulate(i_weights))
+        villain_samplers.append((i_combos, i_cumulative))
+    rng = rng or random
+    live = [i_code for i_code in range(52) if not dead_mask >> i_code & 1]
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+    result = EquityResult()
+    while result.trials < max_trials:
+        batch_size = min(BATCH_SIZE, max_trials - result.trials)
+        result.add(*_sample_multiway_batch(hero_codes=hero_codes, board_codes=board_codes,
+                                           villain_samplers=villain_samplers, live=live, runout_size=runout_size,
+                                           batch_size=batch_size, rng=rng))
+        if target_standard_error is not None and result.standard_error <= target_standard_error:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return result
+
+
+def _sample_multiway_batch(hero_codes: list, board_codes: list, villain_samplers: list, live: list,
+                           runout_size: int, batch_size: int, rng) -> tuple:
+    """
+    Samples batch_size deals: each Villain's hand in turn (redrawn while it
+    collides with an earlier Villain's), then a runout from the cards left.
+    """
+    spare_cards = 2 * len(villain_samplers)
+    deals = []
+    for _ in range(batch_size):
+        used_mask = 0
+        villain_hands = []
+        for (i_combos, i_cumulative) in villain_samplers:
+            for _ in range(MAX_VILLAIN_DRAWS):
+                if i_cumulative is None:
+                    i_hand = i_combos[int(rng.random() * len(i_combos))]
+                else:
+                    i_hand = rng.choices(i_combos, cum_weights=i_cumulative)[0]
+                i_mask = (1 << i_hand[0]) | (1 << i_hand[1])
+                if not i_mask & used_mask:
+                    break
+            else:
+                raise ValueError('Villain ranges leave no hands that can be dealt together.')
+            used_mask |= i_mask
+            villain_hands.append(i_hand)
+        # Draw spare cards so that the Villains' cards can be skipped.
+        drawn = rng.sample(live, runout_size + spare_cards)
+        runout = [i_code for i_code in drawn if not used_mask >> i_code & 1][:runout_size]
+        deals.append((villain_hands, runout))
+    return _showdown_deals(hero_codes=hero_codes, board_codes=board_codes, deals=deals)
+
+
+def _showdowns(hero_codes: list, board_codes: list, villain_hands: list, runouts) -> tuple:
+    return _showdown_deals(hero_codes=hero_codes, board_codes=board_codes,
+                           deals=((villain_hands, list(i_runout)) for i_runout in runouts))
+
+
+def _showdown_deals(hero_codes: list, board_codes: list, deals) -> tuple:
+    """
+    Scores (villain_hands, runout) deals. Returns (wins, ties, losses,
+    tie_equity, tie_equity_squares) for EquityResult.add().
+    """
+    evaluate_codes = common.evaluator.evaluate_codes
+    wins = ties = losses = 0
+    tie_equity = tie_equity_squares = 0.0
+    for (i_villain_hands, i_runout) in deals:
+        full_board = board_codes + i_runout
+        hero_value = evaluate_codes(hero_codes + full_board)
+        best_value = -1
+        number_tied = 0
+        for i_hand in i_villain_hands:
+            i_value = evaluate_codes(i_hand + full_board)
+            if i_value > best_value:
+                best_value = i_value
+                number_tied = 1
+            elif i_value == best_value:
+                number_tied += 1
+        if hero_value > best_value:
+            wins += 1
+        elif hero_value == best_value:
+            ties += 1
+            share = 1.0 / (number_tied + 1)
+            tie_equity += share
+            tie_equity_squares += share * share
+        else:
+            losses += 1
+    return wins, ties, losses, tie_equity, tie_equity_squares
+
+
+# Inputs
+
+def villain_range(villain, dead_mask: int) -> common.ranges.Range:
+    """
+    Returns Villain's possible hands as a Range, with every hand that contains
+    a dead card removed.
+    """
+    if isinstance(villain, common.ranges.Range):
+        hands = villain.without(cards=dead_mask)
+    elif villain is None:
+        hands = common.ranges.Range.full().without(cards=dead_mask)
+    else:
+        villain = list(villain)
+        if is_single_hand(value=villain):
+            villain = [villain]
+        for i_hand in villain:
+            i_codes = common.cards.to_codes(i_hand)
+            if len(i_codes) != 2 or i_codes[0] == i_codes[1]:
+                raise ValueError(f'Invalid villain hand {i_hand} given.')
+        hands = common.ranges.Range.from_hands(hands=villain).without(cards=dead_mask)
+
+    if not hands:
+        raise ValueError('Every villain hand is blocked by dead cards.')
+    return hands
+
+
+def combos_and_weights(villain_range: common.ranges.Range) -> tuple[list[list[int]], list]:
+    """
+    Returns the range's hands as lists of two integer codes, and their weights
+    (None if all weights are equal).
+    """
+    combos = []
+    weights = []
+    for (i_index, i_weight) in enumerate(villain_range.weights):
+        if i_weight:
+            combos.append(list(common.hands.COMBOS[i_index]))
+            weights.append(i_weight)
+    if villain_range.is_uniform:
+        weights = None
+    return combos, weights
+
+
+def is_single_hand(value: list) -> bool:
+    return len(value) == 2 and all(isinstance(i_card, (int, common.cards.Card)) for i_card in value)
+
+
+def verify_cards(hero, board, dead) -> tuple[list[int], list[int], int]:
+    hero_codes = common.cards.to_codes(hero)
+    board_codes = common.cards.to_codes(board)
+    if len(hero_codes) != 2:
+        raise ValueError(f'Hero must hold 2 cards, not {len(hero_codes)}.')
+    if len(board_codes) not in (0, 3, 4, 5):
+        raise ValueError(f'A board of {len(board_codes)} cards is not valid.')
+    if len(set(hero_codes + board_codes)) != len(hero_codes) + len(board_codes):
+        raise ValueError('Hero and board share a card.')
+    dead_mask = common.cards.to_mask(hero_codes + board_codes) | common.cards.to_mask(dead)
+    return hero_codes, board_codes, dead_mask
@@ -0,0 +1,268 @@
+"""
+This module caches equity results.
+
+EquityCache sits in front of common.equity.calculate_equity(). Results are
+keyed on the canonical form of the question (see common.isomorphism): Hero's
+hand, the board, the dead cards and Villain's range are all relabelled with
+the suit permutation that canonicalizes (Hero, board), so isomorphic
+questions share one entry. Villain's range enters the key as a digest of its
+relabelled weights.
+
+There are two tiers:
+    Memory: an LRU dict bounded by number of entries and/or bytes.
+    Disk (optional): a SQLite file that survives restarts. Worker processes
+      can open the same file with read_only=True.
+
+Lookups go memory, then disk, then compute; computed results are written to
+both tiers. Hit, miss and eviction counters are available from statistics.
+
+Sampled (non-exact) results are reused as they are, unless the caller asks
+for a target_standard_error the cached result does not meet, in which case
+the result is recomputed and replaced.
+"""
+import array
+import collections
+import hashlib
+import sqlite3
+import struct
+
+import common.cards
+import common.equity
+import common.hands
+import common.isomorphism
+
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# wins, ties, losses, tie_equity, tie_equity_squares, exact
+VALUE = struct.Struct('<dddddB')
+
+_COMBO_PERMUTATIONS = {}
+
+
+class EquityCache:
+    """
+    Two-tier equity cache (see module docstring).
+
+    Attributes:
+        memory: The in-memory LRUCache.
+        disk: The SQLiteStore, or None without a disk tier.
+        statistics: Dict of counters: hits, misses and evictions for the
+          memory tier, disk_hits and disk_misses for the disk tier.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = None, path: str = None,
+                 read_only: bool = False) -> None:
+        self._memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._disk = None if path is None else SQLiteStore(path=path, read_only=read_only)
+        return
+
+    @property
+    def memory(self) -> 'LRUCache':
+        return self._memory
+
+    @property
+    def disk(self) -> 'SQLiteStore':
+        return self._disk
+
+    @property
+    def statistics(self) -> dict:
+        statistics = {
+            'hits': self._memory.hits,
+            'misses': self._memory.misses,
+            'evictions': self._memory.evictions,
+            'disk_hits': 0,
+            'disk_misses': 0,
+        }
+        if self._disk is not None:
+            statistics['disk_hits'] = self._disk.hits
+            statistics['disk_misses'] = self._disk.misses
+        return statistics
+
+    def calculate_equity(self, hero, villain=None, board=(), dead=(), **kwargs) -> common.equity.EquityResult:
+        """
+        Cached common.equity.calculate_equity(); the arguments are the same.
+        """
+        key = cache_key(hero=hero, villain=villain, board=board, dead=dead)
+        value = self._memory.get(key=key)
+        if value is None and self._disk is not None:
+            value = self._disk.get(key=key)
+            if value is not None:
+                self._memory.put(key=key, value=value)
+
+        target_standard_error = kwargs.get('target_standard_error')
+        if value is not None:
+            result = unpack_result(value=value)
+            if target_standard_error is None or result.standard_error <= target_standard_error:
+                return result
+
+        result = common.equity.calculate_equity(hero=hero, villain=villain, board=board, dead=dead, **kwargs)
+        value = pack_result(result=result)
+        self._memory.put(key=key, value=value)
+        if self._disk is not None and not self._disk.read_only:
+            self._disk.put(key=key, value=value)
+        return result
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+        return
+
+
+class LRUCache:
+    """
+    A least-recently-used dict of bytes keys to bytes values, bounded by
+    max_entries and/or max_bytes (keys plus values). Either bound may be None.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = None) -> None:
+        self._entries = collections.OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._number_of_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        return
+
+    @property
+    def number_of_bytes(self) -> int:
+        return self._number_of_bytes
+
+    def get(self, key: bytes):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: bytes, value: bytes) -> None:
+        old_value = self._entries.pop(key, None)
+        if old_value is not None:
+            self._number_of_bytes -= len(key) + len(old_value)
+        self._entries[key] = value
+        self._number_of_bytes += len(key) + len(value)
+        while self._is_over_bounds():
+            evicted_key, evicted_value = self._entries.popitem(last=False)
+            self._number_of_bytes -= len(evicted_key) + len(evicted_value)
+            self.evictions += 1
+        return
+
+    def _is_over_bounds(self) -> bool:
+        if self._max_entries is not None and len(self._entries) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._number_of_bytes > self._max_bytes
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteStore:
+    """
+    Key-value store in a SQLite file. With read_only=True the file is opened
+    read-only (it must exist), so several processes can share it safely.
+    """
+
+    def __init__(self, path: str, read_only: bool = False) -> None:
+        self._path = path
+        self._read_only = read_only
+        if read_only:
+            self._connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS equity (key BLOB PRIMARY KEY, value BLOB)')
+            self._connection.commit()
+        self.hits = 0
+        self.misses = 0
+        return
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    def get(self, key: bytes):
+        row = self._connection.execute('SELECT value FROM equity WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: bytes, value: bytes) -> None:
+        if self._read_only:
+            raise RuntimeError(f"'{self._path}' was opened read-only.")
+        self._connection.execute('INSERT OR REPLACE INTO equity (key, value) VALUES (?, ?)', (key, value))
+        self._connection.commit()
+        return
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM equity').fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+        return
+
+
+# Keys & Values
+
+def cache_key(hero, villain=None, board=(), dead=()) -> bytes:
+    """
+    Returns the canonical cache key of an equity question: equal for any two
+    questions that are suit permutations of each other (as long as the
+    permutation canonicalizing Hero and the board is unique).
+    """
+    hero_codes, board_codes, dead_mask = common.equity.verify_cards(hero=hero, board=board, dead=dead)
+    villain_weights = common.equity.villain_range(villain=villain, dead_mask=dead_mask).weights
+    suit_map = common.isomorphism.canonical_suit_map(hole=hero_codes, board=board_codes)
+
+    dead_codes = [i_code for i_code in range(52) if dead_mask >> i_code & 1]
+    permuted_weights = array.array('d', bytes(8 * common.hands.NUMBER_OF_COMBOS))
+    for (i_index, i_new_index) in enumerate(_combo_permutation(suit_map=suit_map)):
+        permuted_weights[i_new_index] = villain_weights[i_index]
+
+    key = bytearray()
+    key.extend(sorted(_permute(codes=hero_codes, suit_map=suit_map)))
+    key.append(0xFF)
+    key.extend(sorted(_permute(codes=board_codes, suit_map=suit_map)))
+    key.append(0xFF)
+    key.extend(common.cards.to_mask(_permute(codes=dead_codes, suit_map=suit_map)).to_bytes(7, 'little'))
+    key.extend(hashlib.blake2b(permuted_weights.tobytes(), digest_size=16).digest())
+    return bytes(key)
+
+
+def pack_result(result: common.equity.EquityResult) -> bytes:
+    return VALUE.pack(result.wins, result.ties, result.losses, result.tie_equity, result.tie_equity_squares,
+                      result.exact)
+
+
+def unpack_result(value: bytes) -> common.equity.EquityResult:
+    wins, ties, losses, tie_equity, tie_equity_squares, exact = VALUE.unpack(value)
+    result = common.equity.EquityResult(exact=bool(exact))
+    result.add(wins=wins, ties=ties, losses=losses, tie_equity=tie_equity, tie_equity_squares=tie_equity_squares)
+    return result
+
+
+def _permute(codes, suit_map: list[int]) -> list[int]:
+    return [i_code & ~3 | suit_map[i_code & 3] for i_code in codes]
+
+
+def _combo_permutation(suit_map: list[int]) -> list[int]:
+    """
+    Returns, for each COMBOS index, the index of the combo with its suits
+    relabelled by suit_map. One list is kept for each of the 24 maps.
+    """
+    suit_map = tuple(suit_map)
+    if suit_map not in _COMBO_PERMUTATIONS:
+        _COMBO_PERMUTATIONS[suit_map] = [
+            common.hands.combo_index(*_permute(codes=i_combo, suit_map=suit_map)) for i_combo in common.hands.COMBOS
+        ]
+    return _COMBO_PERMUTATIONS[suit_map]
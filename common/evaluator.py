@@ -0,0 +1,311 @@
+"""
+This module ranks 5-, 6- and 7-card poker hands.
+
+Hand values are plain integers: a higher value is a stronger hand and equal
+values are a tie. The hand category sits in the high bits (see CATEGORIES) and
+the ranks that break ties within the category are packed four bits apiece
+below it, so category(value) and describe(value) can recover both.
+
+Evaluation is two table lookups. Every card contributes a rank key (three bits
+per rank, so the sum of up to seven keys is a unique rank-count signature) and
+a suit key (four bits per suit, pre-loaded with 3 so a count of five or more
+sets the top bit of that nibble). If no suit reaches five cards, the rank-count
+signature indexes a table of the best non-flush value; otherwise the flush
+suit's 13-bit rank mask indexes a table of the best flush value. The tables
+cover every 5-, 6- and 7-card rank multiset and are built once, on first use.
+"""
+import common.cards
+
+
+CATEGORIES = (
+    'High Card',
+    'Pair',
+    'Two Pair',
+    'Three of a Kind',
+    'Straight',
+    'Flush',
+    'Full House',
+    'Four of a Kind',
+    'Straight Flush',
+)
+HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = range(9)
+
+CATEGORY_SHIFT = 20
+
+# Per-card lookups, indexed by card code.
+RANK_KEYS = tuple(1 << (3 * (i_code >> 2)) for i_code in range(52))
+SUIT_KEYS = tuple(1 << (4 * (i_code & 3)) for i_code in range(52))
+RANK_BITS = tuple(1 << (i_code >> 2) for i_code in range(52))
+
+SUIT_KEY_START = 0x3333
+FLUSH_BITS = 0x8888
+
+_NON_FLUSH_TABLE = {}
+_FLUSH_TABLE = []
+
+
+# Evaluation
+
+def evaluate(cards) -> int:
+    """
+    Returns the value of the best five-card hand within 5 to 7 cards.
+
+    Args:
+        cards: An iterable of Card objects and/or integer card codes.
+    """
+    codes = common.cards.to_codes(cards)
+    if not 5 <= len(codes) <= 7:
+        raise ValueError(f'Cannot evaluate {len(codes)} cards; 5 to 7 are required.')
+    if len(set(codes)) != len(codes):
+        raise ValueError(f'Duplicate cards given: {codes}.')
+    return evaluate_codes(codes)
+
+
+def evaluate_codes(codes) -> int:
+    """
+    Unchecked fast path of evaluate() for a sequence of 5 to 7 distinct
+    integer card codes.
+    """
+    if not _FLUSH_TABLE:
+        build_tables()
+    rank_key = 0
+    suit_key = SUIT_KEY_START
+    for i_code in codes:
+        rank_key += RANK_KEYS[i_code]
+        suit_key += SUIT_KEYS[i_code]
+    flush_bits = suit_key & FLUSH_BITS
+    if flush_bits:
+        suit = (flush_bits.bit_length() >> 2) - 1
+        rank_mask = 0
+        for i_code in codes:
+            if i_code & 3 == suit:
+                rank_mask |= RANK_BITS[i_code]
+        return _FLUSH_TABLE[rank_mask]
+    return _NON_FLUSH_TABLE[rank_key]
+
+
+class HandState:
+    """
+    Incremental evaluation state for a fixed set of cards (e.g. hole cards
+    plus the board so far): the summed rank and suit keys and a rank mask per
+    suit. Adding a card is a few integer operations, so sweeping every
+    possible next card costs O(1) per card instead of a full re-evaluation.
+
+    Attributes:
+        codes: The card codes in the state.
+        value: The hand value (5 to 7 cards only).
+    """
+
+    __slots__ = ('_codes', '_rank_key', '_suit_key', '_suit_masks')
+
+    def __init__(self, codes=()) -> None:
+        if not _FLUSH_TABLE:
+            build_tables()
+        self._codes = tuple(codes)
+        self._rank_key = 0
+        self._suit_key = SUIT_KEY_START
+        self._suit_masks = [0, 0, 0, 0]
+        for i_code in self._codes:
+            self._rank_key += RANK_KEYS[i_code]
+            self._suit_key += SUIT_KEYS[i_code]
+            self._suit_masks[i_code & 3] |= RANK_BITS[i_code]
+        return
+
+    @property
+    def codes(self) -> tuple:
+        return self._codes
+
+    @property
+    def value(self) -> int:
+        return self._lookup(rank_key=self._rank_key, suit_key=self._suit_key, suit_masks=self._suit_masks)
+
+    def with_card(self, code: int) -> 'HandState':
+        """
+        Returns a new state with one more card; this state is unchanged.
+        """
+        state = HandState.__new__(HandState)
+        state._codes = self._codes + (code,)
+        state._rank_key = self._rank_key + RANK_KEYS[code]
+        state._suit_key = self._suit_key + SUIT_KEYS[code]
+        state._suit_masks = list(self._suit_masks)
+        state._suit_masks[code & 3] |= RANK_BITS[code]
+        return state
+
+    def value_with(self, code: int) -> int:
+        """
+        Returns the value of the state plus one card, without building a new
+        state.
+        """
+        suit_key = self._suit_key + SUIT_KEYS[code]
+        flush_bits = suit_key & FLUSH_BITS
+        if flush_bits:
+            suit = (flush_bits.bit_length() >> 2) - 1
+            rank_mask = self._suit_masks[suit]
+            if code & 3 == suit:
+                rank_mask |= RANK_BITS[code]
+            return _FLUSH_TABLE[rank_mask]
+        return _NON_FLUSH_TABLE[self._rank_key + RANK_KEYS[code]]
+
+    @staticmethod
+    def _lookup(rank_key: int, suit_key: int, suit_masks: list) -> int:
+        flush_bits = suit_key & FLUSH_BITS
+        if flush_bits:
+            return _FLUSH_TABLE[suit_masks[(flush_bits.bit_length() >> 2) - 1]]
+        return _NON_FLUSH_TABLE[rank_key]
+
+
+def category(value: int) -> int:
+    return value >> CATEGORY_SHIFT
+
+
+def describe(value: int) -> str:
+    """
+    Returns a human readable description, e.g. 'Full House (K, 7)'.
+    """
+    hand_category = category(value)
+    ranks = []
+    for i_shift in range(16, -4, -4):
+        ranks.append(value >> i_shift & 0xF)
+    number_of_ranks = _NUMBER_OF_TIEBREAK_RANKS[hand_category]
+    rank_text = ', '.join(common.cards.RANKS[i_rank] for i_rank in ranks[:number_of_ranks])
+    return f'{CATEGORIES[hand_category]} ({rank_text})'
+
+
+def lookup_tables() -> tuple[dict, list]:
+    """
+    Returns the (non-flush, flush) lookup tables, building them if needed, for
+    code that evaluates hands in bulk (e.g. with NumPy). The non-flush table
+    maps a summed RANK_KEYS signature to a value; the flush table is indexed
+    by a 13-bit rank mask.
+    """
+    build_tables()
+    return _NON_FLUSH_TABLE, _FLUSH_TABLE
+
+
+# Table Construction
+
+_NUMBER_OF_TIEBREAK_RANKS = (5, 4, 3, 3, 1, 5, 2, 2, 1)
+
+
+def build_tables() -> None:
+    """
+    Fills the flush and non-flush lookup tables. Called automatically by the
+    first evaluation; calling it again is a no-op.
+    """
+    if _FLUSH_TABLE:
+        return
+    # Five-card rank multisets are valued directly; a six- or seven-card
+    # multiset is worth the best of the multisets one card smaller, so those
+    # levels are filled by adding one more rank to every entry of the level
+    # below.
+    non_flush_table = {}
+    level = {}
+    for i_counts in _rank_count_multisets(number_of_cards=5):
+        rank_key = 0
+        for i_rank, i_count in enumerate(i_counts):
+            rank_key += i_count << (3 * i_rank)
+        level[rank_key] = _best_non_flush_value(counts=i_counts)
+    non_flush_table.update(level)
+    for i_level in range(2):
+        next_level = {}
+        for (i_rank_key, i_value) in level.items():
+            for i_rank in range(13):
+                if (i_rank_key >> (3 * i_rank)) & 7 < 4:
+                    i_next_key = i_rank_key + (1 << (3 * i_rank))
+                    if next_level.get(i_next_key, -1) < i_value:
+                        next_level[i_next_key] = i_value
+        non_flush_table.update(next_level)
+        level = next_level
+
+    flush_table = [0] * (1 << 13)
+    for i_mask in range(1 << 13):
+        if bin(i_mask).count('1') >= 5:
+            flush_table[i_mask] = _best_flush_value(rank_mask=i_mask)
+
+    _NON_FLUSH_TABLE.update(non_flush_table)
+    _FLUSH_TABLE.extend(flush_table)
+    return
+
+
+def _rank_count_multisets(number_of_cards: int):
+    """
+    Yields every 13-tuple of per-rank counts (each 0-4) summing to
+    number_of_cards.
+    """
+    def _fill(rank: int, remaining: int, counts: list):
+        if rank == 13:
+            if remaining == 0:
+                yield tuple(counts)
+            return
+        for i_count in range(min(4, remaining) + 1):
+            counts.append(i_count)
+            yield from _fill(rank=rank + 1, remaining=remaining - i_count, counts=counts)
+            counts.pop()
+
+    yield from _fill(rank=0, remaining=number_of_cards, counts=[])
+
+
+def _pack(hand_category: int, ranks) -> int:
+    value = hand_category << CATEGORY_SHIFT
+    for (i_shift, i_rank) in zip(range(16, -4, -4), ranks):
+        value |= i_rank << i_shift
+    return value
+
+
+def straight_top(rank_mask: int) -> int:
+    """
+    Returns the top rank index of the highest straight in a 13-bit rank mask,
+    or -1 if there is none. The wheel (A-2-3-4-5) tops out at the five.
+    """
+    for i_top in range(12, 3, -1):
+        run = 0x1F << (i_top - 4)
+        if rank_mask & run == run:
+            return i_top
+    if rank_mask & 0x100F == 0x100F:
+        return 3
+    return -1
+
+
+def _best_non_flush_value(counts: tuple) -> int:
+    ranks_present = [i_rank for i_rank in range(12, -1, -1) if counts[i_rank]]
+    quads = [i_rank for i_rank in ranks_present if counts[i_rank] >= 4]
+    trips = [i_rank for i_rank in ranks_present if counts[i_rank] >= 3]
+    pairs = [i_rank for i_rank in ranks_present if counts[i_rank] >= 2]
+
+    if quads:
+        kickers = [i_rank for i_rank in ranks_present if i_rank != quads[0]]
+        return _pack(FOUR_OF_A_KIND, [quads[0], kickers[0]])
+
+    if trips:
+        full_house_pairs = [i_rank for i_rank in pairs if i_rank != trips[0]]
+        if full_house_pairs:
+            return _pack(FULL_HOUSE, [trips[0], full_house_pairs[0]])
+
+    rank_mask = 0
+    for i_rank in ranks_present:
+        rank_mask |= 1 << i_rank
+    top = straight_top(rank_mask=rank_mask)
+    if top >= 0:
+        return _pack(STRAIGHT, [top])
+
+    if trips:
+        kickers = [i_rank for i_rank in ranks_present if i_rank != trips[0]]
+        return _pack(THREE_OF_A_KIND, [trips[0]] + kickers[:2])
+
+    if len(pairs) >= 2:
+        kickers = [i_rank for i_rank in ranks_present if i_rank not in pairs[:2]]
+        return _pack(TWO_PAIR, pairs[:2] + kickers[:1])
+
+    if pairs:
+        kickers = [i_rank for i_rank in ranks_present if i_rank != pairs[0]]
+        return _pack(PAIR, [pairs[0]] + kickers[:3])
+
+    return _pack(HIGH_CARD, ranks_present[:5])
+
+
+def _best_flush_value(rank_mask: int) -> int:
+    top = straight_top(rank_mask=rank_mask)
+    if top >= 0:
+        return _pack(STRAIGHT_FLUSH, [top])
+    ranks_present = [i_rank for i_rank in range(12, -1, -1) if rank_mask >> i_rank & 1]
+    return _pack(FLUSH, ranks_present[:5])
@@ -0,0 +1,114 @@
+"""
+This module indexes two-card starting hands.
+
+There are 1326 distinct hole-card combinations. Each is a pair of card codes
+(lower code first) with a fixed index into COMBOS, so per-combo data can live
+in flat 1326-slot arrays. The combos fall into 169 hand classes ('AA', 'AKs',
+'AKo', ...) laid out on the usual 13x13 grid: aces first, pairs on the
+diagonal, suited hands above it and offsuit hands below it.
+"""
+import common.cards
+
+
+NUMBER_OF_COMBOS = 1326
+NUMBER_OF_HAND_CLASSES = 169
+
+COMBOS = tuple((i_low, i_high) for i_high in range(52) for i_low in range(i_high))
+COMBO_MASKS = tuple((1 << i_low) | (1 << i_high) for (i_low, i_high) in COMBOS)
+
+_COMBO_INDEX = [-1] * (52 * 52)
+for _i_index, (_i_low, _i_high) in enumerate(COMBOS):
+    _COMBO_INDEX[_i_low * 52 + _i_high] = _i_index
+    _COMBO_INDEX[_i_high * 52 + _i_low] = _i_index
+
+
+def _build_card_combos() -> tuple:
+    card_combos = [[] for _ in range(52)]
+    for (i_index, (i_low, i_high)) in enumerate(COMBOS):
+        card_combos[i_low].append(i_index)
+        card_combos[i_high].append(i_index)
+    return tuple(tuple(i_combos) for i_combos in card_combos)
+
+
+# COMBOS indexes holding each card code (51 apiece).
+CARD_COMBOS = _build_card_combos()
+
+
+def combo_index(first, second) -> int:
+    """
+    Returns the COMBOS index of a two-card hand (Cards or integer codes, in
+    either order).
+    """
+    first_code, second_code = common.cards.to_codes((first, second))
+    index = _COMBO_INDEX[first_code * 52 + second_code]
+    if index < 0:
+        raise ValueError(f'Invalid hand {first}{second} given.')
+    return index
+
+
+def combo_cards(index: int) -> list[common.cards.Card]:
+    low, high = COMBOS[index]
+    return [common.cards.CARDS[high], common.cards.CARDS[low]]
+
+
+# Hand Classes
+
+def _grid_rank(row_or_column: int) -> int:
+    return 12 - row_or_column
+
+
+def _build_hand_classes() -> tuple:
+    names = []
+    for i_row in range(13):
+        for i_column in range(13):
+            high = common.cards.RANKS[_grid_rank(min(i_row, i_column))]
+            low = common.cards.RANKS[_grid_rank(max(i_row, i_column))]
+            if i_row == i_column:
+                names.append(f'{high}{low}')
+            elif i_row < i_column:
+                names.append(f'{high}{low}s')
+            else:
+                names.append(f'{high}{low}o')
+    return tuple(names)
+
+
+HAND_CLASSES = _build_hand_classes()
+_HAND_CLASS_INDEX = {i_name: i_index for (i_index, i_name) in enumerate(HAND_CLASSES)}
+
+
+def _combo_hand_class(low: int, high: int) -> int:
+    high_row = 12 - (high >> 2)
+    low_row = 12 - (low >> 2)
+    if high_row == low_row:
+        return high_row * 13 + high_row
+    first, second = min(high_row, low_row), max(high_row, low_row)
+    if low & 3 == high & 3:
+        return first * 13 + second
+    return second * 13 + first
+
+
+COMBO_HAND_CLASSES = tuple(_combo_hand_class(low=i_low, high=i_high) for (i_low, i_high) in COMBOS)
+
+
+def hand_class_index(value) -> int:
+    """
+    Returns the HAND_CLASSES index of a class name ('AKs') or of a two-card
+    hand.
+    """
+    if isinstance(value, str):
+        try:
+            return _HAND_CLASS_INDEX[value[:2].upper() + value[2:].lower()]
+        except KeyError:
+            raise ValueError(f"Invalid hand class '{value}' given.") from None
+    return COMBO_HAND_CLASSES[combo_index(*value)]
+
+
+def _build_hand_class_combos() -> tuple:
+    class_combos = [[] for _ in range(NUMBER_OF_HAND_CLASSES)]
+    for (i_index, i_class) in enumerate(COMBO_HAND_CLASSES):
+        class_combos[i_class].append(i_index)
+    return tuple(tuple(i_combos) for i_combos in class_combos)
+
+
+# COMBOS indexes per hand class: 6 for a pair, 4 if suited, 12 if offsuit.
+HAND_CLASS_COMBOS = _build_hand_class_combos()
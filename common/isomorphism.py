@@ -0,0 +1,139 @@
+"""
+This module canonicalizes hands and boards under suit permutation.
+
+Suits have no order in Hold 'Em, so renaming them (e.g. swapping hearts and
+spades everywhere) gives a strategically identical situation: Ah Kh on Qh 7h 2c
+is the same spot as As Ks on Qs 7s 2d. Caches keyed on the canonical form
+instead of the raw cards are an order of magnitude smaller: 22,100 flops
+collapse to 1,755 classes and 1,326 starting hands to 169.
+
+Each suit is summarised by a signature, the 13-bit rank mask of its board
+cards with the rank mask of its hole cards in the bits above. Two situations
+are isomorphic exactly when they have the same multiset of suit signatures,
+so the canonical key is the four signatures sorted and packed into one
+integer. Computing it is a fixed amount of work per card (O(1)); flops
+additionally have a precomputed table of class indexes (flop_index()),
+built on first use.
+"""
+import itertools
+
+import common.cards
+
+
+NUMBER_OF_FLOP_CLASSES = 1755
+
+SIGNATURE_BITS = 26
+_HOLE_SHIFT = 13
+
+_FLOP_INDEX = {}
+_FLOP_CLASSES = []
+_FLOP_CLASS_SIZES = []
+
+
+def suit_signatures(hole, board=()) -> list[int]:
+    """
+    Returns the signature of each suit (indexed by suit index).
+    """
+    signatures = [0, 0, 0, 0]
+    for i_code in common.cards.to_codes(board):
+        signatures[i_code & 3] |= 1 << (i_code >> 2)
+    for i_code in common.cards.to_codes(hole):
+        signatures[i_code & 3] |= 1 << ((i_code >> 2) + _HOLE_SHIFT)
+    return signatures
+
+
+def canonical_key(hole, board=()) -> int:
+    """
+    Returns an integer that is equal for two (hole cards, board) pairs if and
+    only if one is a suit permutation of the other. Order within the hole
+    cards and within the board does not matter. Either may be empty.
+    """
+    key = 0
+    for i_signature in sorted(suit_signatures(hole=hole, board=board), reverse=True):
+        key = key << SIGNATURE_BITS | i_signature
+    return key
+
+
+def canonical_suit_map(hole, board=()) -> list[int]:
+    """
+    Returns the suit permutation (old suit index to new suit index) that
+    takes hole and board to their canonical representative: suits are
+    relabelled in decreasing signature order, so the suit with the most
+    (and highest) cards becomes clubs.
+    """
+    signatures = suit_signatures(hole=hole, board=board)
+    order = sorted(range(4), key=lambda i_suit: signatures[i_suit], reverse=True)
+    suit_map = [0, 0, 0, 0]
+    for (i_new_suit, i_old_suit) in enumerate(order):
+        suit_map[i_old_suit] = i_new_suit
+    return suit_map
+
+
+def canonicalize(hole, board=()) -> tuple[list[int], list[int]]:
+    """
+    Returns the canonical representative of (hole, board) as sorted lists of
+    card codes. Isomorphic inputs give identical output, and equity and hand
+    values are unchanged by the relabelling.
+    """
+    suit_map = canonical_suit_map(hole=hole, board=board)
+    return (sorted(i_code & ~3 | suit_map[i_code & 3] for i_code in common.cards.to_codes(hole)),
+            sorted(i_code & ~3 | suit_map[i_code & 3] for i_code in common.cards.to_codes(board)))
+
+
+def suit_symmetries(groups) -> list[tuple]:
+    """
+    Returns the suit permutations (tuples of old suit index to new suit
+    index, the identity first) that map every group of cards onto itself,
+    e.g. groups of (Hero's hand, the board): relabelling a situation with any
+    of them gives back the same situation.
+    """
+    signatures = [[] for _ in range(4)]
+    for i_group in groups:
+        i_masks = [0, 0, 0, 0]
+        for i_code in common.cards.to_codes(i_group):
+            i_masks[i_code & 3] |= 1 << (i_code >> 2)
+        for i_suit in range(4):
+            signatures[i_suit].append(i_masks[i_suit])
+    return [i_suit_map for i_suit_map in itertools.permutations(range(4))
+            if all(signatures[i_suit_map[i_suit]] == signatures[i_suit] for i_suit in range(4))]
+
+
+# Flops
+
+def flop_index(flop) -> int:
+    """
+    Returns the flop's class index (0 to 1754) by a single table lookup.
+    """
+    build_flop_tables()
+    return _FLOP_INDEX[common.cards.to_mask(flop)]
+
+
+def flop_classes() -> tuple[list, list]:
+    """
+    Returns (representatives, sizes): a canonical flop (three card codes) for
+    each class index and the number of raw flops in each class. The sizes sum
+    to 22,100, so they are the weights for iterating over classes instead of
+    flops.
+    """
+    build_flop_tables()
+    return _FLOP_CLASSES, _FLOP_CLASS_SIZES
+
+
+def build_flop_tables() -> None:
+    """
+    Builds the flop tables (a 52-bit card mask to class index map over all
+    22,100 flops). Does nothing if they already exist.
+    """
+    if _FLOP_INDEX:
+        return
+    class_indexes = {}
+    for i_flop in itertools.combinations(range(52), 3):
+        i_key = canonical_key(hole=(), board=i_flop)
+        if i_key not in class_indexes:
+            class_indexes[i_key] = len(_FLOP_CLASSES)
+            _FLOP_CLASSES.append(canonicalize(hole=(), board=i_flop)[1])
+            _FLOP_CLASS_SIZES.append(0)
+        i_index = class_indexes[i_key]
+        _FLOP_INDEX[common.cards.to_mask(i_flop)] = i_index
+        _FLOP_CLASS_SIZES[i_index] += 1
+    return
@@ -0,0 +1,175 @@
+"""
+This module finds Hero's outs on the flop and turn.
+
+A card is an out against one Villain hand if Hero is not ahead of that hand
+now and is ahead once the card comes. Against a range, each card gets a
+share: the fraction (by weight) of the Villain hands Hero is not ahead of
+that the card puts Hero ahead of. Against a single hand the share is 0 or 1;
+cards with a share of at least OUT_SHARE count as outs. Outs are grouped by
+the hand Hero makes with them (e.g. 'Flush', 'Straight', 'Three of a Kind',
+'Two Pair'). Against several Villains (multiway_outs()), a card is an out if
+it puts Hero ahead of all of them.
+
+The sweep is incremental: Hero's and each Villain hand's cards plus the board
+are summarised once as common.evaluator.HandState objects, and every
+candidate card is then evaluated with HandState.value_with(), a few integer
+operations, instead of a full seven-card evaluation.
+"""
+import common.cards
+import common.equity
+import common.evaluator
+import common.hands
+
+
+OUT_SHARE = 0.5
+
+
+class OutsResult:
+    """
+    Outs for every card that can still come.
+
+    Attributes:
+        shares: Dict of Card to the share of Villain's hands it puts Hero
+          ahead of (see module docstring).
+        draws: Dict of Card to the category name of Hero's hand with it.
+        outs: The cards with a share of at least OUT_SHARE, in card order.
+        by_draw: Dict of category name to the outs that make it.
+    """
+
+    def __init__(self, shares: dict, draws: dict) -> None:
+        self._shares = shares
+        self._draws = draws
+        return
+
+    @property
+    def shares(self) -> dict:
+        return self._shares
+
+    @property
+    def draws(self) -> dict:
+        return self._draws
+
+    @property
+    def outs(self) -> list[common.cards.Card]:
+        return sorted(i_card for (i_card, i_share) in self._shares.items() if i_share >= OUT_SHARE)
+
+    @property
+    def by_draw(self) -> dict:
+        by_draw = {}
+        for i_card in self.outs:
+            by_draw.setdefault(self._draws[i_card], []).append(i_card)
+        return by_draw
+
+    def __len__(self) -> int:
+        return len(self.outs)
+
+    def __str__(self) -> str:
+        s = f'Outs: {len(self)} of {len(self._shares)} cards'
+        for (i_draw, i_cards) in self.by_draw.items():
+            s += f'\n  {i_draw}: {" ".join(repr(i_card) for i_card in i_cards)}'
+        return s
+
+
+def calculate_outs(hero, villain=None, board=(), dead=()) -> OutsResult:
+    """
+    Returns Hero's outs for the next card.
+
+    Args:
+        hero: Hero's two hole cards.
+        villain: Villain's hand, a collection of hands, a Range or None for
+          any hand (see common.equity.villain_range()).
+        board: The flop or the flop and turn.
+        dead: Other cards that cannot come or be in Villain's hand. Must not
+          include Villain's own cards.
+    """
+    return multiway_outs(hero=hero, villains=[villain], board=board, dead=dead)
+
+
+def multiway_outs(hero, villains: list, board=(), dead=()) -> OutsResult:
+    """
+    Returns Hero's outs for the next card against several Villains: a card's
+    share is the chance, when Hero is not ahead of every Villain now, that
+    the card puts Hero ahead of all of them (taking the Villains' hands as
+    independent). With one Villain this is the share described in the module
+    docstring.
+
+    Args:
+        villains: One entry per Villain, each anything calculate_outs()
+          accepts as villain. dead must not include any Villain's own cards.
+        See calculate_outs() for the other arguments.
+    """
+    hero_codes, board_codes, dead_mask = common.equity.verify_cards(hero=hero, board=board, dead=dead)
+    if len(board_codes) not in (3, 4):
+        raise ValueError('Outs need a flop or a turn on the board.')
+    if not villains:
+        raise ValueError('At least one villain must be given.')
+    villain_weights = [common.equity.villain_range(villain=i_villain, dead_mask=dead_mask).weights
+                       for i_villain in villains]
+
+    # Cards in every hand of a Villain's range (e.g. a known hand's) are that
+    # Villain's: they cannot come, nor be in another Villain's hand.
+    held_masks = []
+    for i_weights in villain_weights:
+        i_held_mask = (1 << 52) - 1
+        for (j_index, j_weight) in enumerate(i_weights):
+            if j_weight:
+                i_held_mask &= common.hands.COMBO_MASKS[j_index]
+        held_masks.append(i_held_mask)
+    excluded_mask = dead_mask
+    for i_held_mask in held_masks:
+        excluded_mask |= i_held_mask
+
+    hero_state = common.evaluator.HandState(codes=hero_codes + board_codes)
+    hero_value = hero_state.value
+    villain_hands = []
+    for (i_villain, i_weights) in enumerate(villain_weights):
+        i_blocked_mask = 0
+        for (j_villain, j_held_mask) in enumerate(held_masks):
+            if j_villain != i_villain:
+                i_blocked_mask |= j_held_mask
+        i_hands = []
+        for (j_index, j_weight) in enumerate(i_weights):
+            j_mask = common.hands.COMBO_MASKS[j_index]
+            if j_weight and not j_mask & i_blocked_mask:
+                j_low, j_high = common.hands.COMBOS[j_index]
+                j_state = common.evaluator.HandState(codes=[j_low, j_high] + board_codes)
+                i_hands.append((j_mask, j_weight, j_state, hero_value > j_state.value))
+        if not i_hands:
+            raise ValueError('Every villain hand is blocked by the other villains.')
+        villain_hands.append(i_hands)
+        i_held_mask = (1 << 52) - 1
+        for (j_mask, _, _, _) in i_hands:
+            i_held_mask &= j_mask
+        excluded_mask |= i_held_mask
+
+    shares = {}
+    draws = {}
+    for i_code in range(52):
+        if excluded_mask >> i_code & 1:
+            continue
+        i_card = common.cards.CARDS[i_code]
+        i_hero_value = hero_state.value_with(i_code)
+        i_bit = 1 << i_code
+        # Chances (over each Villain's hands without the card) that Hero is
+        # ahead of all of them now, after the card, and both.
+        i_ahead_now = i_ahead_after = i_ahead_both = 1.0
+        for j_hands in villain_hands:
+            j_total = j_now = j_after = j_both = 0.0
+            for (k_mask, k_weight, k_state, k_ahead_now) in j_hands:
+                if k_mask & i_bit:
+                    continue
+                j_total += k_weight
+                k_ahead_after = i_hero_value > k_state.value_with(i_code)
+                if k_ahead_now:
+                    j_now += k_weight
+                if k_ahead_after:
+                    j_after += k_weight
+                    if k_ahead_now:
+                        j_both += k_weight
+            i_ahead_now *= j_now / j_total
+            i_ahead_after *= j_after / j_total
+            i_ahead_both *= j_both / j_total
+        i_behind_now = 1.0 - i_ahead_now
+        shares[i_card] = (i_ahead_after - i_ahead_both) / i_behind_now if i_behind_now > 1e-12 else 0.0
+        draws[i_card] = common.evaluator.CATEGORIES[common.evaluator.category(i_hero_value)]
+    return OutsResult(shares=shares, draws=draws)
@@ -0,0 +1,94 @@
+"""
+This module runs Monte Carlo equity simulations across several processes.
+
+The work is split into fixed-size shards. Shard i always draws from its own
+random.Random seeded from (seed, i), and shard results are merged in shard
+order, so a given seed produces the same counts whether it runs on one worker
+or thirty-two.
+"""
+import concurrent.futures
+import math
+import os
+import random
+
+import common.equity
+
+
+SHARD_TRIALS = 5_000
+SHARDS_PER_WAVE = 64
+
+
+def parallel_equity(hero, villain=None, board=(), dead=(), trials: int = 1_000_000,
+                    target_standard_error: float = None, seed: int = 0, workers: int = None,
+                    executor: concurrent.futures.Executor = None) -> common.equity.EquityResult:
+    """
+    Estimates Hero's equity like common.equity.monte_carlo_equity(), with the
+    trials spread over a process pool.
+
+    Shards are submitted in waves of SHARDS_PER_WAVE; if target_standard_error
+    is given, no further waves are submitted once it is reached. Wave size does
+    not depend on the number of workers, so early stopping is reproducible too.
+
+    Args:
+        trials: Total number of trials.
+        target_standard_error: Stop after the first wave that reaches this.
+        seed: Seed for the per-shard random streams.
+        workers: Number of worker processes. Defaults to os.cpu_count(). With
+          1 worker the shards run in this process.
+        executor: An existing executor to submit to instead of starting a
+          new process pool (workers is then ignored).
+        See common.equity.monte_carlo_equity() for the other arguments.
+    """
+    shard_arguments = _shard_arguments(hero=hero, villain=villain, board=board, dead=dead)
+    number_of_shards = math.ceil(trials / SHARD_TRIALS)
+    workers = workers or os.cpu_count() or 1
+
+    own_executor = None
+    if executor is None and workers > 1:
+        own_executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        executor = own_executor
+    map_shards = executor.map if executor is not None else map
+
+    result = common.equity.EquityResult()
+    try:
+        for i_wave_start in range(0, number_of_shards, SHARDS_PER_WAVE):
+            i_wave = range(i_wave_start, min(i_wave_start + SHARDS_PER_WAVE, number_of_shards))
+            i_jobs = []
+            for i_shard in i_wave:
+                i_shard_trials = min(SHARD_TRIALS, trials - i_shard * SHARD_TRIALS)
+                i_jobs.append(shard_arguments + (i_shard_trials, seed, i_shard))
+            for i_counts in map_shards(_run_shard, i_jobs):
+                result.add(*i_counts)
+            if target_standard_error is not None and result.standard_error <= target_standard_error:
+                break
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown()
+    return result
+
+
+def shard_rng(seed: int, shard_index: int) -> random.Random:
+    """
+    Returns the independent random stream used by one shard.
+    """
+    return random.Random(f'{seed}/{shard_index}')
+
+
+def _shard_arguments(hero, villain, board, dead) -> tuple:
+    """
+    Converts cards to integer codes and Villain to a Range so that jobs
+    pickle cheaply, and checks the
+    inputs in this process so that errors are raised before any work starts.
+    """
+    hero_codes, board_codes, dead_mask = common.equity.verify_cards(hero=hero, board=board, dead=dead)
+    villain_range = common.equity.villain_range(villain=villain, dead_mask=dead_mask)
+    dead_codes = [i_code for i_code in range(52) if dead_mask >> i_code & 1]
+    return hero_codes, villain_range, board_codes, dead_codes
+
+
+def _run_shard(job: tuple) -> tuple[int, int, int]:
+    hero_codes, villain_range, board_codes, dead_codes, shard_trials, seed, shard_index = job
+    result = common.equity.monte_carlo_equity(hero=hero_codes, villain=villain_range, board=board_codes,
+                                              dead=dead_codes, max_trials=shard_trials,
+                                              rng=shard_rng(seed=seed, shard_index=shard_index))
+    return result.wins, result.ties, result.losses
@@ -0,0 +1,163 @@
+"""
+This module stores precomputed heads-up preflop equities on disk.
+
+The table holds the equity of every hand class against every other hand class
+(169x169, see common.hands.HAND_CLASSES), averaged over the combos of each
+class. It is generated once with generate_table() (or by running this module)
+and read back through a read-only memory map, so a lookup is a single indexed
+read and every process that opens the file shares the same pages. Nothing is
+opened until the first lookup.
+
+File layout (little-endian): a 12-byte header of magic b'PKPF', format
+version (uint16), number of hand classes (uint16), reserved (uint32),
+followed by 169 * 169 float32 equities in row-major order.
+"""
+import argparse
+import mmap
+import os
+import struct
+
+import common.cards
+import common.hands
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data',
+                            'preflop_equity.bin')
+DEFAULT_NUMBER_OF_BOARDS = 50_000
+
+MAGIC = b'PKPF'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+
+_open_tables = {}
+
+
+class PreflopEquity:
+    """
+    A preflop equity read from the precomputed table.
+
+    Attributes:
+        equity: Hero's equity, with ties counted as half.
+        standard_error: Always 0.0; the table's own sampling error is not
+          tracked per entry.
+        exact: Always False; the table averages over the combos of a class.
+    """
+
+    def __init__(self, equity: float) -> None:
+        self._equity = equity
+        return
+
+    @property
+    def equity(self) -> float:
+        return self._equity
+
+    @property
+    def standard_error(self) -> float:
+        return 0.0
+
+    @property
+    def exact(self) -> bool:
+        return False
+
+    def __str__(self) -> str:
+        return f'Equity: {self._equity:.2%} (precomputed preflop table)'
+
+
+class PreflopEquityTable:
+    """
+    Read-only, memory-mapped view of a preflop equity file.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH) -> None:
+        self._path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, number_of_classes, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"'{path}' is not a version {FORMAT_VERSION} preflop equity file.")
+        if number_of_classes != common.hands.NUMBER_OF_HAND_CLASSES:
+            raise ValueError(f"'{path}' holds {number_of_classes} hand classes.")
+        self._equities = memoryview(self._mmap)[HEADER.size:].cast('f')
+        return
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def class_equity(self, hero_class: int, villain_class: int) -> float:
+        return self._equities[hero_class * common.hands.NUMBER_OF_HAND_CLASSES + villain_class]
+
+    def hand_equity(self, hero, villain) -> PreflopEquity:
+        """
+        Returns Hero's equity against any two cards not in Hero's hand if
+        villain is None, which is exact up to the table's sampling error.
+        Against Villain's hand it is the class-vs-class average, which ignores
+        how the two hands' suits interact.
+        """
+        hero_class = common.hands.hand_class_index(hero)
+        if villain is not None:
+            villain_class = common.hands.hand_class_index(villain)
+            return PreflopEquity(equity=self.class_equity(hero_class=hero_class, villain_class=villain_class))
+
+        hero_mask = common.cards.to_mask(hero)
+        total = 0.0
+        number_of_combos = 0
+        for (i_index, i_mask) in enumerate(common.hands.COMBO_MASKS):
+            if not i_mask & hero_mask:
+                total += self.class_equity(hero_class=hero_class,
+                                           villain_class=common.hands.COMBO_HAND_CLASSES[i_index])
+                number_of_combos += 1
+        return PreflopEquity(equity=total / number_of_combos)
+
+    def close(self) -> None:
+        self._equities.release()
+        self._mmap.close()
+        return
+
+
+def get_table(path: str = None) -> PreflopEquityTable:
+    """
+    Returns the table stored at path (DEFAULT_PATH if None), mapping it on
+    first use.
+    """
+    path = path or DEFAULT_PATH
+    if path not in _open_tables:
+        _open_tables[path] = PreflopEquityTable(path=path)
+    return _open_tables[path]
+
+
+def table_exists(path: str = None) -> bool:
+    path = path or DEFAULT_PATH
+    return path in _open_tables or os.path.exists(path)
+
+
+# Generation
+
+def generate_table(path: str = DEFAULT_PATH, number_of_boards: int = DEFAULT_NUMBER_OF_BOARDS,
+                   seed: int = None) -> None:
+    """
+    Computes the 169x169 class equity matrix with common.batch_equity (which
+    needs NumPy) and writes it to path.
+    """
+    import numpy as np
+
+    import common.batch_equity
+
+    matrix = common.batch_equity.equity_matrix(number_of_boards=number_of_boards,
+                                               rng=np.random.default_rng(seed), by_hand_class=True)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, common.hands.NUMBER_OF_HAND_CLASSES, 0))
+        file.write(matrix.astype('<f4').tobytes())
+    os.replace(temporary_path, path)
+    return
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the precomputed preflop equity table.')
+    parser.add_argument('--path', default=DEFAULT_PATH)
+    parser.add_argument('--boards', type=int, default=DEFAULT_NUMBER_OF_BOARDS)
+    parser.add_argument('--seed', type=int, default=None)
+    arguments = parser.parse_args()
+    generate_table(path=arguments.path, number_of_boards=arguments.boards, seed=arguments.seed)
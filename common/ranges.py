@@ -0,0 +1,423 @@
+"""
+This module contains the Range class, a weighted set of starting hands.
+
+A Range is a flat 1326-slot array of weights, one slot per hole-card combo
+(see common.hands.COMBOS). A weight of 0 means the combo is not in the range;
+partial weights (e.g. 0.5 for "half the time") are allowed.
+
+Ranges are usually built from standard notation: comma separated items, each
+optionally followed by ':weight'.
+
+    'QQ+'         pairs from QQ up to AA
+    '88-55'       pairs from 88 down to 55
+    'A2s+'        A2s up to AKs
+    'KTo+'        KTo up to KQo
+    'K9s-K6s'     K9s down to K6s
+    '76s-54s'     76s, 65s, 54s (same gap)
+    'AK'          AKs and AKo
+    'AsKs'        that exact combo
+    'JTs:0.5'     JTs at half weight
+"""
+import array
+import bisect
+import itertools
+import random
+
+import common.cards
+import common.hands
+
+
+class Range:
+    """
+    A weighted set of hole-card combos.
+
+    Attributes:
+        weights: The 1326-slot array of per-combo weights.
+    """
+
+    def __init__(self, notation: str = '') -> None:
+        self._weights = array.array('d', bytes(8 * common.hands.NUMBER_OF_COMBOS))
+        self._cumulative_weights = None
+        self._dealer = None
+        if notation:
+            self.add(notation=notation)
+        return
+
+    @classmethod
+    def full(cls) -> 'Range':
+        """
+        Returns the range of all 1326 combos.
+        """
+        new_range = cls()
+        new_range._weights = array.array('d', [1.0]) * common.hands.NUMBER_OF_COMBOS
+        return new_range
+
+    @classmethod
+    def from_hands(cls, hands, weight: float = 1.0) -> 'Range':
+        """
+        Returns a range of the given two-card hands.
+        """
+        new_range = cls()
+        for i_hand in hands:
+            new_range.set_weight(hand=i_hand, weight=weight)
+        return new_range
+
+    # Properties
+
+    @property
+    def weights(self) -> array.array:
+        return self._weights
+
+    @property
+    def total_weight(self) -> float:
+        return sum(self._weights)
+
+    @property
+    def is_uniform(self) -> bool:
+        """
+        True if every combo in the range has the same weight.
+        """
+        return len({i_weight for i_weight in self._weights if i_weight}) <= 1
+
+    # Membership
+
+    def weight(self, hand) -> float:
+        return self._weights[common.hands.combo_index(*hand)]
+
+    def set_weight(self, hand, weight: float) -> None:
+        self._verify_weight(value=weight)
+        self._weights[common.hands.combo_index(*hand)] = weight
+        self._cumulative_weights = None
+        self._dealer = None
+        return
+
+    def combo_indexes(self) -> list[int]:
+        return [i_index for (i_index, i_weight) in enumerate(self._weights) if i_weight]
+
+    def hands(self) -> list[list[common.cards.Card]]:
+        return [common.hands.combo_cards(i_index) for i_index in self.combo_indexes()]
+
+    def __contains__(self, hand) -> bool:
+        return self._weights[common.hands.combo_index(*hand)] > 0.0
+
+    def __len__(self) -> int:
+        return common.hands.NUMBER_OF_COMBOS - self._weights.tolist().count(0.0)
+
+    def __bool__(self) -> bool:
+        return any(self._weights)
+
+    def __eq__(self, other: 'Range') -> bool:
+        return isinstance(other, Range) and self._weights == other._weights
+
+    # Set Operations
+
+    def copy(self) -> 'Range':
+        new_range = Range()
+        new_range._weights = array.array('d', self._weights)
+        return new_range
+
+    def union(self, other: 'Range') -> 'Range':
+        """
+        Returns a range holding every combo of either range, at the larger
+        of the two weights.
+        """
+        new_range = Range()
+        new_range._weights = array.array('d', map(max, self._weights, other._weights))
+        return new_range
+
+    def intersection(self, other: 'Range') -> 'Range':
+        """
+        Returns a range holding the combos in both ranges, at the smaller of
+        the two weights.
+        """
+        new_range = Range()
+        new_range._weights = array.array('d', map(min, self._weights, other._weights))
+        return new_range
+
+    def difference(self, other: 'Range') -> 'Range':
+        new_range = self.copy()
+        for i_index in other.combo_indexes():
+            new_range._weights[i_index] = 0.0
+        return new_range
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    # Card Removal
+
+    def remove_blocked(self, cards) -> None:
+        """
+        Removes, in place, every combo that holds one of the given cards
+        (Cards, integer codes, or a 52-bit mask as an int).
+        """
+        dead_mask = cards if isinstance(cards, int) else common.cards.to_mask(cards)
+        weights = self._weights
+        for (i_index, i_combo_mask) in enumerate(common.hands.COMBO_MASKS):
+            if i_combo_mask & dead_mask:
+                weights[i_index] = 0.0
+        self._cumulative_weights = None
+        self._dealer = None
+        return
+
+    def without(self, cards) -> 'Range':
+        """
+        Returns a copy with every combo holding one of the given cards removed.
+        """
+        new_range = self.copy()
+        new_range.remove_blocked(cards=cards)
+        return new_range
+
+    # Sampling
+
+    def sample(self, rng=None) -> list[common.cards.Card]:
+        """
+        Returns one hand drawn with probability proportional to its weight.
+        """
+        if self._cumulative_weights is None:
+            self._cumulative_weights = list(itertools.accumulate(self._weights))
+        total = self._cumulative_weights[-1]
+        if total <= 0.0:
+            raise ValueError('Cannot sample from an empty range.')
+        point = (rng or random).random() * total
+        index = bisect.bisect_right(self._cumulative_weights, point)
+        return common.hands.combo_cards(min(index, common.hands.NUMBER_OF_COMBOS - 1))
+
+    def deal(self, dead_mask: int = 0, rng=None) -> list[common.cards.Card]:
+        """
+        Returns one hand drawn by weight from the combos that hold none of the
+        cards in dead_mask (a 52-bit mask, e.g. Deck.dealt_mask). Expected
+        O(1) per draw; see RangeDealer.
+        """
+        if self._dealer is None:
+            self._dealer = RangeDealer(hand_range=self)
+        return common.hands.combo_cards(self._dealer.deal(dead_mask=dead_mask, rng=rng))
+
+    # Notation
+
+    def add(self, notation: str) -> None:
+        """
+        Adds the combos described by notation (see module docstring), setting
+        their weight.
+        """
+        for i_item in notation.split(','):
+            i_item = i_item.strip()
+            if not i_item:
+                continue
+            i_weight = 1.0
+            if ':' in i_item:
+                i_item, i_weight_text = i_item.split(':', 1)
+                try:
+                    i_weight = float(i_weight_text)
+                except ValueError:
+                    raise ValueError(f"Invalid weight in range item '{i_item}:{i_weight_text}'.") from None
+            self._verify_weight(value=i_weight)
+            for i_index in _parse_item(item=i_item.strip()):
+                self._weights[i_index] = i_weight
+        self._cumulative_weights = None
+        self._dealer = None
+        return
+
+    @staticmethod
+    def _verify_weight(value: float) -> None:
+        if not 0.0 <= value:
+            raise ValueError(f'Invalid range weight {value} given.')
+        return
+
+    def __repr__(self) -> str:
+        return f'Range({len(self)} combos)'
+
+
+# Parsing
+
+def _rank(value: str, item: str) -> int:
+    try:
+        return common.cards.RANKS.index(value.upper())
+    except ValueError:
+        raise ValueError(f"Invalid rank '{value}' in range item '{item}'.") from None
+
+
+def _parse_class(text: str, item: str) -> tuple[int, int, str]:
+    """
+    Parses 'AK', 'AKs', 'AKo' or 'AA' into (high rank, low rank, suitedness),
+    with suitedness one of 'p' (pair), 's', 'o' or 'b' (both).
+    """
+    if len(text) not in (2, 3):
+        raise ValueError(f"Invalid range item '{item}'.")
+    first = _rank(value=text[0], item=item)
+    second = _rank(value=text[1], item=item)
+    high, low = max(first, second), min(first, second)
+    suitedness = text[2].lower() if len(text) == 3 else 'b'
+    if high == low:
+        if len(text) == 3:
+            raise ValueError(f"Pairs cannot be suited or offsuit in range item '{item}'.")
+        suitedness = 'p'
+    elif suitedness not in ('s', 'o', 'b'):
+        raise ValueError(f"Invalid range item '{item}'.")
+    return high, low, suitedness
+
+
+def _class_combos(high: int, low: int, suitedness: str) -> list[int]:
+    high_rank = common.cards.RANKS[high]
+    low_rank = common.cards.RANKS[low]
+    if suitedness == 'p':
+        names = [f'{high_rank}{low_rank}']
+    elif suitedness == 'b':
+        names = [f'{high_rank}{low_rank}s', f'{high_rank}{low_rank}o']
+    else:
+        names = [f'{high_rank}{low_rank}{suitedness}']
+    combos = []
+    for i_name in names:
+        combos.extend(common.hands.HAND_CLASS_COMBOS[common.hands.hand_class_index(i_name)])
+    return combos
+
+
+def _parse_item(item: str) -> list[int]:
+    if len(item) == 4 and item[1].lower() in common.cards.SUITS and item[3].lower() in common.cards.SUITS:
+        hand = [common.cards.Card.from_string(item[:2]), common.cards.Card.from_string(item[2:])]
+        return [common.hands.combo_index(*hand)]
+
+    if item.endswith('+'):
+        high, low, suitedness = _parse_class(text=item[:-1], item=item)
+        if suitedness == 'p':
+            classes = [(i_rank, i_rank) for i_rank in range(low, 13)]
+        else:
+            classes = [(high, i_rank) for i_rank in range(low, high)]
+        return [i_index for (i_high, i_low) in classes for i_index in _class_combos(i_high, i_low, suitedness)]
+
+    if '-' in item:
+        first_text, last_text = item.split('-', 1)
+        first = _parse_class(text=first_text, item=item)
+        last = _parse_class(text=last_text, item=item)
+        if first[2] != last[2]:
+            raise ValueError(f"Both ends of range item '{item}' must be the same kind of hand.")
+        suitedness = first[2]
+        if suitedness == 'p':
+            top, bottom = max(first[0], last[0]), min(first[0], last[0])
+            classes = [(i_rank, i_rank) for i_rank in range(bottom, top + 1)]
+        elif first[0] == last[0]:
+            top, bottom = max(first[1], last[1]), min(first[1], last[1])
+            classes = [(first[0], i_rank) for i_rank in range(bottom, top + 1)]
+        elif first[0] - first[1] == last[0] - last[1]:
+            gap = first[0] - first[1]
+            top, bottom = max(first[0], last[0]), min(first[0], last[0])
+            classes = [(i_rank, i_rank - gap) for i_rank in range(bottom, top + 1)]
+        else:
+            raise ValueError(f"Range item '{item}' must keep either the top card or the gap fixed.")
+        return [i_index for (i_high, i_low) in classes for i_index in _class_combos(i_high, i_low, suitedness)]
+
+    return _class_combos(*_parse_class(text=item, item=item))
+
+
+# Weighted Dealing
+
+class AliasTable:
+    """
+    Vose's alias table: after O(n) setup, draws an index with probability
+    proportional to its weight using one random number.
+    """
+
+    def __init__(self, weights: list[float]) -> None:
+        number_of_weights = len(weights)
+        total = sum(weights)
+        if number_of_weights == 0 or total <= 0.0:
+            raise ValueError('Cannot build an alias table without positive weights.')
+        scaled = [i_weight * number_of_weights / total for i_weight in weights]
+        self._probabilities = [1.0] * number_of_weights
+        self._aliases = list(range(number_of_weights))
+        small = [i_index for (i_index, i_weight) in enumerate(scaled) if i_weight < 1.0]
+        large = [i_index for (i_index, i_weight) in enumerate(scaled) if i_weight >= 1.0]
+        while small and large:
+            i_small = small.pop()
+            i_large = large[-1]
+            self._probabilities[i_small] = scaled[i_small]
+            self._aliases[i_small] = i_large
+            scaled[i_large] -= 1.0 - scaled[i_small]
+            if scaled[i_large] < 1.0:
+                small.append(large.pop())
+        return
+
+    def __len__(self) -> int:
+        return len(self._probabilities)
+
+    def draw(self, rng=None) -> int:
+        point = (rng or random).random() * len(self._probabilities)
+        index = int(point)
+        if point - index < self._probabilities[index]:
+            return index
+        return self._aliases[index]
+
+
+class RangeDealer:
+    """
+    Deals combos from a Range by weight, skipping combos blocked by dead cards.
+
+    The alias table covers the range minus the dead cards it was built for.
+    When more cards become dead (e.g. the board is dealt), only the combos
+    holding the new cards are looked at to update the blocked weight, and
+    draws of blocked combos are simply redrawn. Once the blocked share of the
+    weight exceeds REBUILD_FRACTION the table is rebuilt without them, so the
+    expected number of draws per deal stays below 1 / (1 - REBUILD_FRACTION).
+    """
+
+    REBUILD_FRACTION = 0.25
+
+    def __init__(self, hand_range: Range) -> None:
+        self._weights = hand_range.weights
+        self._build(dead_mask=0)
+        return
+
+    def deal(self, dead_mask: int = 0, rng=None) -> int:
+        """
+        Returns the COMBOS index of a hand that holds no card in dead_mask.
+        """
+        if dead_mask != self._dead_mask:
+            self._update(dead_mask=dead_mask)
+        combo_masks = common.hands.COMBO_MASKS
+        combos = self._combos
+        while True:
+            combo = combos[self._table.draw(rng=rng)]
+            if not combo_masks[combo] & dead_mask:
+                return combo
+
+    def _update(self, dead_mask: int) -> None:
+        if self._table_mask & ~dead_mask:
+            # Cards came back into play, which the table cannot undo.
+            self._build(dead_mask=dead_mask)
+            return
+        if self._dead_mask & ~dead_mask:
+            # Some cards came back since the last deal; recount from the table.
+            self._dead_mask = self._table_mask
+            self._blocked_weight = 0.0
+        blocked_weight = self._blocked_weight
+        new_cards = dead_mask & ~self._dead_mask
+        seen = self._dead_mask
+        while new_cards:
+            i_code = (new_cards & -new_cards).bit_length() - 1
+            new_cards &= new_cards - 1
+            for i_combo in common.hands.CARD_COMBOS[i_code]:
+                if not common.hands.COMBO_MASKS[i_combo] & seen:
+                    blocked_weight += self._weights[i_combo]
+            seen |= 1 << i_code
+        self._dead_mask = dead_mask
+        self._blocked_weight = blocked_weight
+        if blocked_weight > self.REBUILD_FRACTION * self._table_weight:
+            self._build(dead_mask=dead_mask)
+        return
+
+    def _build(self, dead_mask: int) -> None:
+        combos = []
+        weights = []
+        for (i_index, i_weight) in enumerate(self._weights):
+            if i_weight and not common.hands.COMBO_MASKS[i_index] & dead_mask:
+                combos.append(i_index)
+                weights.append(i_weight)
+        if not combos:
+            raise ValueError('Every hand in the range is blocked by dead cards.')
+        self._combos = combos
+        self._table = AliasTable(weights=weights)
+        self._table_mask = dead_mask
+        self._table_weight = sum(weights)
+        self._dead_mask = dead_mask
+        self._blocked_weight = 0.0
+        return
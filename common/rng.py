@@ -0,0 +1,69 @@
+"""
+This module provides the random number generators Tables and Decks deal with.
+
+Every Table owns its own generator (see Table.rng), which it shares with its
+Deck and uses for seat and range draws, so a Table built with
+make_rng(seed) deals the same hands every run and tables on different
+threads never share state. Anything with the random.Random interface works.
+
+make_rng() returns a random.Random, or with use_numpy=True a BlockRandom: a
+random.Random whose floats come from a NumPy PCG64 Generator, drawn BLOCK_SIZE
+at a time so that each draw is a list pop rather than a call into NumPy.
+NumPy is optional and only imported for BlockRandom.
+"""
+import random
+
+
+BLOCK_SIZE = 4096
+
+
+class BlockRandom(random.Random):
+    """
+    random.Random backed by blocks of PCG64 floats (see module docstring).
+
+    Only random() is replaced; every other method (randrange, choice, sample,
+    choices, shuffle, ...) is derived from it by random.Random. The seed must
+    be an integer or None.
+    """
+
+    def __init__(self, seed: int = None, block_size: int = BLOCK_SIZE) -> None:
+        self._block_size = block_size
+        self._generator = None
+        self._block = []
+        self._pop = self._block.pop
+        super().__init__(seed)
+        return
+
+    def seed(self, a: int = None, version: int = 2) -> None:
+        import numpy as np
+
+        super().seed(a, version)
+        self._generator = np.random.Generator(np.random.PCG64(a))
+        self._block.clear()
+        return
+
+    def random(self) -> float:
+        try:
+            return self._pop()
+        except IndexError:
+            self._refill()
+            return self._pop()
+
+    def _refill(self) -> None:
+        # Refilled in place so the bound pop stays valid.
+        self._block[:] = self._generator.random(self._block_size).tolist()
+        return
+
+
+def make_rng(seed: int = None, use_numpy: bool = False) -> random.Random:
+    """
+    Returns a new generator for a Table or Deck.
+
+    Args:
+        seed: Seed for reproducible draws; None seeds from the OS.
+        use_numpy: Return a BlockRandom (NumPy PCG64) instead of the
+          standard Mersenne Twister.
+    """
+    if use_numpy:
+        return BlockRandom(seed=seed)
+    return random.Random(seed)
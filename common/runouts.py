@@ -0,0 +1,79 @@
+"""
+This module generates runouts: every way the rest of the board can come.
+
+runouts() yields (board, weight) pairs lazily from the cards not yet seen,
+one combination at a time, so memory use is constant however many runouts
+there are (1,081 turn and river pairs from a flop, 22,100 flops preflop,
+over two million five-card boards). Runouts are unordered: a turn and river
+pair is yielded once, not once per order.
+
+With isomorphic=True, runouts that are suit permutations of each other given
+the known cards (see common.isomorphism.suit_symmetries()) are yielded once,
+weighted by how many runouts they stand for; the weights sum to the number
+of raw runouts. Each runout is yielded only if it is the smallest of its
+relabellings, so no set of runouts seen is kept either.
+"""
+import itertools
+
+import common.cards
+import common.isomorphism
+
+
+def runouts(board=(), hands=(), dead=(), number_of_cards: int = None, isomorphic: bool = False):
+    """
+    Yields (board, weight) for every runout: board is a tuple of Cards (the
+    given board followed by the runout) and weight is 1, or the number of
+    runouts it stands for with isomorphic=True.
+
+    Args:
+        board: The board so far.
+        hands: Each player's known hole cards (e.g. Hero's and Villain's).
+          Their cards cannot come, and with isomorphic=True each hand is
+          kept apart from the others.
+        dead: Other cards that cannot come.
+        number_of_cards: Cards to deal; defaults to the rest of the board up
+          to the river.
+        isomorphic: Yield one runout per suit-isomorphism class.
+    """
+    board = tuple(board)
+    hands = [common.cards.to_codes(i_hand) for i_hand in hands]
+    board_codes = common.cards.to_codes(board)
+    dead_codes = common.cards.to_codes(dead)
+    if number_of_cards is None:
+        number_of_cards = 5 - len(board_codes)
+    if number_of_cards < 0 or len(board_codes) + number_of_cards > 5:
+        raise ValueError(f'Cannot deal {number_of_cards} cards to a board of {len(board_codes)}.')
+
+    seen_mask = common.cards.to_mask(board_codes + dead_codes + [i_code for i_hand in hands for i_code in i_hand])
+    live = [i_code for i_code in range(52) if not seen_mask >> i_code & 1]
+    suit_maps = [(0, 1, 2, 3)]
+    if isomorphic:
+        suit_maps = common.isomorphism.suit_symmetries(groups=hands + [board_codes, dead_codes])
+
+    if len(suit_maps) == 1:
+        for i_runout in itertools.combinations(live, number_of_cards):
+            yield board + tuple(common.cards.CARDS[i_code] for i_code in i_runout), 1
+        return
+
+    for i_runout in itertools.combinations(live, number_of_cards):
+        i_weight = _orbit_size(runout=i_runout, suit_maps=suit_maps)
+        if i_weight:
+            yield board + tuple(common.cards.CARDS[i_code] for i_code in i_runout), i_weight
+    return
+
+
+def _orbit_size(runout: tuple, suit_maps: list[tuple]) -> int:
+    """
+    Returns how many distinct runouts the suit maps take runout to, or 0 if
+    any of them is smaller than runout (which is then not its class's
+    representative). runout must be sorted.
+    """
+    runout = list(runout)
+    number_fixed = 0
+    for i_suit_map in suit_maps:
+        i_image = sorted(i_code & ~3 | i_suit_map[i_code & 3] for i_code in runout)
+        if i_image < runout:
+            return 0
+        if i_image == runout:
+            number_fixed += 1
+    return len(suit_maps) // number_fixed
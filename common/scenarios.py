@@ -0,0 +1,145 @@
+"""
+This module generates drill scenarios headlessly and streams them to disk.
+
+A scenario is one hand driven through the Table state machine with
+Table.apply(): Init, PreFlop and then as many streets as requested. A single
+Table is reused (started over between scenarios) and scenarios are yielded one
+at a time, so memory use does not depend on how many are generated.
+
+Two output formats are supported:
+    JSONL: one JSON object per line, cards as strings ('As').
+    Binary: fixed-width RECORD structs, cards as integer codes (see
+      common.cards), with -1 for a card that has not been dealt.
+"""
+import json
+import struct
+
+import common.cards
+import common.table
+
+
+STREET_COMMANDS = {
+    'preflop': [],
+    'flop': ['F'],
+    'turn': ['F', 'T'],
+    'river': ['F', 'T', 'R'],
+}
+
+# Hero seat, Villain seat, Hero's 2 cards, Villain's 2 cards, 5 board cards.
+RECORD = struct.Struct('<BB2b2b5b')
+NO_CARD = -1
+
+
+def generate_scenarios(count: int, street: str = 'river', table: common.table.Table = None):
+    """
+    Yields count scenario dicts, dealt up to and including street.
+
+    Args:
+        count: Number of scenarios to generate.
+        street: One of STREET_COMMANDS ('preflop', 'flop', 'turn', 'river').
+        table: Table to deal on, e.g. one with hero_range/villain_range set.
+          A new Table is used by default.
+    """
+    if street not in STREET_COMMANDS:
+        raise ValueError(f"Invalid street '{street}' given.")
+    table = table or common.table.Table()
+    commands = STREET_COMMANDS[street]
+    for i_scenario in range(count):
+        if i_scenario:
+            table.apply(command='N')
+        table.apply()
+        table.apply_commands(commands=commands)
+        yield scenario_from_table(table=table)
+    return
+
+
+def scenario_from_table(table: common.table.Table) -> dict:
+    hero_seat = table.get_hero_seat()
+    villain_seat = table.get_villain_seat()
+    return {
+        'hero_seat': hero_seat.number,
+        'hero_position': hero_seat.name,
+        'villain_seat': villain_seat.number,
+        'villain_position': villain_seat.name,
+        'hero_hand': [repr(i_card) for i_card in hero_seat.hand],
+        'villain_hand': [repr(i_card) for i_card in villain_seat.hand],
+        'board': [repr(i_card) for i_card in table.board],
+    }
+
+
+# JSONL
+
+def write_jsonl(scenarios, file) -> int:
+    """
+    Writes scenarios to a text file, one JSON object per line. Returns the
+    number written.
+    """
+    number_written = 0
+    for i_scenario in scenarios:
+        file.write(json.dumps(i_scenario))
+        file.write('\n')
+        number_written += 1
+    return number_written
+
+
+def read_jsonl(file):
+    for i_line in file:
+        if i_line.strip():
+            yield json.loads(i_line)
+    return
+
+
+# Binary
+
+def pack_scenario(scenario: dict) -> bytes:
+    hero_hand = _padded_codes(cards=scenario['hero_hand'], length=2)
+    villain_hand = _padded_codes(cards=scenario['villain_hand'], length=2)
+    board = _padded_codes(cards=scenario['board'], length=5)
+    return RECORD.pack(scenario['hero_seat'], scenario['villain_seat'], *hero_hand, *villain_hand, *board)
+
+
+def unpack_scenario(record: bytes) -> dict:
+    """
+    Inverse of pack_scenario(). Positions are not stored in records and are
+    looked up from the standard nine-seat layout.
+    """
+    values = RECORD.unpack(record)
+    hero_seat, villain_seat = values[0], values[1]
+    return {
+        'hero_seat': hero_seat,
+        'hero_position': common.table.SEAT_NAMES[hero_seat - 1],
+        'villain_seat': villain_seat,
+        'villain_position': common.table.SEAT_NAMES[villain_seat - 1],
+        'hero_hand': _card_strings(codes=values[2:4]),
+        'villain_hand': _card_strings(codes=values[4:6]),
+        'board': _card_strings(codes=values[6:11]),
+    }
+
+
+def write_binary(scenarios, file) -> int:
+    """
+    Writes scenarios to a binary file as fixed-width RECORD structs. Returns
+    the number written.
+    """
+    number_written = 0
+    for i_scenario in scenarios:
+        file.write(pack_scenario(scenario=i_scenario))
+        number_written += 1
+    return number_written
+
+
+def read_binary(file):
+    while True:
+        record = file.read(RECORD.size)
+        if len(record) < RECORD.size:
+            return
+        yield unpack_scenario(record=record)
+
+
+def _padded_codes(cards: list[str], length: int) -> list[int]:
+    codes = [common.cards.Card.from_string(i_card).code for i_card in cards]
+    return codes + [NO_CARD] * (length - len(codes))
+
+
+def _card_strings(codes) -> list[str]:
+    return [repr(common.cards.Card.from_code(i_code)) for i_code in codes if i_code != NO_CARD]
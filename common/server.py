@@ -0,0 +1,167 @@
+"""
+This module serves drill sessions to many trainees from one process.
+
+DrillServer is an asyncio server speaking a plain line protocol over TCP or a
+Unix socket (so telnet/nc work as clients). Each connection is a session with
+its own Table, taken from a TablePool and returned when the session ends.
+The server sends the rendered table and the state's prompt, ending with
+PROMPT; the client answers with one command per line, exactly as at the
+terminal (see TableStateWithUserInput). Commands are executed with
+Table.apply(), which does no I/O, so thousands of sessions share one event
+loop.
+
+Equity ('E') and outs ('O') are CPU-heavy pure Python, so they run in an
+executor, by default a process pool (worker threads would hold the GIL and
+stall the loop). Only the spot is sent to it: Table.get_hero_matchup() gives
+it as card codes and Ranges, which pickle cheaply. The session simply awaits
+the result. A command that fails (e.g. a ValueError from an impossible
+question) is answered with an error line and the session goes on.
+A session that sends nothing for idle_timeout seconds is closed and its
+Table goes back to the pool.
+"""
+import asyncio
+import concurrent.futures
+import functools
+import random
+
+import common.outs
+import common.table
+
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+PROMPT = '> '
+ENCODING = 'utf-8'
+
+
+class DrillServer:
+    """
+    Asyncio drill server (see module docstring).
+
+    Attributes:
+        idle_timeout: Seconds of silence before a session is closed.
+        executor: concurrent.futures executor for equity and outs. Defaults
+          to a process pool the server owns and shuts down in close().
+        pool: TablePool the sessions' Tables come from.
+        number_of_sessions: Number of sessions currently connected.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, executor=None,
+                 pool: common.table.TablePool = None) -> None:
+        self.idle_timeout = idle_timeout
+        self._owns_executor = executor is None
+        self.executor = executor or concurrent.futures.ProcessPoolExecutor(initializer=_seed_worker)
+        self.pool = pool or common.table.TablePool()
+        self._number_of_sessions = 0
+        return
+
+    @property
+    def number_of_sessions(self) -> int:
+        return self._number_of_sessions
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0, path: str = None) -> asyncio.AbstractServer:
+        """
+        Starts listening on a Unix socket at path if given, otherwise on host
+        and port (0 picks a free port). Returns the asyncio server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_session, path=path)
+        return await asyncio.start_server(self.handle_session, host=host, port=port)
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 0, path: str = None) -> None:
+        server = await self.start(host=host, port=port, path=path)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+        return
+
+    def close(self) -> None:
+        """
+        Shuts down the executor if the server created it.
+        """
+        if self._owns_executor:
+            self.executor.shutdown()
+        return
+
+    async def handle_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Runs one trainee's session until they quit, disconnect or go idle.
+        """
+        table = self.pool.acquire()
+        self._number_of_sessions += 1
+        try:
+            table.apply()
+            while True:
+                await self._send(writer=writer, text=render(table=table))
+                try:
+                    line = await asyncio.wait_for(reader.readline(), timeout=self.idle_timeout)
+                except asyncio.TimeoutError:
+                    await self._send(writer=writer, text='Session timed out.\n')
+                    break
+                if not line:
+                    break
+
+                command = line.decode(ENCODING, errors='replace').strip().upper()
+                if command not in table.state.valid_inputs:
+                    await self._send(writer=writer, text='Invalid input.\n')
+                    continue
+                if command == 'Q':
+                    break
+                try:
+                    await self.run_command(table=table, writer=writer, command=command)
+                except (ValueError, RuntimeError) as error:
+                    await self._send(writer=writer, text=f'Error: {error}\n')
+        except ConnectionError:
+            pass
+        finally:
+            self._number_of_sessions -= 1
+            self.pool.release(table=table)
+            writer.close()
+        return
+
+    async def run_command(self, table: common.table.Table, writer: asyncio.StreamWriter, command: str) -> None:
+        """
+        Runs a valid command other than 'Q' and sends any result.
+        """
+        if command == 'E':
+            result = await self.calculate_hero_equity(table=table)
+            await self._send(writer=writer, text=f'{result}\n')
+        elif command == 'O':
+            result = await self._run_in_executor(functools.partial(common.outs.multiway_outs,
+                                                                   **table.get_hero_matchup()))
+            await self._send(writer=writer, text=f'{result}\n')
+        else:
+            table.apply(command=command)
+        return
+
+    async def calculate_hero_equity(self, table: common.table.Table):
+        """
+        Computes the equity of Table.calculate_hero_equity() in the executor,
+        with the same accuracy settings as the terminal's 'E' command. The
+        Table's rng and equity_cache stay in this process and are not used.
+        """
+        calculate = functools.partial(common.table.calculate_table_equity, **table.get_hero_matchup(),
+                                      target_standard_error=common.table.EQUITY_PROMPT_STANDARD_ERROR,
+                                      time_budget=common.table.EQUITY_PROMPT_TIME_BUDGET)
+        return await self._run_in_executor(calculate)
+
+    async def _run_in_executor(self, function):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function)
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, text: str) -> None:
+        writer.write(text.encode(ENCODING))
+        await writer.drain()
+        return
+
+
+def _seed_worker() -> None:
+    # Forked workers would otherwise all start from the parent's random state.
+    random.seed()
+    return
+
+
+def render(table: common.table.Table) -> str:
+    return f'{table}\n{table.state.user_prompt}{PROMPT}'
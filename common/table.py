@@ -1,18 +1,31 @@
 """
 This module contains classes for the Table and its Seats.
 """
+import collections
 from abc import ABC, abstractmethod
-import random
 from typing import Union
 
 import common.cards
+import common.equity
+import common.evaluator
+import common.outs
+import common.preflop
+import common.ranges
+import common.rng
+import common.runouts
+import common.textures
+
+
+SEAT_NAMES = ['UTG', 'UTG+1', 'UTG+2', 'LJ', 'HJ', 'CO', 'BTN', 'SB', 'BB']
+ROLES = [None, 'H', 'V']
+MAX_UNDO = 100
 
 
 class BaseClass:
 
     @staticmethod
     def _verify_role(value: str) -> None:
-        if value not in [None, 'H', 'V']:
+        if value not in ROLES:
             raise ValueError(f"Invalid role {value} assigned to seat.")
         return
 
@@ -33,6 +46,8 @@ class Seat(BaseClass):
         self._name = name
         self._cards = []
         self._role = None
+        # Set by the owning Table to keep its role index up to date.
+        self._on_role_change = None
         return
 
     @property
@@ -61,9 +76,123 @@ class Seat(BaseClass):
     @role.setter
     def role(self, value: str) -> None:
         self._verify_role(value=value)
+        old_role = self._role
         self._role = value
+        if self._on_role_change is not None and value != old_role:
+            self._on_role_change(seat=self, old_role=old_role)
+        return
+
+
+class SeatSet:
+    """
+    An ordered set of Seats with O(1) add, remove, length, indexing and
+    random choice (a list plus a seat-to-position index; removal swaps the
+    last seat into the gap).
+    """
+
+    def __init__(self) -> None:
+        self._seats = []
+        self._positions = {}
+        return
+
+    def add(self, seat: Seat) -> None:
+        if seat not in self._positions:
+            self._positions[seat] = len(self._seats)
+            self._seats.append(seat)
+        return
+
+    def remove(self, seat: Seat) -> None:
+        position = self._positions.pop(seat)
+        last_seat = self._seats.pop()
+        if last_seat is not seat:
+            self._seats[position] = last_seat
+            self._positions[last_seat] = position
+        return
+
+    def choice(self, rng) -> Seat:
+        if not self._seats:
+            raise IndexError('No seats to choose from.')
+        return self._seats[int(rng.random() * len(self._seats))]
+
+    def __contains__(self, seat: Seat) -> bool:
+        return seat in self._positions
+
+    def __getitem__(self, index: int) -> Seat:
+        return self._seats[index]
+
+    def __iter__(self):
+        return iter(self._seats)
+
+    def __len__(self) -> int:
+        return len(self._seats)
+
+
+class TableSnapshot:
+    """
+    An immutable record of a Table's hand: every seat's role and hole cards,
+    the board, the deck and the state.
+
+    Taking one copies no Deck and no Cards: the deck is kept as its 52-bit
+    dealt mask, Cards are flyweights, and any part equal to the Table's
+    previous snapshot (usually the seats, often the flop) is that snapshot's
+    own tuple. A tree of runouts explored from one flop therefore shares
+    everything but its turns and rivers.
+
+    Attributes:
+        roles: Tuple of each seat's role, in seat order.
+        hands: Tuple of each seat's hole cards (a tuple), in seat order.
+        flop: Tuple of the flop cards (empty preflop).
+        turn: The turn Card or None.
+        river: The river Card or None.
+        dealt_mask: The deck's dealt_mask.
+        state_class: The TableState subclass the Table was in.
+    """
+
+    __slots__ = ('_roles', '_hands', '_flop', '_turn', '_river', '_dealt_mask', '_state_class')
+
+    def __init__(self, roles: tuple, hands: tuple, flop: tuple, turn: common.cards.Card, river: common.cards.Card,
+                 dealt_mask: int, state_class: type) -> None:
+        self._roles = roles
+        self._hands = hands
+        self._flop = flop
+        self._turn = turn
+        self._river = river
+        self._dealt_mask = dealt_mask
+        self._state_class = state_class
         return
 
+    @property
+    def roles(self) -> tuple:
+        return self._roles
+
+    @property
+    def hands(self) -> tuple:
+        return self._hands
+
+    @property
+    def flop(self) -> tuple:
+        return self._flop
+
+    @property
+    def turn(self) -> common.cards.Card:
+        return self._turn
+
+    @property
+    def river(self) -> common.cards.Card:
+        return self._river
+
+    @property
+    def dealt_mask(self) -> int:
+        return self._dealt_mask
+
+    @property
+    def state_class(self) -> type:
+        return self._state_class
+
+    @property
+    def board(self) -> list[common.cards.Card]:
+        return list(self._flop) + [i_card for i_card in (self._turn, self._river) if i_card is not None]
+
 
 class Table(BaseClass):
     """
@@ -80,38 +209,96 @@ class Table(BaseClass):
           currently in.
         seats: A list of Seat objects at the Table.
         deck: A Deck object used at the Table.
+        hero_range: Range Hero's hands are dealt from (None for any hand).
+        villain_range: Range Villain's hands are dealt from (None to deal
+          Villain no cards).
+        rng: The random.Random-like generator for every draw at this Table
+          (seats, deck, ranges, equity sampling). Pass
+          common.rng.make_rng(seed) for reproducible play.
+        number_of_villains: How many seats Init gives the Villain role (1
+          for heads-up drills, up to 8 on nine seats for multi-way pots).
+        equity_cache: A common.equity_cache.EquityCache that heads-up equity
+          questions go through, or None. May be shared between Tables.
+        flop_texture: Texture every flop is dealt with (see
+          common.textures, e.g. 'monotone' or ('connected', 'low')), or None
+          for any flop.
+        history: TableSnapshots taken before each command (the last MAX_UNDO)
+          for undo().
+
+    Either range may also be a dict of seat name to Range (e.g. opening ranges
+    per position); a seat missing from the dict is dealt any hand.
+
+    Seats are indexed by number and by role (a SeatSet per role, the empty
+    seats being role None). The indexes are updated whenever a seat's role
+    changes, so seat lookups never scan the table.
+
+    Hand values are incremental: for each seat the Table keeps a
+    common.evaluator.HandState on the cards that re-dealing the last street
+    leaves in place (the hole cards and the board below that street). Re-
+    dealing the turn or river only adds the new card to it, and a "what if"
+    sweep over every card the street could have been costs a few integer
+    operations per card.
     """
 
-    def __init__(self) -> None:
-        self.state = Init()
+    def __init__(self, hero_range=None, villain_range=None, rng=None, seat_names: list[str] = None,
+                 number_of_villains: int = 1) -> None:
+        self.rng = rng or common.rng.make_rng()
+        self._states = {}
+        self.state = self.get_state(state_class=Init)
         self.seats = []
-        self._populate_seats()
-        self.deck = common.cards.Deck()
+        self._seats_by_number = {}
+        self._seats_by_role = {i_role: SeatSet() for i_role in ROLES}
+        self._populate_seats(seat_names=seat_names or SEAT_NAMES)
+        self.deck = common.cards.Deck(rng=self.rng)
         self._flop = []
         self._turn = None
         self._river = None
+        self.hero_range = hero_range
+        self.villain_range = villain_range
+        self.number_of_villains = number_of_villains
+        self.equity_cache = None
+        self.flop_texture = None
+        self._hand_states = {}
+        self.history = collections.deque(maxlen=MAX_UNDO)
+        self._last_snapshot = None
         return
 
     # General
 
-    def get_seat_by_number(self, seat_number: int) -> Seat:
+    def reset(self) -> None:
+        """
+        Starts the Table over in place (the 'N' command): clears every seat,
+        gathers the deck and returns to Init. Seats, the deck, the rng and the
+        state objects are reused, so a new hand allocates almost nothing.
+        """
         for i_seat in self.seats:
-            if i_seat.number == seat_number:
-                return i_seat
-        raise IndexError(f'Seat number {seat_number} not found.')
+            i_seat.role = None
+            i_seat.hand = []
+        self.deck.shuffle()
+        self._flop = []
+        self._turn = None
+        self._river = None
+        self.state = self.get_state(state_class=Init)
+        return
+
+    def get_seat_by_number(self, seat_number: int) -> Seat:
+        try:
+            return self._seats_by_number[seat_number]
+        except KeyError:
+            raise IndexError(f'Seat number {seat_number} not found.') from None
 
     def get_seats_by_role(self, role: Union[str, None]) -> list[Seat]:
-        self._verify_role(value=role)
+        return list(self.get_seat_set_by_role(role=role))
 
-        seats = []
-        for i_seat in self.seats:
-            if i_seat.role == role:
-                seats.append(i_seat)
-        return seats
+    def get_seat_set_by_role(self, role: Union[str, None]) -> SeatSet:
+        """
+        Returns the live index of seats with role (no copy; do not modify).
+        """
+        self._verify_role(value=role)
+        return self._seats_by_role[role]
 
     def get_random_empty_seat(self) -> Seat:
-        seats = self.get_seats_by_role(role=None)
-        return random.choice(seats)
+        return self._seats_by_role[None].choice(rng=self.rng)
 
     def assign_role_to_seat(self, seat: Seat, role: Union[str, None]) -> None:
         self._verify_role(value=role)
@@ -150,7 +337,7 @@ class Table(BaseClass):
         return hero_seat.hand
 
     def get_hero_seat(self) -> Union[Seat, None]:
-        seats = self.get_seats_by_role(role='H')
+        seats = self._seats_by_role['H']
         if len(seats) > 1:
             raise RuntimeError(f"{len(seats)} seats found with role 'H'.")
         if len(seats) == 1:
@@ -163,6 +350,18 @@ class Table(BaseClass):
         seat.hand = []
         return
 
+    def deal_hero_hand(self) -> None:
+        """
+        Deals Hero two cards, from hero_range if one applies to Hero's seat.
+        """
+        seat = self.get_hero_seat()
+        hand_range = self.get_range_for_seat(hand_range=self.hero_range, seat=seat)
+        if hand_range is None:
+            self.deal_to_seat(number_of_cards=2, seat_number=seat.number)
+        else:
+            self.deal_range_to_seat(hand_range=hand_range, seat_number=seat.number)
+        return
+
     # Villain
 
     def assign_villain_role_to_random_empty_seat(self) -> None:
@@ -171,13 +370,66 @@ class Table(BaseClass):
         return
 
     def get_villain_seat(self) -> Union[Seat, None]:
-        seats = self.get_seats_by_role(role='V')
+        """
+        Returns the only Villain seat; see get_villain_seats() for multi-way
+        tables.
+        """
+        seats = self._seats_by_role['V']
         if len(seats) > 1:
             raise RuntimeError(f"{len(seats)} seats found with role 'V'.")
         if len(seats) == 1:
             return seats[0]
         return None
 
+    def get_villain_seats(self) -> list[Seat]:
+        """
+        Returns every Villain seat, in seat order.
+        """
+        return sorted(self._seats_by_role['V'], key=lambda i_seat: i_seat.number)
+
+    def return_villains_cards_to_deck(self) -> None:
+        seat = self.get_villain_seat()
+        self.return_cards_to_deck(cards=seat.hand)
+        seat.hand = []
+        return
+
+    def deal_villain_hand(self, seat: Seat = None) -> None:
+        """
+        Deals a Villain two cards from villain_range, or any two cards if the
+        range has no entry for Villain's seat.
+
+        Args:
+            seat: The Villain seat to deal to. Defaults to the only one.
+        """
+        seat = seat or self.get_villain_seat()
+        hand_range = self.get_range_for_seat(hand_range=self.villain_range, seat=seat)
+        if hand_range is None:
+            self.deal_to_seat(number_of_cards=2, seat_number=seat.number)
+        else:
+            self.deal_range_to_seat(hand_range=hand_range, seat_number=seat.number)
+        return
+
+    # Ranges
+
+    @staticmethod
+    def get_range_for_seat(hand_range, seat: Seat) -> Union[common.ranges.Range, None]:
+        """
+        Resolves a Range-or-dict range setting (see class docstring) for seat.
+        """
+        if isinstance(hand_range, dict):
+            return hand_range.get(seat.name)
+        return hand_range
+
+    def deal_range_to_seat(self, hand_range: common.ranges.Range, seat_number: int) -> None:
+        """
+        Deals the seat a hand drawn by weight from hand_range, skipping combos
+        blocked by cards already dealt.
+        """
+        seat = self.get_seat_by_number(seat_number=seat_number)
+        hand = hand_range.deal(dead_mask=self.deck.dealt_mask, rng=self.rng)
+        seat.hand = [self.deck.deal_specific_card(card=i_card) for i_card in hand]
+        return
+
     # Flop
 
     @property
@@ -189,8 +441,17 @@ class Table(BaseClass):
         self._flop = cards
         return
 
-    def deal_flop(self) -> None:
-        self.flop = self.deck.deal_cards(number_of_cards=3)
+    def deal_flop(self, texture=None) -> None:
+        """
+        Deals the flop, drawn from the flops with texture (or flop_texture)
+        if one is set.
+        """
+        texture = texture or self.flop_texture
+        if texture is None:
+            self.flop = self.deck.deal_cards(number_of_cards=3)
+            return
+        flop = common.textures.deal_flop(texture=texture, dead_mask=self.deck.dealt_mask, rng=self.rng)
+        self.flop = [self.deck.deal_specific_card(card=i_card) for i_card in flop]
         return
 
     def return_flop_to_deck(self) -> None:
@@ -238,6 +499,220 @@ class Table(BaseClass):
         self.river = None
         return
 
+    # Board & Equity
+
+    @property
+    def board(self) -> list[common.cards.Card]:
+        board = list(self.flop)
+        if self.turn is not None:
+            board.append(self.turn)
+        if self.river is not None:
+            board.append(self.river)
+        return board
+
+    def get_unblocked_range(self, hand_range: common.ranges.Range) -> common.ranges.Range:
+        """
+        Returns a copy of hand_range without the combos that hold a card on
+        the board or in Hero's hand.
+        """
+        hero_seat = self.get_hero_seat()
+        hero_hand = hero_seat.hand if hero_seat is not None else []
+        return hand_range.without(cards=self.board + hero_hand)
+
+    def get_hero_matchup(self, villain=None) -> dict:
+        """
+        Returns Hero's spot as keyword arguments for calculate_table_equity()
+        and common.outs.multiway_outs(): hero, board and dead as card codes,
+        and villains, one entry per Villain. Everything is picklable, so the
+        question can be answered in another process.
+
+        villains is [villain] if villain is given, otherwise every Villain
+        seat's hand, or their range (see get_range_for_seat()) if they hold
+        none, or [None] (any two cards) without a Villain seat. dead is every
+        dealt card not in a Villain seat's hand used as a Villain.
+        """
+        villains = []
+        villain_codes = []
+        if villain is not None:
+            villains.append(villain)
+        else:
+            for i_seat in self.get_villain_seats():
+                if i_seat.hand:
+                    villains.append(common.cards.to_codes(i_seat.hand))
+                    villain_codes.extend(villains[-1])
+                else:
+                    villains.append(self.get_range_for_seat(hand_range=self.villain_range, seat=i_seat))
+        dead_codes = [i_code for i_code in common.cards.to_codes(self.deck.list_of_all_cards_dealt)
+                      if i_code not in villain_codes]
+        return {
+            'hero': common.cards.to_codes(self.get_heros_hand()),
+            'villains': villains or [None],
+            'board': common.cards.to_codes(self.board),
+            'dead': dead_codes,
+        }
+
+    def calculate_hero_equity(self, villain=None, use_preflop_table: bool = True,
+                              **kwargs) -> common.equity.EquityResult:
+        """
+        Returns Hero's equity on the current street against villain (see
+        get_hero_matchup() for the default) with calculate_table_equity(),
+        through the Table's equity_cache if it has one.
+
+        Args:
+            villain: Villain's hand, a collection of hands or a
+              common.ranges.Range.
+            use_preflop_table: Set to False to always simulate preflop.
+            **kwargs: Passed through to calculate_table_equity(). rng
+              defaults to the Table's.
+        """
+        kwargs.setdefault('rng', self.rng)
+        return calculate_table_equity(**self.get_hero_matchup(villain=villain), use_preflop_table=use_preflop_table,
+                                      equity_cache=self.equity_cache, **kwargs)
+
+    def calculate_hero_outs(self, villain=None) -> common.outs.OutsResult:
+        """
+        Returns Hero's outs for the next card (flop and turn only) against
+        villain (see get_hero_matchup() for the default), with
+        common.outs.multiway_outs().
+        """
+        return common.outs.multiway_outs(**self.get_hero_matchup(villain=villain))
+
+    def runouts(self, number_of_cards: int = None, isomorphic: bool = False):
+        """
+        Yields (board, weight) for every way the board can go on from here,
+        lazily (see common.runouts.runouts()): by default every flop
+        preflop, and the rest of the board up to the river from the flop on.
+        Hero's and the Villains' hands are kept apart for isomorphic=True.
+        """
+        if number_of_cards is None:
+            number_of_cards = 3 if not self.flop else None
+        hands = [i_seat.hand for i_seat in [self.get_hero_seat()] + self.get_villain_seats()
+                 if i_seat is not None and i_seat.hand]
+        known_mask = common.cards.to_mask(self.board + [i_card for i_hand in hands for i_card in i_hand])
+        dead = [i_card for i_card in self.deck.list_of_all_cards_dealt if not known_mask & i_card.mask]
+        return common.runouts.runouts(board=self.board, hands=hands, dead=dead, number_of_cards=number_of_cards,
+                                      isomorphic=isomorphic)
+
+    # Hand Values
+
+    def get_hand_value(self, seat: Seat) -> int:
+        """
+        Returns the value of seat's best hand with the board (see
+        common.evaluator), from the flop on.
+        """
+        last_card = self._river or self._turn
+        if last_card is not None:
+            return self._get_fixed_hand_state(seat=seat).value_with(last_card.code)
+        if not self._flop:
+            raise ValueError('Hand values need at least a flop on the board.')
+        state = self._get_fixed_hand_state(seat=seat)
+        for i_card in self._flop[:-1]:
+            state = state.with_card(i_card.code)
+        return state.value_with(self._flop[-1].code)
+
+    def get_hand_values_by_card(self, seat: Seat) -> dict:
+        """
+        Returns a dict of Card to seat's hand value had the turn or river
+        (whichever was dealt last) been that card instead, for the current
+        card and every card still in the deck.
+        """
+        last_card = self._river or self._turn
+        if last_card is None:
+            raise ValueError('Hand values by card need a turn or a river on the board.')
+        state = self._get_fixed_hand_state(seat=seat)
+        values = {}
+        for i_card in [last_card] + self.deck.list_of_all_cards_not_dealt:
+            values[i_card] = state.value_with(i_card.code)
+        return values
+
+    def _get_fixed_hand_state(self, seat: Seat) -> common.evaluator.HandState:
+        """
+        Returns the HandState on seat's hole cards and the board below the
+        last street (nothing below the flop), reusing the cached one while
+        those cards are unchanged.
+        """
+        if not seat.hand:
+            raise ValueError(f'Seat {seat.number} holds no cards.')
+        if self._river is not None:
+            fixed_cards = (*seat.hand, *self._flop, self._turn)
+        elif self._turn is not None:
+            fixed_cards = (*seat.hand, *self._flop)
+        else:
+            fixed_cards = tuple(seat.hand)
+        # Cards are flyweights, so comparing the tuples compares identities.
+        cached = self._hand_states.get(seat.number)
+        if cached is None or cached[0] != fixed_cards:
+            cached = (fixed_cards, common.evaluator.HandState(codes=common.cards.to_codes(fixed_cards)))
+            self._hand_states[seat.number] = cached
+        return cached[1]
+
+    # Snapshots
+
+    def snapshot(self) -> TableSnapshot:
+        """
+        Returns a TableSnapshot of the hand so far (see TableSnapshot).
+        """
+        roles = tuple(i_seat.role for i_seat in self.seats)
+        hands = tuple(tuple(i_seat.hand) for i_seat in self.seats)
+        flop = tuple(self._flop)
+        last_snapshot = self._last_snapshot
+        if last_snapshot is not None:
+            # Share the previous snapshot's tuples wherever nothing changed.
+            if roles == last_snapshot.roles:
+                roles = last_snapshot.roles
+            if hands == last_snapshot.hands:
+                hands = last_snapshot.hands
+            if flop == last_snapshot.flop:
+                flop = last_snapshot.flop
+        snapshot = TableSnapshot(roles=roles, hands=hands, flop=flop, turn=self._turn, river=self._river,
+                                 dealt_mask=self.deck.dealt_mask, state_class=type(self.state))
+        self._last_snapshot = snapshot
+        return snapshot
+
+    def restore(self, snapshot: TableSnapshot) -> None:
+        """
+        Puts the Table back to snapshot, which may have been taken from any
+        Table with the same number of seats.
+        """
+        if len(snapshot.roles) != len(self.seats):
+            raise ValueError(f'Snapshot has {len(snapshot.roles)} seats, the Table has {len(self.seats)}.')
+        for (i_seat, i_role, i_hand) in zip(self.seats, snapshot.roles, snapshot.hands):
+            i_seat.role = i_role
+            i_seat.hand = list(i_hand)
+        self._flop = list(snapshot.flop)
+        self._turn = snapshot.turn
+        self._river = snapshot.river
+        self.deck.restore(dealt_mask=snapshot.dealt_mask)
+        self.state = self.get_state(state_class=snapshot.state_class)
+        self._last_snapshot = snapshot
+        return
+
+    def undo(self) -> 'TableState':
+        """
+        Takes back the last command; returns the Table's new state.
+
+        Raises:
+            RuntimeError: There is nothing to undo.
+        """
+        if not self.history:
+            raise RuntimeError('Nothing to undo.')
+        self.restore(snapshot=self.history.pop())
+        return self.state
+
+    def branch(self, snapshot: TableSnapshot = None, rng=None) -> 'Table':
+        """
+        Returns a new Table at snapshot (by default this Table's current
+        hand) with the same seats and settings, to play a runout out without
+        touching this Table. The branch shares this Table's rng unless one
+        is given, and its equity_cache.
+        """
+        table = Table(hero_range=self.hero_range, villain_range=self.villain_range, rng=rng or self.rng,
+                      seat_names=[i_seat.name for i_seat in self.seats], number_of_villains=self.number_of_villains)
+        table.equity_cache = self.equity_cache
+        table.flop_texture = self.flop_texture
+        table.restore(snapshot=snapshot or self.snapshot())
+        return table
+
     # States
 
     @property
@@ -257,6 +732,15 @@ class Table(BaseClass):
         self._state.table = self
         return
 
+    def get_state(self, state_class: type) -> 'TableState':
+        """
+        Returns this Table's instance of state_class. States hold nothing but
+        their Table, so each Table creates one per class and reuses it.
+        """
+        if state_class not in self._states:
+            self._states[state_class] = state_class()
+        return self._states[state_class]
+
     def run(self) -> None:
         """
         This function executes the next step, depending on the Table's state.
@@ -267,13 +751,46 @@ class Table(BaseClass):
         self.state.run()
         return
 
+    def apply(self, command: str = None) -> 'TableState':
+        """
+        Programmatic, I/O-free counterpart of run().
+
+        Runs any states that need no input (i.e. Init), then executes command
+        in the resulting state and returns the Table's new state. With no
+        command, only the automatic states are run.
+
+        Raises:
+            ValueError: command is not valid in the current state.
+        """
+        while not isinstance(self.state, TableStateWithUserInput):
+            self.state.run()
+        if command is not None:
+            self.state.handle(command=command)
+        return self.state
+
+    def apply_commands(self, commands) -> 'TableState':
+        """
+        Applies a queue of commands in order; returns the final state.
+        """
+        for i_command in commands:
+            self.apply(command=i_command)
+        return self.state
+
     # Private Methods & Misc
 
-    def _populate_seats(self) -> None:
-        seat_numbers = range(1, 10)
-        seat_names = ['UTG', 'UTG+1', 'UTG+2', 'LJ', 'HJ', 'CO', 'BTN', 'SB', 'BB']
+    def _populate_seats(self, seat_names: list[str]) -> None:
+        seat_numbers = range(1, len(seat_names) + 1)
         for (i_seat_number, i_seat_name) in zip(seat_numbers, seat_names):
-            self.seats.append(Seat(number=i_seat_number, name=i_seat_name))
+            i_seat = Seat(number=i_seat_number, name=i_seat_name)
+            i_seat._on_role_change = self._update_role_index
+            self.seats.append(i_seat)
+            self._seats_by_number[i_seat_number] = i_seat
+            self._seats_by_role[None].add(seat=i_seat)
+        return
+
+    def _update_role_index(self, seat: Seat, old_role: Union[str, None]) -> None:
+        self._seats_by_role[old_role].remove(seat=seat)
+        self._seats_by_role[seat.role].add(seat=seat)
         return
 
     def __str__(self) -> str:
@@ -284,6 +801,79 @@ class Table(BaseClass):
         return s
 
 
+def calculate_table_equity(hero, villains: list, board=(), dead=(), use_preflop_table: bool = True,
+                           equity_cache=None, **kwargs) -> common.equity.EquityResult:
+    """
+    Returns Hero's equity for a spot from Table.get_hero_matchup(). Small
+    cases (e.g. the turn and river) are enumerated exactly; the rest are
+    sampled. With several Villains the equity is multi-way
+    (common.equity.multiway_equity()).
+
+    Preflop against any two cards, the precomputed table in common.preflop
+    is used instead if it has been generated: by suit symmetry its class
+    averages are exact for that question, but not against one hand (e.g.
+    AhKh vs QhJh and vs QcJc differ), which is simulated.
+
+    Args:
+        use_preflop_table: Set to False to always simulate preflop.
+        equity_cache: A common.equity_cache.EquityCache heads-up questions
+          go through, or None.
+        **kwargs: Passed through to common.equity.calculate_equity() or
+          multiway_equity() (enumeration_threshold, target_standard_error,
+          time_budget, max_trials, rng).
+    """
+    if len(villains) > 1:
+        return common.equity.multiway_equity(hero=hero, villains=villains, board=board, dead=dead, **kwargs)
+
+    villain = villains[0]
+    if use_preflop_table and villain is None and not board and common.preflop.table_exists():
+        return common.preflop.get_table().hand_equity(hero=hero, villain=None)
+    if equity_cache is not None:
+        return equity_cache.calculate_equity(hero=hero, villain=villain, board=board, dead=dead, **kwargs)
+    return common.equity.calculate_equity(hero=hero, villain=villain, board=board, dead=dead, **kwargs)
+
+
+class TablePool:
+    """
+    Reusable Tables for serving many sessions from one process.
+
+    acquire() hands out a Table from the pool (reset and configured for the
+    session) or builds one if the pool is empty; release() takes it back.
+    Tables are never shared: a Table is out of the pool until released.
+    """
+
+    def __init__(self) -> None:
+        self._free_tables = []
+        return
+
+    @property
+    def number_of_free_tables(self) -> int:
+        return len(self._free_tables)
+
+    def acquire(self, hero_range=None, villain_range=None, rng=None, number_of_villains: int = 1) -> Table:
+        """
+        Returns a Table at Init. See Table for the arguments; the rng is only
+        replaced if one is given.
+        """
+        if not self._free_tables:
+            return Table(hero_range=hero_range, villain_range=villain_range, rng=rng,
+                         number_of_villains=number_of_villains)
+        table = self._free_tables.pop()
+        table.reset()
+        table.history.clear()
+        table.hero_range = hero_range
+        table.villain_range = villain_range
+        table.number_of_villains = number_of_villains
+        if rng is not None:
+            table.rng = rng
+            table.deck.rng = rng
+        return table
+
+    def release(self, table: Table) -> None:
+        self._free_tables.append(table)
+        return
+
+
 class TableState(ABC):
 
     _table = None
@@ -304,13 +894,53 @@ class TableState(ABC):
         pass
 
 
+EQUITY_PROMPT_STANDARD_ERROR = 0.002
+EQUITY_PROMPT_TIME_BUDGET = 0.5
+
+
 class TableStateWithUserInput(TableState, ABC):
+    """
+    Base class for the states that wait for a command.
+
+    run() is the terminal front end: it renders the table, prompts until a
+    valid command is entered, handles the front-end-only commands ('Q', 'E'
+    and 'O') and passes the command to handle(). handle() does no I/O at all, so
+    code can drive a table with Table.apply() instead. Every other command
+    first records a snapshot in the Table's history, so it can be undone.
+    """
+
+    FRONT_END_COMMANDS = ['E', 'O', 'Q']
 
     def __init__(self):
         return
 
-    @abstractmethod
     def run(self) -> None:
+        user_input = self.get_user_input_and_run_common_commands()
+        self.handle(command=user_input)
+        return
+
+    def handle(self, command: str) -> None:
+        """
+        Executes a command for this state without any I/O. Front-end-only
+        commands are accepted and ignored.
+        """
+        command = command.upper()
+        if command not in self.valid_inputs:
+            raise ValueError(f"Invalid command '{command}' for state {type(self).__name__}.")
+
+        if command not in self.FRONT_END_COMMANDS:
+            self.table.history.append(self.table.snapshot())
+        if command == 'N':
+            self.table.reset()
+        elif command not in self.FRONT_END_COMMANDS:
+            self.run_command(command=command)
+        return
+
+    @abstractmethod
+    def run_command(self, command: str) -> None:
+        """
+        Executes one of this state's own commands (already validated).
+        """
         pass
 
     @property
@@ -337,8 +967,12 @@ class TableStateWithUserInput(TableState, ABC):
         if user_input == 'Q':
             quit()
 
-        if user_input == 'N':
-            self.table.__init__()
+        if user_input == 'E':
+            print(self.table.calculate_hero_equity(target_standard_error=EQUITY_PROMPT_STANDARD_ERROR,
+                                                   time_budget=EQUITY_PROMPT_TIME_BUDGET))
+
+        if user_input == 'O':
+            print(self.table.calculate_hero_outs())
 
         return user_input
 
@@ -359,10 +993,13 @@ class Init(TableState):
 
     def run(self) -> None:
         self.table.assign_hero_role_to_random_empty_seat()
-        self.table.assign_villain_role_to_random_empty_seat()
-        hero_seat = self.table.get_hero_seat()
-        self.table.deal_to_seat(number_of_cards=2, seat_number=hero_seat.number)
-        self.table.state = PreFlop()
+        for _ in range(self.table.number_of_villains):
+            self.table.assign_villain_role_to_random_empty_seat()
+        self.table.deal_hero_hand()
+        if self.table.villain_range is not None:
+            for i_seat in self.table.get_villain_seats():
+                self.table.deal_villain_hand(seat=i_seat)
+        self.table.state = self.table.get_state(state_class=PreFlop)
         return
 
 
@@ -370,7 +1007,7 @@ class PreFlop(TableStateWithUserInput):
 
     @property
     def valid_inputs(self) -> list[str]:
-        return ['H', 'S', 'V', 'F', 'N', 'Q']
+        return ['H', 'S', 'V', 'F', 'E', 'N', 'Q']
 
     @property
     def user_prompt(self) -> str:
@@ -378,6 +1015,7 @@ class PreFlop(TableStateWithUserInput):
         prompt_text += "\nS: Hero: Keep hand, change seat"
         prompt_text += "\nV: Villain: Change seat"
         prompt_text += "\nF: Deal the flop"
+        prompt_text += "\nE: Hero's equity vs Villain"
         prompt_text += "\n\nN: Start over"
         prompt_text += "\nQ: Quit"
         prompt_text += "\n\n"
@@ -385,15 +1023,12 @@ class PreFlop(TableStateWithUserInput):
 
     # State Machine Methods
 
-    def run(self) -> None:
-        user_input = self.get_user_input_and_run_common_commands()
-
-        if user_input == 'H':
+    def run_command(self, command: str) -> None:
+        if command == 'H':
             self.table.return_heros_cards_to_deck()
-            hero_seat = self.table.get_hero_seat()
-            self.table.deal_to_seat(number_of_cards=2, seat_number=hero_seat.number)
+            self.table.deal_hero_hand()
 
-        if user_input == 'S':
+        if command == 'S':
             old_hero_seat = self.table.get_hero_seat()
             new_hero_seat = self.table.get_random_empty_seat()
             heros_hand = self.table.get_heros_hand()
@@ -404,16 +1039,22 @@ class PreFlop(TableStateWithUserInput):
             self.table.unassign_hand_from_seat(seat=old_hero_seat)
             self.table.assign_hand_to_seat(hand=heros_hand, seat=new_hero_seat)
 
-        if user_input == 'V':
-            old_villain_seat = self.table.get_villain_seat()
-            new_villain_seat = self.table.get_random_empty_seat()
+        if command == 'V':
+            for i_old_villain_seat in self.table.get_villain_seats():
+                i_new_villain_seat = self.table.get_random_empty_seat()
+
+                self.table.assign_role_to_seat(seat=i_old_villain_seat, role=None)
+                self.table.assign_role_to_seat(seat=i_new_villain_seat, role='V')
 
-            self.table.assign_role_to_seat(seat=old_villain_seat, role=None)
-            self.table.assign_role_to_seat(seat=new_villain_seat, role='V')
+                # Villain's range may depend on the seat, so re-deal from it.
+                if i_old_villain_seat.hand:
+                    self.table.return_cards_to_deck(cards=i_old_villain_seat.hand)
+                    self.table.unassign_hand_from_seat(seat=i_old_villain_seat)
+                    self.table.deal_villain_hand(seat=i_new_villain_seat)
 
-        if user_input == 'F':
+        if command == 'F':
             self.table.deal_flop()
-            self.table.state = Flop()
+            self.table.state = self.table.get_state(state_class=Flop)
 
         return
 
@@ -422,27 +1063,27 @@ class Flop(TableStateWithUserInput):
 
     @property
     def valid_inputs(self) -> list[str]:
-        return ['F', 'T', 'N', 'Q']
+        return ['F', 'T', 'E', 'O', 'N', 'Q']
 
     @property
     def user_prompt(self) -> str:
         prompt_text = "F: Re-deal the flop"
         prompt_text += "\nT: Deal the turn"
+        prompt_text += "\nE: Hero's equity vs Villain"
+        prompt_text += "\nO: Hero's outs vs Villain"
         prompt_text += "\n\nN: Start Over"
         prompt_text += "\nQ: Quit"
         prompt_text += "\n\n"
         return prompt_text
 
-    def run(self) -> None:
-        user_input = self.get_user_input_and_run_common_commands()
-
-        if user_input == 'F':
+    def run_command(self, command: str) -> None:
+        if command == 'F':
             self.table.return_flop_to_deck()
             self.table.deal_flop()
 
-        if user_input == 'T':
+        if command == 'T':
             self.table.deal_turn()
-            self.table.state = Turn()
+            self.table.state = self.table.get_state(state_class=Turn)
 
         return
 
@@ -451,27 +1092,27 @@ class Turn(TableStateWithUserInput):
 
     @property
     def valid_inputs(self) -> list[str]:
-        return ['T', 'R', 'N', 'Q']
+        return ['T', 'R', 'E', 'O', 'N', 'Q']
 
     @property
     def user_prompt(self) -> str:
         prompt_text = "T: Re-deal the turn"
         prompt_text += "\nR: Deal the river"
+        prompt_text += "\nE: Hero's equity vs Villain"
+        prompt_text += "\nO: Hero's outs vs Villain"
         prompt_text += "\n\nN: Start Over"
         prompt_text += "\nQ: Quit"
         prompt_text += "\n\n"
         return prompt_text
 
-    def run(self) -> None:
-        user_input = self.get_user_input_and_run_common_commands()
-
-        if user_input == 'T':
+    def run_command(self, command: str) -> None:
+        if command == 'T':
             self.table.return_turn_to_deck()
             self.table.deal_turn()
 
-        if user_input == 'R':
+        if command == 'R':
             self.table.deal_river()
-            self.table.state = River()
+            self.table.state = self.table.get_state(state_class=River)
 
         return
 
@@ -480,20 +1121,19 @@ class River(TableStateWithUserInput):
 
     @property
     def valid_inputs(self) -> list[str]:
-        return ['R', 'N', 'Q']
+        return ['R', 'E', 'N', 'Q']
 
     @property
     def user_prompt(self) -> str:
         prompt_text = "R: Re-deal the river"
+        prompt_text += "\nE: Hero's equity vs Villain"
         prompt_text += "\n\nN: Start Over"
         prompt_text += "\nQ: Quit"
         prompt_text += "\n\n"
         return prompt_text
 
-    def run(self) -> None:
-        user_input = self.get_user_input_and_run_common_commands()
-
-        if user_input == 'R':
+    def run_command(self, command: str) -> None:
+        if command == 'R':
             self.table.return_river_to_deck()
             self.table.deal_river()
 
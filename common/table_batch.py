@@ -0,0 +1,216 @@
+"""
+This module simulates many tables at once as NumPy arrays.
+
+A Table is a graph of Seat, Card, Deck and TableState objects, which is what
+the interactive drills need but costs several allocations per hand. A
+TableBatch stores N tables as a handful of arrays instead (struct of arrays):
+
+    roles: (N, 9) int8 role codes per seat (see ROLES).
+    hands: (N, 9, 2) int8 hole card codes per seat, -1 where not dealt.
+    board: (N, 5) int8 board card codes, -1 where not dealt.
+    decks: (N, 52) int8 shuffled card codes, one permutation per table.
+
+Every table deals from the front of its own permutation and all tables deal in
+lockstep, so a single counter tracks how many cards each table has dealt and
+every dealing method is a slice of the decks array. Any row can be turned
+back into a regular Table with to_table() for display or further play.
+
+NumPy is an optional dependency; it is only needed by this module.
+"""
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError('common.table_batch requires NumPy (pip install numpy).') from error
+
+import common.cards
+import common.table
+
+
+ROLES = (None, 'H', 'V')
+NUMBER_OF_SEATS = len(common.table.SEAT_NAMES)
+NO_CARD = -1
+
+_STATES_BY_BOARD_SIZE = {0: common.table.PreFlop, 3: common.table.Flop, 4: common.table.Turn, 5: common.table.River}
+
+
+class TableBatch:
+    """
+    N tables stored as arrays (see module docstring).
+
+    Attributes:
+        number_of_tables: N, the number of rows in every array.
+        roles: (N, 9) role codes, an index into ROLES.
+        hands: (N, 9, 2) hole card codes.
+        board: (N, 5) board card codes.
+        decks: (N, 52) deck permutations.
+        number_of_cards_dealt: Cards dealt so far from each table's deck.
+    """
+
+    def __init__(self, number_of_tables: int, rng=None) -> None:
+        self._rng = rng or np.random.default_rng()
+        self._number_of_tables = number_of_tables
+        self._roles = np.zeros((number_of_tables, NUMBER_OF_SEATS), dtype=np.int8)
+        self._hands = np.full((number_of_tables, NUMBER_OF_SEATS, 2), NO_CARD, dtype=np.int8)
+        self._board = np.full((number_of_tables, 5), NO_CARD, dtype=np.int8)
+        self._board_size = 0
+        self._decks = np.empty((number_of_tables, 52), dtype=np.int8)
+        self._number_dealt = 0
+        self.shuffle()
+        return
+
+    # Properties
+
+    @property
+    def number_of_tables(self) -> int:
+        return self._number_of_tables
+
+    @property
+    def roles(self) -> 'np.ndarray':
+        return self._roles
+
+    @property
+    def hands(self) -> 'np.ndarray':
+        return self._hands
+
+    @property
+    def board(self) -> 'np.ndarray':
+        return self._board[:, :self._board_size]
+
+    @property
+    def decks(self) -> 'np.ndarray':
+        return self._decks
+
+    @property
+    def number_of_cards_dealt(self) -> int:
+        return self._number_dealt
+
+    def __len__(self) -> int:
+        return self._number_of_tables
+
+    # Deck
+
+    def shuffle(self) -> None:
+        """
+        Starts every table over: new deck permutations, no roles, no cards.
+        """
+        keys = self._rng.random((self._number_of_tables, 52))
+        self._decks[:] = np.argsort(keys, axis=1)
+        self._roles.fill(0)
+        self._hands.fill(NO_CARD)
+        self._board.fill(NO_CARD)
+        self._board_size = 0
+        self._number_dealt = 0
+        return
+
+    def deal_cards(self, number_of_cards: int) -> 'np.ndarray':
+        """
+        Deals number_of_cards from every table's deck; returns an
+        (N, number_of_cards) view of the dealt codes.
+        """
+        if self._number_dealt + number_of_cards > 52:
+            raise RuntimeError("No cards left in the deck.")
+        cards = self._decks[:, self._number_dealt:self._number_dealt + number_of_cards]
+        self._number_dealt += number_of_cards
+        return cards
+
+    # Roles
+
+    def assign_role_to_seats(self, role: str, seat_numbers) -> None:
+        """
+        Assigns role to seat_numbers[i] (1-9) at table i.
+        """
+        role_code = _role_code(role=role)
+        seat_indexes = np.asarray(seat_numbers) - 1
+        if np.any((seat_indexes < 0) | (seat_indexes >= NUMBER_OF_SEATS)):
+            raise IndexError('Seat number out of range.')
+        self._roles[np.arange(self._number_of_tables), seat_indexes] = role_code
+        return
+
+    def assign_role_to_random_empty_seats(self, role: str) -> None:
+        """
+        Assigns role to one empty seat per table, chosen uniformly.
+        """
+        empty = self._roles == 0
+        if not empty.any(axis=1).all():
+            raise RuntimeError('A table has no empty seat.')
+        keys = np.where(empty, self._rng.random(empty.shape), np.inf)
+        self.assign_role_to_seats(role=role, seat_numbers=np.argmin(keys, axis=1) + 1)
+        return
+
+    def get_seat_numbers_by_role(self, role: str) -> 'np.ndarray':
+        """
+        Returns the seat number (1-9) holding role at each table, or 0 where
+        no seat has it. With several such seats, the lowest is returned.
+        """
+        has_role = self._roles == _role_code(role=role)
+        return np.where(has_role.any(axis=1), np.argmax(has_role, axis=1) + 1, 0)
+
+    # Dealing
+
+    def deal_to_role(self, role: str) -> None:
+        """
+        Deals two cards to the seat holding role at every table.
+        """
+        seat_numbers = self.get_seat_numbers_by_role(role=role)
+        if np.any(seat_numbers == 0):
+            raise RuntimeError(f"A table has no seat with role '{role}'.")
+        self._hands[np.arange(self._number_of_tables), seat_numbers - 1] = self.deal_cards(number_of_cards=2)
+        return
+
+    def deal_flop(self) -> None:
+        self._deal_board(start=0, number_of_cards=3)
+        return
+
+    def deal_turn(self) -> None:
+        self._deal_board(start=3, number_of_cards=1)
+        return
+
+    def deal_river(self) -> None:
+        self._deal_board(start=4, number_of_cards=1)
+        return
+
+    def _deal_board(self, start: int, number_of_cards: int) -> None:
+        """
+        Deals a street. Dealing a street again replaces it with fresh cards,
+        like re-dealing at a Table; the old cards are not reused.
+        """
+        if self._board_size < start:
+            raise RuntimeError('The previous street has not been dealt.')
+        self._board[:, start:start + number_of_cards] = self.deal_cards(number_of_cards=number_of_cards)
+        self._board[:, start + number_of_cards:] = NO_CARD
+        self._board_size = start + number_of_cards
+        return
+
+    # Tables
+
+    def to_table(self, index: int) -> common.table.Table:
+        """
+        Returns row index as a regular Table, in the state matching its board
+        (PreFlop, Flop, Turn or River), with the same cards dealt from its
+        deck.
+        """
+        table = common.table.Table()
+        for i_seat in table.seats:
+            i_seat_index = i_seat.number - 1
+            table.assign_role_to_seat(seat=i_seat, role=ROLES[self._roles[index, i_seat_index]])
+            i_codes = self._hands[index, i_seat_index]
+            if i_codes[0] != NO_CARD:
+                i_seat.hand = _deal_specific_codes(deck=table.deck, codes=i_codes)
+
+        board = _deal_specific_codes(deck=table.deck, codes=self._board[index, :self._board_size])
+        table.flop = board[:3]
+        if self._board_size >= 4:
+            table.turn = board[3]
+        if self._board_size == 5:
+            table.river = board[4]
+        table.state = table.get_state(state_class=_STATES_BY_BOARD_SIZE[self._board_size])
+        return table
+
+
+def _role_code(role: str) -> int:
+    common.table.BaseClass._verify_role(value=role)
+    return ROLES.index(role)
+
+
+def _deal_specific_codes(deck: common.cards.Deck, codes) -> list[common.cards.Card]:
+    return [deck.deal_specific_card(card=common.cards.CARDS[i_code]) for i_code in codes.tolist()]
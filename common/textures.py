@@ -0,0 +1,149 @@
+"""
+This module classifies flop textures and deals flops of a given texture.
+
+Every flop gets a set of texture flags:
+    Suits: 'monotone' (one suit), 'two-tone' (two suits) or 'rainbow'.
+    Pairing: 'unpaired', 'paired' or 'trips'.
+    Connectedness: 'connected' (three distinct ranks within a five-rank
+      window, so a straight is possible with two hole cards; the ace also
+      plays low) or 'disconnected'.
+    Height: 'ace-high', 'high' (two or more cards ten or above) and 'low'
+      (no card above nine). A flop can be none of these (e.g. K72).
+
+All 22,100 flops are classified into buckets, one per flag, the first time
+one is needed (about 0.1 s). A texture query is one flag or a collection of
+flags that must all hold (e.g. ('connected', 'low')); the bucket for a
+combination is built from the single-flag buckets the first time it is used.
+deal_flop() then draws uniformly from the bucket and redraws flops that hit a
+dead card, which takes O(1) expected draws unless most of the bucket is dead.
+"""
+import itertools
+import random
+
+import common.cards
+
+
+TEXTURES = ('monotone', 'two-tone', 'rainbow', 'unpaired', 'paired', 'trips', 'connected', 'disconnected',
+            'ace-high', 'high', 'low')
+_TEXTURE_BITS = {i_name: 1 << i_bit for (i_bit, i_name) in enumerate(TEXTURES)}
+
+# Rank indexes (deuce is 0).
+_TEN = 8
+_NINE = 7
+_ACE = 12
+
+# Random draws from a bucket before falling back to filtering it.
+MAX_REJECTIONS = 64
+
+_FLOP_FLAGS = {}
+_BUCKETS = {}
+
+
+def classify(flop) -> int:
+    """
+    Returns the flop's texture flags as a bit mask (see texture_names()).
+    """
+    codes = common.cards.to_codes(flop)
+    if len(codes) != 3 or len(set(codes)) != 3:
+        raise ValueError(f'A flop must be 3 distinct cards, not {flop}.')
+    ranks = sorted(i_code >> 2 for i_code in codes)
+    number_of_suits = len({i_code & 3 for i_code in codes})
+    number_of_ranks = len(set(ranks))
+
+    flags = _TEXTURE_BITS[('monotone', 'two-tone', 'rainbow')[number_of_suits - 1]]
+    flags |= _TEXTURE_BITS[('trips', 'paired', 'unpaired')[number_of_ranks - 1]]
+    flags |= _TEXTURE_BITS['connected' if _is_connected(ranks=ranks) else 'disconnected']
+    if ranks[-1] == _ACE:
+        flags |= _TEXTURE_BITS['ace-high']
+    if ranks[1] >= _TEN:
+        flags |= _TEXTURE_BITS['high']
+    if ranks[-1] <= _NINE:
+        flags |= _TEXTURE_BITS['low']
+    return flags
+
+
+def texture_names(flags: int) -> list[str]:
+    return [i_name for i_name in TEXTURES if flags & _TEXTURE_BITS[i_name]]
+
+
+def texture_mask(texture) -> int:
+    """
+    Returns the flag mask for a texture name or a collection of names.
+    """
+    names = [texture] if isinstance(texture, str) else list(texture)
+    mask = 0
+    for i_name in names:
+        if i_name not in _TEXTURE_BITS:
+            raise ValueError(f"Invalid texture '{i_name}' given.")
+        mask |= _TEXTURE_BITS[i_name]
+    return mask
+
+
+def flop_flags(flop) -> int:
+    """
+    Returns the texture flags of a flop from the precomputed table.
+    """
+    build_buckets()
+    return _FLOP_FLAGS[common.cards.to_mask(flop)]
+
+
+def bucket(texture) -> list[int]:
+    """
+    Returns the 52-bit card masks of every flop with the texture.
+    """
+    mask = texture_mask(texture=texture)
+    build_buckets()
+    if mask not in _BUCKETS:
+        _BUCKETS[mask] = [i_flop for (i_flop, i_flags) in _FLOP_FLAGS.items() if i_flags & mask == mask]
+    return _BUCKETS[mask]
+
+
+def deal_flop(texture, dead_mask: int = 0, rng=None) -> list[common.cards.Card]:
+    """
+    Returns a random flop with the texture and no card in dead_mask.
+
+    Raises:
+        ValueError: Every flop with the texture holds a dead card.
+    """
+    flops = bucket(texture=texture)
+    rng = rng or random
+    for _ in range(MAX_REJECTIONS):
+        if not flops:
+            break
+        flop = flops[int(rng.random() * len(flops))]
+        if not flop & dead_mask:
+            return _cards(mask=flop)
+    live_flops = [i_flop for i_flop in flops if not i_flop & dead_mask]
+    if not live_flops:
+        raise ValueError(f'No {texture} flop can be dealt.')
+    return _cards(mask=live_flops[int(rng.random() * len(live_flops))])
+
+
+def build_buckets() -> None:
+    """
+    Classifies all 22,100 flops and builds the single-flag buckets. Does
+    nothing if they already exist.
+    """
+    if _FLOP_FLAGS:
+        return
+    for i_flop in itertools.combinations(range(52), 3):
+        _FLOP_FLAGS[common.cards.to_mask(i_flop)] = classify(flop=i_flop)
+    for i_bit in _TEXTURE_BITS.values():
+        _BUCKETS[i_bit] = [i_flop for (i_flop, i_flags) in _FLOP_FLAGS.items() if i_flags & i_bit]
+    return
+
+
+def _is_connected(ranks: list[int]) -> bool:
+    distinct_ranks = set(ranks)
+    if len(distinct_ranks) != 3:
+        return False
+    if max(distinct_ranks) - min(distinct_ranks) <= 4:
+        return True
+    if _ACE in distinct_ranks:
+        low_ranks = {-1 if i_rank == _ACE else i_rank for i_rank in distinct_ranks}
+        return max(low_ranks) - min(low_ranks) <= 4
+    return False
+
+
+def _cards(mask: int) -> list[common.cards.Card]:
+    return [common.cards.CARDS[i_code] for i_code in range(52) if mask >> i_code & 1]
@@ -3,14 +3,69 @@
 # Press Shift+F10 to execute it or replace it with your code.
 # Press Double Shift to search everywhere for classes, files, tool windows, actions, and settings.
 
-from common import cards, table
+import argparse
+import asyncio
+import sys
+
+from common import cards, rng, scenarios, server, table
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Hold 'Em scenario drills.")
+    subparsers = parser.add_subparsers(dest='mode')
+
+    generate = subparsers.add_parser('generate', help='Write scenarios headlessly instead of playing.')
+    generate.add_argument('--count', type=int, default=1000, help='Number of scenarios.')
+    generate.add_argument('--street', choices=list(scenarios.STREET_COMMANDS), default='river',
+                          help='Deal each scenario up to this street.')
+    generate.add_argument('--format', choices=['jsonl', 'binary'], default='jsonl')
+    generate.add_argument('--output', help='Output file (default: standard output).')
+    generate.add_argument('--seed', type=int, help='Seed for reproducible output.')
+
+    serve = subparsers.add_parser('serve', help='Serve drill sessions over a line protocol.')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--unix-socket', help='Listen on this Unix socket instead of TCP.')
+    serve.add_argument('--idle-timeout', type=float, default=server.DEFAULT_IDLE_TIMEOUT,
+                       help='Close sessions idle for this many seconds.')
+    return parser.parse_args()
+
+
+def generate(arguments: argparse.Namespace) -> None:
+    t = table.Table(rng=rng.make_rng(seed=arguments.seed))
+    scenario_stream = scenarios.generate_scenarios(count=arguments.count, street=arguments.street, table=t)
+    if arguments.format == 'jsonl':
+        if arguments.output:
+            with open(arguments.output, 'w') as file:
+                scenarios.write_jsonl(scenarios=scenario_stream, file=file)
+        else:
+            scenarios.write_jsonl(scenarios=scenario_stream, file=sys.stdout)
+    else:
+        if arguments.output:
+            with open(arguments.output, 'wb') as file:
+                scenarios.write_binary(scenarios=scenario_stream, file=file)
+        else:
+            scenarios.write_binary(scenarios=scenario_stream, file=sys.stdout.buffer)
+    return
+
+
+def serve(arguments: argparse.Namespace) -> None:
+    drill_server = server.DrillServer(idle_timeout=arguments.idle_timeout)
+    asyncio.run(drill_server.serve_forever(host=arguments.host, port=arguments.port, path=arguments.unix_socket))
+    return
 
 
 # Press the green button in the gutter to run the script.
 if __name__ == '__main__':
-    t = table.Table()
-    while True:
-        t.run()
+    arguments = parse_arguments()
+    if arguments.mode == 'generate':
+        generate(arguments=arguments)
+    elif arguments.mode == 'serve':
+        serve(arguments=arguments)
+    else:
+        t = table.Table()
+        while True:
+            t.run()
 
 
 # See PyCharm help at https://www.jetbrains.com/help/pycharm/
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from common import batch_equity, cards, equity, evaluator, hands
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+@pytest.fixture(scope='module')
+def turn_matrix():
+    return batch_equity.equity_matrix(board=hand('2c 7d 9h Js'))
+
+
+class TestEvaluateCombos:
+
+    def test_matches_scalar_evaluator(self) -> None:
+        rng = random.Random(3)
+        boards = np.array([rng.sample(range(52), 5) for _ in range(20)])
+        values = batch_equity.evaluate_combos(boards=boards)
+        for (i_board, i_values) in zip(boards.tolist(), values):
+            for i_index in rng.sample(range(hands.NUMBER_OF_COMBOS), 50):
+                i_combo = list(hands.COMBOS[i_index])
+                if set(i_combo) & set(i_board):
+                    assert i_values[i_index] == -1
+                else:
+                    assert i_values[i_index] == evaluator.evaluate_codes(i_board + i_combo)
+        return
+
+
+class TestEquityMatrix:
+
+    def test_matches_exact_enumeration(self, turn_matrix) -> None:
+        for (i_hero, i_villain) in [('As Ah', 'Kd Kc'), ('Ts 8s', 'Jd Jc'), ('Qh Th', '8c 8d')]:
+            exact = equity.enumerate_equity(hero=hand(i_hero), villain=hand(i_villain), board=hand('2c 7d 9h Js'))
+            row = hands.combo_index(*hand(i_hero))
+            column = hands.combo_index(*hand(i_villain))
+            assert turn_matrix[row, column] == pytest.approx(exact.equity)
+        return
+
+    def test_is_antisymmetric(self, turn_matrix) -> None:
+        valid = ~np.isnan(turn_matrix)
+        assert np.allclose((turn_matrix + turn_matrix.T)[valid], 1.0)
+        return
+
+    def test_conflicting_hands_are_nan(self, turn_matrix) -> None:
+        assert np.isnan(turn_matrix[hands.combo_index(*hand('As Ah')), hands.combo_index(*hand('As Kd'))])
+        assert np.isnan(turn_matrix[hands.combo_index(*hand('2c Ah')), hands.combo_index(*hand('Qs Kd'))])
+        return
+
+    def test_preflop_hand_class_matrix(self) -> None:
+        matrix = batch_equity.equity_matrix(number_of_boards=300, rng=np.random.default_rng(1), by_hand_class=True)
+        assert matrix.shape == (hands.NUMBER_OF_HAND_CLASSES, hands.NUMBER_OF_HAND_CLASSES)
+        aces_vs_kings = matrix[hands.hand_class_index('AA'), hands.hand_class_index('KK')]
+        assert 0.75 < aces_vs_kings < 0.89
+        return
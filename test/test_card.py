@@ -39,8 +39,30 @@ class TestCard:
             assert card.suit == i_suit.lower()
         return
 
-    # Dealt Status
-    def test_default_not_dealt(self) -> None:
-        card = cards.Card(rank='A', suit='s')
-        assert not card.dealt
+    # Encoding
+
+    def test_cards_are_interned(self) -> None:
+        assert cards.Card(rank='A', suit='s') is cards.Card(rank='a', suit='S')
+        return
+
+    def test_code_round_trip(self) -> None:
+        for i_code in range(52):
+            card = cards.Card.from_code(i_code)
+            assert card.code == i_code
+            assert cards.Card(rank=card.rank, suit=card.suit) is card
         return
+
+    def test_from_string(self) -> None:
+        card = cards.Card.from_string('Td')
+        assert card.rank == 'T'
+        assert card.suit == 'd'
+        assert repr(card) == 'Td'
+        return
+
+    def test_invalid_suit_raises_value_error(self) -> None:
+        try:
+            cards.Card(rank='A', suit='x')
+        except ValueError:
+            return
+        else:
+            assert False, 'No exception was raised.'
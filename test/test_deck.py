@@ -76,7 +76,7 @@ class TestReturnCardToDeck:
     def test_card_not_dealt_after_returned(self, deck) -> None:
         card = deck.deal_card()
         deck.return_card_to_deck(card=card)
-        assert not card.dealt
+        assert card in deck.list_of_all_cards_not_dealt
         return
 
     def test_number_of_cards_dealt_after_card_returned(self, deck) -> None:
@@ -90,3 +90,77 @@ class TestReturnCardToDeck:
         deck.return_card_to_deck(card=card)
         assert deck.number_of_cards_not_dealt == 52
         return
+
+
+class TestDealingEngine:
+
+    def test_dealt_cards_are_unique(self, deck) -> None:
+        cards_dealt = deck.deal_cards(number_of_cards=52)
+        assert len(set(cards_dealt)) == 52
+        assert deck.number_of_cards_not_dealt == 0
+        return
+
+    def test_deal_from_empty_deck_raises_runtime_error(self, deck) -> None:
+        deck.deal_cards(number_of_cards=52)
+        try:
+            deck.deal_card()
+        except RuntimeError:
+            return
+        else:
+            assert False, 'No exception was raised.'
+
+    def test_dealt_and_not_dealt_lists_partition_deck(self, deck) -> None:
+        deck.deal_cards(number_of_cards=7)
+        returned = deck.list_of_all_cards_dealt[3]
+        deck.return_card_to_deck(card=returned)
+        dealt = deck.list_of_all_cards_dealt
+        not_dealt = deck.list_of_all_cards_not_dealt
+        assert len(dealt) == 6
+        assert returned in not_dealt
+        assert set(dealt).isdisjoint(not_dealt)
+        assert len(set(dealt) | set(not_dealt)) == 52
+        for i_card in dealt:
+            assert deck.is_dealt(card=i_card)
+        return
+
+    def test_returning_card_twice_raises_value_error(self, deck) -> None:
+        card = deck.deal_card()
+        deck.return_card_to_deck(card=card)
+        try:
+            deck.return_card_to_deck(card=card)
+        except ValueError:
+            return
+        else:
+            assert False, 'No exception was raised.'
+
+
+class TestDealSpecificCard:
+
+    def test_deal_specific_card(self, deck) -> None:
+        card = cards.Card(rank='Q', suit='h')
+        deck.deal_specific_card(card=card)
+        assert deck.is_dealt(card=card)
+        assert deck.number_of_cards_not_dealt == 51
+        return
+
+    def test_dealing_a_dealt_card_raises_value_error(self, deck) -> None:
+        card = deck.deal_card()
+        try:
+            deck.deal_specific_card(card=card)
+        except ValueError:
+            return
+        else:
+            assert False, 'No exception was raised.'
+
+
+class TestRestore:
+
+    def test_restore_deals_exactly_the_mask(self, deck) -> None:
+        deck.deal_cards(number_of_cards=10)
+        dealt_mask = deck.dealt_mask
+        deck.deal_cards(number_of_cards=5)
+        deck.restore(dealt_mask=dealt_mask)
+        assert deck.dealt_mask == dealt_mask
+        assert deck.number_of_cards_dealt == 10
+        assert cards.to_mask(deck.list_of_all_cards_dealt) == dealt_mask
+        return
@@ -0,0 +1,187 @@
+import random
+
+import pytest
+
+from common import cards, equity, ranges, table
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestMonteCarloEquity:
+
+    def test_aces_vs_kings_preflop(self) -> None:
+        result = equity.monte_carlo_equity(hero=hand('As Ah'), villain=hand('Kd Kc'),
+                                           target_standard_error=0.005, rng=random.Random(1))
+        assert abs(result.equity - 0.82) < 0.03
+        assert result.standard_error <= 0.005
+        return
+
+    def test_river_result_is_deterministic(self) -> None:
+        result = equity.monte_carlo_equity(hero=hand('As Ah'), villain=hand('Kd Kc'),
+                                           board=hand('2c 7d 9h Js Kh'), max_trials=1000,
+                                           rng=random.Random(1))
+        assert result.losses == result.trials == 1000
+        return
+
+    def test_split_pot_counts_as_half(self) -> None:
+        result = equity.monte_carlo_equity(hero=hand('2c 3c'), villain=hand('2d 3d'),
+                                           board=hand('Ts Js Qh Kh As'), max_trials=500,
+                                           rng=random.Random(1))
+        assert result.ties == 500
+        assert result.equity == 0.5
+        return
+
+    def test_range_skips_blocked_hands(self) -> None:
+        villain_range = [hand('As Ks'), hand('Qd Qc')]
+        result = equity.monte_carlo_equity(hero=hand('Ah Ad'), villain=villain_range,
+                                           board=hand('As 2c 7d Qh 3s'), max_trials=500,
+                                           rng=random.Random(1))
+        # As is on the board, so Villain can only hold QdQc: set of queens vs set of aces.
+        assert result.wins == 500
+        return
+
+    def test_time_budget_stops_early(self) -> None:
+        result = equity.monte_carlo_equity(hero=hand('As Ah'), time_budget=0.0,
+                                           max_trials=10 ** 9, rng=random.Random(1))
+        assert result.trials == equity.BATCH_SIZE
+        return
+
+    def test_overlapping_cards_raise_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            equity.monte_carlo_equity(hero=hand('As Ah'), board=hand('As 2c 3d'))
+        return
+
+    def test_fully_blocked_villain_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            equity.monte_carlo_equity(hero=hand('As Ah'), villain=hand('As Kd'))
+        return
+
+
+class TestEnumerateEquity:
+
+    def test_flop_against_single_hand(self) -> None:
+        result = equity.enumerate_equity(hero=hand('As Ah'), villain=hand('Kd Kc'), board=hand('2c 7d 9h'))
+        assert result.exact
+        assert result.trials == 990
+        assert result.standard_error == 0.0
+        # Villain needs one of the two remaining kings (or runner-runner) to win.
+        assert 0.90 < result.equity < 0.93
+        return
+
+    def test_matches_monte_carlo(self) -> None:
+        board = hand('2c 7d 9h Js')
+        exact = equity.enumerate_equity(hero=hand('Ts 8s'), villain=[hand('Jd Jc'), hand('Ah Kh')], board=board)
+        sampled = equity.monte_carlo_equity(hero=hand('Ts 8s'), villain=[hand('Jd Jc'), hand('Ah Kh')],
+                                            board=board, max_trials=20000, rng=random.Random(1))
+        assert abs(exact.equity - sampled.equity) < 4 * sampled.standard_error + 0.005
+        return
+
+    def test_skips_dead_cards(self) -> None:
+        result = equity.enumerate_equity(hero=hand('As Ah'), villain=hand('Kd Kc'),
+                                         board=hand('2c 7d 9h Js'), dead=hand('Ks Kh'))
+        assert result.trials == 44 - 2
+        assert result.losses == 0
+        return
+
+    def test_count_runouts(self) -> None:
+        count = equity.count_runouts(hero=hand('As Ah'), board=hand('2c 7d 9h Js'))
+        assert count == 1035 * 44
+        return
+
+    def test_calculate_equity_chooses_enumeration_when_small(self) -> None:
+        small = equity.calculate_equity(hero=hand('As Ah'), villain=hand('Kd Kc'), board=hand('2c 7d 9h'))
+        large = equity.calculate_equity(hero=hand('As Ah'), villain=hand('Kd Kc'), max_trials=1000)
+        assert small.exact
+        assert not large.exact
+        return
+
+
+class TestMultiwayEquity:
+
+    def test_one_villain_matches_heads_up(self) -> None:
+        board = hand('2c 7d 9h')
+        heads_up = equity.enumerate_equity(hero=hand('As Ah'), villain=hand('Kd Kc'), board=board)
+        multiway = equity.multiway_equity(hero=hand('As Ah'), villains=[hand('Kd Kc')], board=board)
+        assert multiway.exact
+        assert multiway.trials == heads_up.trials
+        assert multiway.equity == pytest.approx(heads_up.equity)
+        return
+
+    def test_three_way_split_counts_as_third(self) -> None:
+        result = equity.multiway_equity(hero=hand('2c 3c'), villains=[hand('2d 3d'), hand('2h 3h')],
+                                        board=hand('As Ks Qs Js Ts'))
+        assert result.ties == result.trials == 1
+        assert result.equity == pytest.approx(1 / 3)
+        return
+
+    def test_split_with_one_of_two_villains(self) -> None:
+        result = equity.multiway_equity(hero=hand('Ac 3c'), villains=[hand('Ad 4d'), hand('2h 3h')],
+                                        board=hand('As Ks Qs Jd 8h'))
+        assert result.equity == pytest.approx(0.5)
+        return
+
+    def test_aces_against_random_hands(self) -> None:
+        result = equity.multiway_equity(hero=hand('As Ah'), villains=[None, None, None],
+                                        target_standard_error=0.005, rng=random.Random(1))
+        assert abs(result.equity - 0.64) < 0.03
+        return
+
+    def test_villains_sharing_a_card_raise_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            equity.multiway_equity(hero=hand('As Ah'), villains=[hand('Kd Kc'), hand('Kd Qc')])
+        return
+
+
+class TestTableEquity:
+
+    def test_equity_on_the_flop(self) -> None:
+        t = table.Table()
+        t.run()
+        t.deal_flop()
+        result = t.calculate_hero_equity(max_trials=1000, rng=random.Random(1))
+        assert result.trials == 1000
+        assert 0.0 <= result.equity <= 1.0
+        return
+
+    def test_equity_on_the_river_is_exact(self) -> None:
+        t = table.Table()
+        t.run()
+        t.deal_flop()
+        t.deal_turn()
+        t.deal_river()
+        result = t.calculate_hero_equity()
+        assert result.exact
+        assert result.trials == 990
+        return
+
+    def test_equity_against_dealt_villain_hand(self) -> None:
+        t = table.Table()
+        t.run()
+        villain_seat = t.get_villain_seat()
+        t.deal_to_seat(number_of_cards=2, seat_number=villain_seat.number)
+        result = t.calculate_hero_equity(use_preflop_table=False, max_trials=1000, rng=random.Random(1))
+        assert result.trials == 1000
+        return
+
+    def test_multiway_table(self) -> None:
+        t = table.Table(number_of_villains=3)
+        t.apply()
+        villain_seats = t.get_villain_seats()
+        assert len(villain_seats) == 3
+        with pytest.raises(RuntimeError):
+            t.get_villain_seat()
+        t.apply(command='F')
+        result = t.calculate_hero_equity(max_trials=1000, rng=random.Random(1))
+        assert result.trials == 1000
+        return
+
+    def test_multiway_table_deals_villain_ranges(self) -> None:
+        t = table.Table(villain_range=ranges.Range('22+'), number_of_villains=2)
+        t.apply_commands(commands=['V', 'F', 'T', 'R'])
+        villain_seats = t.get_villain_seats()
+        assert all(i_seat.hand[0].rank == i_seat.hand[1].rank for i_seat in villain_seats)
+        assert t.deck.number_of_cards_not_dealt == 52 - 6 - 5
+        assert t.calculate_hero_equity().exact
+        return
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from common import cards, equity, equity_cache, ranges, table
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestCacheKey:
+
+    def test_isomorphic_questions_share_a_key(self):
+        first = equity_cache.cache_key(hero=hand('Ah Kh'), villain=ranges.Range('QQ+, AQs'), board=hand('Qh 7h 2c'))
+        second = equity_cache.cache_key(hero=hand('As Ks'), villain=ranges.Range('QQ+, AQs'), board=hand('Qs 7s 2d'))
+        assert first == second
+
+    def test_different_questions_have_different_keys(self):
+        board = hand('Qh 7h 2c')
+        keys = {
+            equity_cache.cache_key(hero=hand('Ah Kh'), board=board),
+            equity_cache.cache_key(hero=hand('Ah Kd'), board=board),
+            equity_cache.cache_key(hero=hand('Ah Kh'), villain=ranges.Range('QQ+'), board=board),
+            equity_cache.cache_key(hero=hand('Ah Kh'), board=board, dead=hand('3s')),
+        }
+        assert len(keys) == 4
+
+
+class TestLRUCache:
+
+    def test_evicts_least_recently_used(self):
+        cache = equity_cache.LRUCache(max_entries=2)
+        cache.put(key=b'a', value=b'1')
+        cache.put(key=b'b', value=b'2')
+        assert cache.get(key=b'a') == b'1'
+        cache.put(key=b'c', value=b'3')
+        assert b'b' not in cache
+        assert b'a' in cache
+        assert cache.evictions == 1
+
+    def test_bounded_by_bytes(self):
+        cache = equity_cache.LRUCache(max_entries=None, max_bytes=10)
+        for i_key in [b'aa', b'bb', b'cc', b'dd']:
+            cache.put(key=i_key, value=b'123')
+        assert len(cache) == 2
+        assert cache.number_of_bytes == 10
+
+    def test_counters(self):
+        cache = equity_cache.LRUCache()
+        cache.get(key=b'a')
+        cache.put(key=b'a', value=b'1')
+        cache.get(key=b'a')
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestEquityCache:
+
+    def test_isomorphic_question_is_a_hit(self):
+        cache = equity_cache.EquityCache()
+        first = cache.calculate_equity(hero=hand('Ah Kh'), villain=hand('Qd Qc'), board=hand('Qh 7h 2c'))
+        second = cache.calculate_equity(hero=hand('As Ks'), villain=hand('Qd Qc'), board=hand('Qs 7s 2c'))
+        assert second.equity == first.equity
+        assert second.exact
+        assert cache.statistics['hits'] == 1
+        assert cache.statistics['misses'] == 1
+
+    def test_result_matches_uncached(self):
+        cache = equity_cache.EquityCache()
+        args = dict(hero=hand('Ah Kh'), villain=ranges.Range('TT+'), board=hand('Qh 7h 2c 3d'))
+        cache.calculate_equity(**args)
+        cached = cache.calculate_equity(**args)
+        uncached = equity.calculate_equity(**args)
+        assert cached.equity == pytest.approx(uncached.equity)
+        assert cached.trials == pytest.approx(uncached.trials)
+
+    def test_stricter_target_recomputes(self):
+        cache = equity_cache.EquityCache()
+        args = dict(hero=hand('Ah Kh'), villain=hand('Qd Qc'), rng=random.Random(1), enumeration_threshold=0)
+        cache.calculate_equity(max_trials=500, **args)
+        result = cache.calculate_equity(target_standard_error=0.01, **args)
+        assert result.standard_error <= 0.01
+        assert cache.statistics['hits'] == 1
+        assert cache.calculate_equity(target_standard_error=0.01, **args).trials == result.trials
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'equity.sqlite')
+        args = dict(hero=hand('Ah Kh'), villain=hand('Qd Qc'), board=hand('Qh 7h 2c'))
+        cache = equity_cache.EquityCache(path=path)
+        first = cache.calculate_equity(**args)
+        cache.close()
+
+        reader = equity_cache.EquityCache(path=path, read_only=True)
+        second = reader.calculate_equity(**args)
+        assert second.equity == first.equity
+        assert reader.statistics['disk_hits'] == 1
+        assert len(reader.disk) == 1
+        reader.close()
+
+    def test_read_only_store_rejects_writes(self, tmp_path):
+        path = str(tmp_path / 'equity.sqlite')
+        equity_cache.SQLiteStore(path=path).close()
+        store = equity_cache.SQLiteStore(path=path, read_only=True)
+        with pytest.raises(RuntimeError):
+            store.put(key=b'a', value=b'1')
+        store.close()
+
+    def test_table_uses_cache(self):
+        t = table.Table()
+        t.equity_cache = equity_cache.EquityCache()
+        t.apply_commands(commands=['F', 'T', 'R'])
+        first = t.calculate_hero_equity()
+        second = t.calculate_hero_equity()
+        assert second.equity == first.equity
+        assert t.equity_cache.statistics['hits'] == 1
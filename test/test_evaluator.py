@@ -0,0 +1,105 @@
+import itertools
+import random
+
+import pytest
+
+from common import cards, evaluator
+
+
+def brute_force_five_card_value(codes) -> int:
+    """
+    Independent, slow 5-card evaluator used as the reference implementation.
+    """
+    ranks = sorted((i_code >> 2 for i_code in codes), reverse=True)
+    is_flush = len({i_code & 3 for i_code in codes}) == 1
+    distinct = sorted(set(ranks), reverse=True)
+    straight_top = None
+    if len(distinct) == 5 and distinct[0] - distinct[4] == 4:
+        straight_top = distinct[0]
+    if distinct == [12, 3, 2, 1, 0]:
+        straight_top = 3
+
+    groups = sorted(((ranks.count(i_rank), i_rank) for i_rank in distinct), reverse=True)
+    shape = [i_count for (i_count, _) in groups]
+    ordered_ranks = [i_rank for (_, i_rank) in groups]
+
+    if straight_top is not None and is_flush:
+        key = (8, [straight_top])
+    elif shape == [4, 1]:
+        key = (7, ordered_ranks)
+    elif shape == [3, 2]:
+        key = (6, ordered_ranks)
+    elif is_flush:
+        key = (5, ordered_ranks)
+    elif straight_top is not None:
+        key = (4, [straight_top])
+    elif shape == [3, 1, 1]:
+        key = (3, ordered_ranks)
+    elif shape == [2, 2, 1]:
+        key = (2, ordered_ranks)
+    elif shape == [2, 1, 1, 1]:
+        key = (1, ordered_ranks)
+    else:
+        key = (0, ordered_ranks)
+
+    value = key[0] << 20
+    for (i_shift, i_rank) in zip(range(16, -4, -4), key[1]):
+        value |= i_rank << i_shift
+    return value
+
+
+def brute_force_value(codes) -> int:
+    return max(brute_force_five_card_value(i_combo) for i_combo in itertools.combinations(codes, 5))
+
+
+class TestEvaluate:
+
+    @pytest.mark.parametrize('number_of_cards', [5, 6, 7])
+    def test_matches_brute_force(self, number_of_cards) -> None:
+        rng = random.Random(number_of_cards)
+        for _ in range(3000):
+            codes = rng.sample(range(52), number_of_cards)
+            assert evaluator.evaluate_codes(codes) == brute_force_value(codes), codes
+        return
+
+    def test_there_are_7462_distinct_five_card_values(self) -> None:
+        values = set()
+        for i_ranks in itertools.combinations_with_replacement(range(13), 5):
+            if max(i_ranks.count(i_rank) for i_rank in i_ranks) > 4:
+                continue
+            # Suits cycle so that no five cards share a suit.
+            codes = [i_rank * 4 + i_index % 4 for (i_index, i_rank) in enumerate(i_ranks)]
+            values.add(evaluator.evaluate_codes(codes))
+            if len(set(i_ranks)) == 5:
+                values.add(evaluator.evaluate_codes([i_rank * 4 for i_rank in i_ranks]))
+        assert len(values) == 7462
+        return
+
+    def test_accepts_cards(self) -> None:
+        hand = [cards.Card.from_string(i_card) for i_card in ['As', 'Ks', 'Qs', 'Js', 'Ts', '2c', '3d']]
+        value = evaluator.evaluate(hand)
+        assert evaluator.category(value) == evaluator.STRAIGHT_FLUSH
+        assert evaluator.describe(value) == 'Straight Flush (A)'
+        return
+
+    def test_wheel_loses_to_six_high_straight(self) -> None:
+        wheel = [cards.Card.from_string(i_card) for i_card in ['Ah', '2s', '3d', '4c', '5c']]
+        six_high = [cards.Card.from_string(i_card) for i_card in ['6h', '2s', '3d', '4c', '5c']]
+        assert evaluator.evaluate(wheel) < evaluator.evaluate(six_high)
+        return
+
+    def test_too_few_cards_raises_value_error(self) -> None:
+        try:
+            evaluator.evaluate([0, 1, 2, 3])
+        except ValueError:
+            return
+        else:
+            assert False, 'No exception was raised.'
+
+    def test_duplicate_cards_raise_value_error(self) -> None:
+        try:
+            evaluator.evaluate([0, 0, 1, 2, 3])
+        except ValueError:
+            return
+        else:
+            assert False, 'No exception was raised.'
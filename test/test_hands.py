@@ -0,0 +1,39 @@
+from common import cards, hands
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestCombos:
+
+    def test_combo_index_round_trip(self) -> None:
+        for i_index in range(hands.NUMBER_OF_COMBOS):
+            assert hands.combo_index(*hands.combo_cards(i_index)) == i_index
+        return
+
+    def test_combo_index_ignores_card_order(self) -> None:
+        assert hands.combo_index(*hand('As Kd')) == hands.combo_index(*hand('Kd As'))
+        return
+
+    def test_pair_of_the_same_card_raises_value_error(self) -> None:
+        try:
+            hands.combo_index(*hand('As As'))
+        except ValueError:
+            return
+        else:
+            assert False, 'No exception was raised.'
+
+
+class TestHandClasses:
+
+    def test_hand_class_names(self) -> None:
+        assert hands.HAND_CLASSES[hands.hand_class_index(hand('As Ks'))] == 'AKs'
+        assert hands.HAND_CLASSES[hands.hand_class_index(hand('2d 7c'))] == '72o'
+        assert hands.HAND_CLASSES[hands.hand_class_index(hand('Td Tc'))] == 'TT'
+        return
+
+    def test_hand_class_sizes(self) -> None:
+        sizes = [len(hands.HAND_CLASS_COMBOS[hands.hand_class_index(i_name)]) for i_name in ['QQ', 'QJs', 'QJo']]
+        assert sizes == [6, 4, 12]
+        return
@@ -0,0 +1,73 @@
+import itertools
+import random
+
+from common import cards, evaluator, hands, isomorphism
+
+
+def permute_suits(codes, suit_map) -> list[int]:
+    return [i_code & ~3 | suit_map[i_code & 3] for i_code in codes]
+
+
+class TestCanonicalKey:
+
+    def test_starting_hands_collapse_to_hand_classes(self):
+        keys = {isomorphism.canonical_key(hole=i_combo) for i_combo in hands.COMBOS}
+        assert len(keys) == hands.NUMBER_OF_HAND_CLASSES
+
+    def test_invariant_under_suit_permutation(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            codes = rng.sample(range(52), 7)
+            suit_map = rng.sample(range(4), 4)
+            assert (isomorphism.canonical_key(hole=codes[:2], board=codes[2:])
+                    == isomorphism.canonical_key(hole=permute_suits(codes[:2], suit_map),
+                                                 board=permute_suits(codes[2:], suit_map)))
+
+    def test_hole_and_board_are_distinguished(self):
+        ah_kh = [cards.Card('A', 'h'), cards.Card('K', 'h')]
+        qh = [cards.Card('Q', 'h')]
+        assert isomorphism.canonical_key(hole=ah_kh, board=qh) != isomorphism.canonical_key(hole=qh + ah_kh[:1],
+                                                                                            board=ah_kh[1:])
+
+    def test_canonicalize_keeps_hand_values(self):
+        rng = random.Random(2)
+        for _ in range(200):
+            codes = rng.sample(range(52), 7)
+            hole, board = isomorphism.canonicalize(hole=codes[:2], board=codes[2:])
+            assert evaluator.evaluate_codes(hole + board) == evaluator.evaluate_codes(codes)
+            assert isomorphism.canonicalize(hole=hole, board=board) == (hole, board)
+
+
+class TestFlops:
+
+    def test_number_of_classes(self):
+        representatives, sizes = isomorphism.flop_classes()
+        assert len(representatives) == len(sizes) == isomorphism.NUMBER_OF_FLOP_CLASSES
+        assert sum(sizes) == 22100
+
+    def test_flop_index_matches_canonical_key(self):
+        indexes = {}
+        for i_flop in itertools.combinations(range(0, 52, 3), 3):
+            i_key = isomorphism.canonical_key(hole=(), board=i_flop)
+            assert indexes.setdefault(i_key, isomorphism.flop_index(flop=i_flop)) == isomorphism.flop_index(
+                flop=i_flop)
+
+    def test_representative_is_in_its_class(self):
+        representatives, _ = isomorphism.flop_classes()
+        for (i_index, i_flop) in enumerate(representatives):
+            assert isomorphism.flop_index(flop=i_flop) == i_index
+
+
+class TestSuitSymmetries:
+
+    def test_no_cards_allows_every_permutation(self):
+        assert len(isomorphism.suit_symmetries(groups=[])) == 24
+
+    def test_symmetries_fix_every_group(self):
+        groups = [[cards.Card('A', 'h'), cards.Card('K', 'h')], [cards.Card('Q', 's')]]
+        suit_maps = isomorphism.suit_symmetries(groups=groups)
+        assert suit_maps[0] == (0, 1, 2, 3)
+        assert len(suit_maps) == 2
+        for i_suit_map in suit_maps:
+            for i_group in groups:
+                assert sorted(permute_suits(cards.to_codes(i_group), i_suit_map)) == sorted(cards.to_codes(i_group))
@@ -0,0 +1,73 @@
+import pytest
+
+from common import cards, outs, ranges, table
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestCalculateOuts:
+
+    def test_flush_draw_against_overpair(self):
+        result = outs.calculate_outs(hero=hand('Ah 5h'), villain=hand('Kc Kd'), board=hand('Qh 7h 2c'))
+        by_draw = result.by_draw
+        assert len(by_draw['Flush']) == 9
+        assert set(by_draw['Pair']) == set(hand('Ac As Ad'))
+        assert len(result) == 12
+        assert len(result.shares) == 45
+
+    def test_no_outs_when_ahead(self):
+        result = outs.calculate_outs(hero=hand('Ac Ad'), villain=hand('Kc Kd'), board=hand('Ah 7h 2c'))
+        assert len(result) == 0
+
+    def test_open_ended_straight_draw_on_turn(self):
+        result = outs.calculate_outs(hero=hand('9c 8d'), villain=hand('As Kd'), board=hand('Th 7s 2c Ad'))
+        assert set(result.by_draw['Straight']) == set(hand('Jc Jd Jh Js 6c 6d 6h 6s'))
+        assert len(result.shares) == 44
+
+    def test_range_shares(self):
+        result = outs.calculate_outs(hero=hand('Ah 5h'), villain=ranges.Range('KK, QQ'), board=hand('Qh 7h 2c'))
+        # An ace beats the 6 combos of kings but not the 3 sets of queens.
+        assert result.shares[cards.Card('A', 's')] == pytest.approx(6 / 9)
+        assert cards.Card('A', 's') in result.outs
+        assert result.shares[cards.Card('3', 'h')] == 1.0
+
+    def test_river_board_raises_value_error(self):
+        with pytest.raises(ValueError):
+            outs.calculate_outs(hero=hand('Ah 5h'), villain=hand('Kc Kd'), board=hand('Qh 7h 2c 3d 4s'))
+
+
+class TestMultiwayOuts:
+
+    def test_out_must_beat_every_villain(self):
+        result = outs.multiway_outs(hero=hand('Ah 5h'), villains=[hand('Kc Kd'), hand('7c 7d')],
+                                    board=hand('Qh 7h 2c'))
+        # The set of sevens fills up on 2h and still beats a pair of aces.
+        assert set(result.outs) == set(hand('3h 4h 6h 8h 9h Th Jh Kh'))
+
+    def test_matches_heads_up(self):
+        result = outs.multiway_outs(hero=hand('Ah 5h'), villains=[ranges.Range('KK, QQ')], board=hand('Qh 7h 2c'))
+        assert result.shares[cards.Card('A', 's')] == pytest.approx(6 / 9)
+
+
+class TestTableOuts:
+
+    def test_outs_against_dealt_villain(self):
+        t = table.Table(villain_range=ranges.Range('22+'))
+        t.apply_commands(commands=['F', 'T'])
+        result = t.calculate_hero_outs()
+        assert len(result.shares) == 52 - 2 - 2 - 4
+        assert all(i_card not in result.shares for i_card in t.get_villain_seat().hand)
+
+    def test_outs_against_several_villains(self):
+        t = table.Table(villain_range=ranges.Range('22+'), number_of_villains=3)
+        t.apply_commands(commands=['F'])
+        result = t.calculate_hero_outs()
+        assert len(result.shares) == 52 - 2 - 3 * 2 - 3
+        assert all(0.0 <= i_share <= 1.0 for i_share in result.shares.values())
+
+    def test_outs_against_several_villains_without_cards(self):
+        t = table.Table(number_of_villains=3)
+        t.apply_commands(commands=['F'])
+        assert len(t.calculate_hero_outs().shares) == 52 - 2 - 3
@@ -0,0 +1,29 @@
+from common import cards, parallel
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestParallelEquity:
+
+    def test_result_does_not_depend_on_worker_count(self) -> None:
+        kwargs = dict(hero=hand('As Ah'), villain=hand('Kd Kc'), trials=12_000, seed=7)
+        single = parallel.parallel_equity(workers=1, **kwargs)
+        multiple = parallel.parallel_equity(workers=2, **kwargs)
+        assert single.trials == multiple.trials == 12_000
+        assert (single.wins, single.ties, single.losses) == (multiple.wins, multiple.ties, multiple.losses)
+        return
+
+    def test_different_seeds_give_different_samples(self) -> None:
+        first = parallel.parallel_equity(hero=hand('As Ah'), trials=2_000, seed=1, workers=1)
+        second = parallel.parallel_equity(hero=hand('As Ah'), trials=2_000, seed=2, workers=1)
+        assert first.wins != second.wins
+        return
+
+    def test_target_standard_error_stops_after_a_wave(self, monkeypatch) -> None:
+        monkeypatch.setattr(parallel, 'SHARD_TRIALS', 100)
+        result = parallel.parallel_equity(hero=hand('As Ah'), villain=hand('Kd Kc'), trials=10 ** 9,
+                                          target_standard_error=0.01, workers=1)
+        assert result.trials == parallel.SHARD_TRIALS * parallel.SHARDS_PER_WAVE
+        return
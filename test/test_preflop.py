@@ -0,0 +1,70 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from common import cards, equity, hands, preflop, ranges, table
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+@pytest.fixture(scope='module')
+def table_path(tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp('preflop') / 'preflop_equity.bin')
+    preflop.generate_table(path=path, number_of_boards=300, seed=1)
+    return path
+
+
+class TestPreflopEquityTable:
+
+    def test_file_size(self, table_path) -> None:
+        with open(table_path, 'rb') as file:
+            assert len(file.read()) == preflop.HEADER.size + 4 * hands.NUMBER_OF_HAND_CLASSES ** 2
+        return
+
+    def test_hand_equity(self, table_path) -> None:
+        equity_table = preflop.PreflopEquityTable(path=table_path)
+        aces_vs_kings = equity_table.hand_equity(hero=hand('As Ah'), villain=hand('Kd Kc')).equity
+        kings_vs_aces = equity_table.hand_equity(hero=hand('Kd Kc'), villain=hand('As Ah')).equity
+        assert 0.75 < aces_vs_kings < 0.89
+        assert aces_vs_kings + kings_vs_aces == pytest.approx(1.0, abs=1e-6)
+        equity_table.close()
+        return
+
+    def test_hand_equity_against_any_two_cards(self, table_path) -> None:
+        equity_table = preflop.PreflopEquityTable(path=table_path)
+        assert 0.8 < equity_table.hand_equity(hero=hand('As Ah'), villain=None).equity < 0.9
+        equity_table.close()
+        return
+
+    def test_invalid_file_raises_value_error(self, tmp_path) -> None:
+        path = tmp_path / 'not_a_table.bin'
+        path.write_bytes(b'\0' * 64)
+        with pytest.raises(ValueError):
+            preflop.PreflopEquityTable(path=str(path))
+        return
+
+    def test_table_uses_precomputed_equity_preflop(self, monkeypatch, table_path) -> None:
+        monkeypatch.setattr(preflop, 'DEFAULT_PATH', table_path)
+        t = table.Table()
+        t.run()
+        result = t.calculate_hero_equity()
+        assert isinstance(result, preflop.PreflopEquity)
+        return
+
+    def test_table_simulates_range_preflop(self, monkeypatch, table_path) -> None:
+        monkeypatch.setattr(preflop, 'DEFAULT_PATH', table_path)
+        t = table.Table()
+        t.run()
+        result = t.calculate_hero_equity(villain=ranges.Range('QQ+'), max_trials=2000)
+        assert isinstance(result, equity.EquityResult)
+        return
+
+    def test_table_simulates_known_villain_hand_preflop(self, monkeypatch, table_path) -> None:
+        monkeypatch.setattr(preflop, 'DEFAULT_PATH', table_path)
+        t = table.Table(villain_range=ranges.Range('22+'))
+        t.run()
+        result = t.calculate_hero_equity(max_trials=2000)
+        assert isinstance(result, equity.EquityResult)
+        return
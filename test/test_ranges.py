@@ -0,0 +1,184 @@
+import random
+
+import pytest
+
+from common import cards, equity, ranges, table
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestNotation:
+
+    @pytest.mark.parametrize('notation, number_of_combos', [
+        ('AA', 6),
+        ('AKs', 4),
+        ('AKo', 12),
+        ('AK', 16),
+        ('22+', 78),
+        ('QQ+', 18),
+        ('88-55', 24),
+        ('A2s+', 48),
+        ('KTo+', 36),
+        ('K9s-K6s', 16),
+        ('76s-54s', 12),
+        ('AsKs', 1),
+        ('22+, A2s+, KTo+, 76s-54s', 78 + 48 + 36 + 12),
+    ])
+    def test_number_of_combos(self, notation, number_of_combos) -> None:
+        assert len(ranges.Range(notation)) == number_of_combos
+        return
+
+    def test_membership(self) -> None:
+        hand_range = ranges.Range('A2s+, 76s-54s')
+        assert hand('As 5s') in hand_range
+        assert hand('6h 5h') in hand_range
+        assert hand('As 5d') not in hand_range
+        assert hand('8h 7h') not in hand_range
+        return
+
+    def test_weights(self) -> None:
+        hand_range = ranges.Range('QQ+, JTs:0.5')
+        assert hand_range.weight(hand('Js Ts')) == 0.5
+        assert hand_range.weight(hand('Qs Qd')) == 1.0
+        assert not hand_range.is_uniform
+        return
+
+    @pytest.mark.parametrize('notation', ['AAs', 'A1s', 'AKx', 'AKs-QQ', 'AKs-T8s', 'AK:x', 'AK:-1'])
+    def test_invalid_notation_raises_value_error(self, notation) -> None:
+        with pytest.raises(ValueError):
+            ranges.Range(notation)
+        return
+
+
+class TestSetOperations:
+
+    def test_union_and_intersection(self) -> None:
+        first = ranges.Range('TT+')
+        second = ranges.Range('QQ-88')
+        assert len(first | second) == len(ranges.Range('88+'))
+        assert first & second == ranges.Range('QQ-TT')
+        assert first - second == ranges.Range('KK+')
+        return
+
+    def test_without_removes_blocked_combos(self) -> None:
+        hand_range = ranges.Range('AA, AKs')
+        unblocked = hand_range.without(cards=hand('As'))
+        assert len(unblocked) == 3 + 3
+        assert len(hand_range) == 6 + 4
+        return
+
+    def test_table_removes_board_and_hero_blockers(self) -> None:
+        t = table.Table()
+        t.run()
+        t.deal_flop()
+        unblocked = t.get_unblocked_range(hand_range=ranges.Range.full())
+        assert len(unblocked) == 47 * 46 // 2
+        return
+
+
+class TestSampling:
+
+    def test_sample_follows_weights(self) -> None:
+        hand_range = ranges.Range('AsAh, KsKh:3')
+        rng = random.Random(1)
+        samples = [hand_range.sample(rng=rng) for _ in range(4000)]
+        kings = sum(1 for i_hand in samples if i_hand[0].rank == 'K')
+        assert 2800 < kings < 3200
+        return
+
+    def test_empty_range_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            ranges.Range().sample()
+        return
+
+
+class TestRangeEquity:
+
+    def test_weighted_enumeration(self) -> None:
+        board = hand('2c 7d 9h Js')
+        hand_range = ranges.Range('KdKc:3, AcKc')
+        result = equity.enumerate_equity(hero=hand('As Ah'), villain=hand_range, board=board)
+        kings = equity.enumerate_equity(hero=hand('As Ah'), villain=hand('Kd Kc'), board=board)
+        ace_king = equity.enumerate_equity(hero=hand('As Ah'), villain=hand('Ac Kc'), board=board)
+        assert result.equity == pytest.approx(0.75 * kings.equity + 0.25 * ace_king.equity)
+        return
+
+    def test_monte_carlo_with_range(self) -> None:
+        result = equity.monte_carlo_equity(hero=hand('As Ah'), villain=ranges.Range('KK, QQ'),
+                                           target_standard_error=0.01, rng=random.Random(1))
+        assert 0.75 < result.equity < 0.88
+        return
+
+
+class TestAliasTable:
+
+    def test_draws_follow_weights(self) -> None:
+        alias_table = ranges.AliasTable(weights=[1.0, 0.0, 3.0, 4.0])
+        rng = random.Random(1)
+        counts = [0, 0, 0, 0]
+        for _ in range(8000):
+            counts[alias_table.draw(rng=rng)] += 1
+        assert counts[1] == 0
+        assert 800 < counts[0] < 1200
+        assert 2700 < counts[2] < 3300
+        assert 3600 < counts[3] < 4400
+        return
+
+    def test_no_positive_weights_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            ranges.AliasTable(weights=[0.0, 0.0])
+        return
+
+
+class TestRangeDeal:
+
+    def test_deal_skips_dead_cards(self) -> None:
+        hand_range = ranges.Range('AA, KK')
+        dead_mask = cards.to_mask(hand('As Ah Kd'))
+        rng = random.Random(1)
+        for _ in range(50):
+            dealt = hand_range.deal(dead_mask=dead_mask, rng=rng)
+            assert cards.to_mask(dealt) & dead_mask == 0
+        return
+
+    def test_deal_rebuilds_after_cards_return(self) -> None:
+        hand_range = ranges.Range('AA, KK')
+        rng = random.Random(1)
+        dead_mask = cards.to_mask(hand('As Ah Ad Ac'))
+        assert hand_range.deal(dead_mask=dead_mask, rng=rng)[0].rank == 'K'
+        kings_dead = cards.to_mask(hand('Ks Kh Kd Kc'))
+        assert hand_range.deal(dead_mask=kings_dead, rng=rng)[0].rank == 'A'
+        return
+
+    def test_deal_follows_weights(self) -> None:
+        hand_range = ranges.Range('AsAh, KsKh:3')
+        rng = random.Random(1)
+        kings = sum(1 for _ in range(4000) if hand_range.deal(rng=rng)[0].rank == 'K')
+        assert 2800 < kings < 3200
+        return
+
+    def test_fully_blocked_range_raises_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            ranges.Range('AsAh').deal(dead_mask=cards.to_mask(hand('As')))
+        return
+
+
+class TestTableRangeDealing:
+
+    def test_hero_is_dealt_from_range(self) -> None:
+        t = table.Table(hero_range=ranges.Range('AA'))
+        t.run()
+        assert [i_card.rank for i_card in t.get_heros_hand()] == ['A', 'A']
+        assert t.deck.number_of_cards_not_dealt == 50
+        return
+
+    def test_villain_is_dealt_from_seat_range(self) -> None:
+        seat_ranges = {i_name: ranges.Range('KK') for i_name in ['UTG', 'UTG+1', 'UTG+2', 'LJ', 'HJ',
+                                                                 'CO', 'BTN', 'SB', 'BB']}
+        t = table.Table(hero_range=ranges.Range('AA'), villain_range=seat_ranges)
+        t.run()
+        assert [i_card.rank for i_card in t.get_villain_seat().hand] == ['K', 'K']
+        assert t.deck.number_of_cards_not_dealt == 48
+        return
@@ -0,0 +1,54 @@
+import pytest
+
+import common.cards
+import common.rng
+import common.scenarios
+import common.table
+
+
+def deal_scenarios(rng) -> list[dict]:
+    t = common.table.Table(rng=rng)
+    return list(common.scenarios.generate_scenarios(count=20, table=t))
+
+
+class TestSeededTable:
+
+    def test_same_seed_same_hands(self):
+        assert deal_scenarios(rng=common.rng.make_rng(seed=5)) == deal_scenarios(rng=common.rng.make_rng(seed=5))
+
+    def test_different_seed_different_hands(self):
+        assert deal_scenarios(rng=common.rng.make_rng(seed=5)) != deal_scenarios(rng=common.rng.make_rng(seed=6))
+
+    def test_deck_uses_table_rng(self):
+        t = common.table.Table(rng=common.rng.make_rng(seed=1))
+        assert t.deck.rng is t.rng
+
+    def test_seeded_deck(self):
+        first = common.cards.Deck(rng=common.rng.make_rng(seed=2)).deal_cards(number_of_cards=52)
+        second = common.cards.Deck(rng=common.rng.make_rng(seed=2)).deal_cards(number_of_cards=52)
+        assert first == second
+        assert len(set(first)) == 52
+
+
+class TestBlockRandom:
+
+    @pytest.fixture(autouse=True)
+    def numpy(self):
+        pytest.importorskip('numpy')
+
+    def test_same_seed_same_hands(self):
+        first = deal_scenarios(rng=common.rng.make_rng(seed=5, use_numpy=True))
+        assert first == deal_scenarios(rng=common.rng.make_rng(seed=5, use_numpy=True))
+
+    def test_values_across_blocks(self):
+        rng = common.rng.BlockRandom(seed=3, block_size=16)
+        values = [rng.random() for _ in range(100)]
+        assert all(0.0 <= i_value < 1.0 for i_value in values)
+        assert len(set(values)) == 100
+        rng.seed(3)
+        assert [rng.random() for _ in range(100)] == values
+
+    def test_derived_methods(self):
+        rng = common.rng.BlockRandom(seed=4)
+        assert all(0 <= rng.randrange(9) < 9 for _ in range(1000))
+        assert sorted(rng.sample(range(10), k=10)) == list(range(10))
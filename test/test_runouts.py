@@ -0,0 +1,65 @@
+import inspect
+
+import pytest
+
+from common import cards, evaluator, runouts, table
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestRunouts:
+
+    def test_is_lazy(self):
+        assert inspect.isgenerator(runouts.runouts())
+
+    def test_all_flops(self):
+        assert sum(1 for _ in runouts.runouts(number_of_cards=3)) == 22100
+
+    def test_flops_collapse_to_classes(self):
+        flops = list(runouts.runouts(number_of_cards=3, isomorphic=True))
+        assert len(flops) == 1755
+        assert sum(i_weight for (_, i_weight) in flops) == 22100
+
+    def test_turn_and_river_from_flop(self):
+        board = hand('Qh 7h 2c')
+        boards = list(runouts.runouts(board=board, hands=[hand('Ah Kh')]))
+        assert len(boards) == 1081
+        assert all(i_board[:3] == tuple(board) and len(i_board) == 5 for (i_board, _) in boards)
+        assert len({frozenset(i_board) for (i_board, _) in boards}) == 1081
+
+    def test_isomorphic_weights_keep_equity(self):
+        hero = hand('Ah Kh')
+        villain = hand('Kc Kd')
+        board = hand('Qh 7h 2s')
+
+        def wins(isomorphic: bool) -> int:
+            total = 0
+            for (i_board, i_weight) in runouts.runouts(board=board, hands=[hero, villain], isomorphic=isomorphic):
+                if evaluator.evaluate(hero + list(i_board)) > evaluator.evaluate(villain + list(i_board)):
+                    total += i_weight
+            return total
+
+        isomorphic_runouts = list(runouts.runouts(board=board, hands=[hero, villain], isomorphic=True))
+        assert len(isomorphic_runouts) < 990
+        assert sum(i_weight for (_, i_weight) in isomorphic_runouts) == 990
+        assert wins(isomorphic=True) == wins(isomorphic=False)
+
+    def test_too_many_cards_raises_value_error(self):
+        with pytest.raises(ValueError):
+            next(runouts.runouts(board=hand('Qh 7h 2c'), number_of_cards=3))
+
+
+class TestTableRunouts:
+
+    def test_preflop_yields_flops(self):
+        t = table.Table()
+        t.apply()
+        assert sum(1 for _ in t.runouts()) == 19600
+
+    def test_flop_yields_turns_and_rivers(self):
+        t = table.Table()
+        t.apply(command='F')
+        assert sum(1 for _ in t.runouts()) == 1081
+        assert sum(i_weight for (_, i_weight) in t.runouts(isomorphic=True)) == 1081
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+import common.scenarios
+
+
+class TestGenerateScenarios:
+
+    def test_count(self):
+        scenarios = list(common.scenarios.generate_scenarios(count=25))
+        assert len(scenarios) == 25
+
+    @pytest.mark.parametrize('street,board_length', [('preflop', 0), ('flop', 3), ('turn', 4), ('river', 5)])
+    def test_board_length(self, street, board_length):
+        for i_scenario in common.scenarios.generate_scenarios(count=5, street=street):
+            assert len(i_scenario['board']) == board_length
+            assert len(i_scenario['hero_hand']) == 2
+
+    def test_cards_unique(self):
+        for i_scenario in common.scenarios.generate_scenarios(count=50):
+            cards = i_scenario['hero_hand'] + i_scenario['villain_hand'] + i_scenario['board']
+            assert len(cards) == len(set(cards))
+
+    def test_invalid_street(self):
+        with pytest.raises(ValueError):
+            list(common.scenarios.generate_scenarios(count=1, street='showdown'))
+
+
+class TestFormats:
+
+    def test_jsonl_round_trip(self):
+        scenarios = list(common.scenarios.generate_scenarios(count=20))
+        file = io.StringIO()
+        assert common.scenarios.write_jsonl(scenarios=scenarios, file=file) == 20
+        file.seek(0)
+        assert list(common.scenarios.read_jsonl(file=file)) == scenarios
+
+    def test_binary_round_trip(self):
+        scenarios = list(common.scenarios.generate_scenarios(count=20, street='turn'))
+        file = io.BytesIO()
+        assert common.scenarios.write_binary(scenarios=scenarios, file=file) == 20
+        assert len(file.getvalue()) == 20 * common.scenarios.RECORD.size
+        file.seek(0)
+        assert list(common.scenarios.read_binary(file=file)) == scenarios
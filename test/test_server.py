@@ -0,0 +1,115 @@
+import asyncio
+import concurrent.futures
+
+from common import outs, server
+
+
+async def read_prompt(reader: asyncio.StreamReader) -> str:
+    return (await reader.readuntil(server.PROMPT.encode())).decode()
+
+
+async def send(writer: asyncio.StreamWriter, command: str) -> None:
+    writer.write(f'{command}\n'.encode())
+    await writer.drain()
+    return
+
+
+async def start(drill_server: server.DrillServer):
+    tcp_server = await drill_server.start(port=0)
+    port = tcp_server.sockets[0].getsockname()[1]
+    return tcp_server, port
+
+
+class TestDrillServer:
+
+    def test_session_plays_to_the_river(self):
+        async def scenario():
+            drill_server = server.DrillServer()
+            tcp_server, port = await start(drill_server=drill_server)
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            assert 'F: Deal the flop' in await read_prompt(reader=reader)
+            for i_command, i_expected in [('F', 'T: Deal the turn'), ('x', 'Invalid input.'),
+                                          ('T', 'R: Deal the river'), ('R', 'R: Re-deal the river')]:
+                await send(writer=writer, command=i_command)
+                assert i_expected in await read_prompt(reader=reader)
+            await send(writer=writer, command='E')
+            assert 'Equity:' in await read_prompt(reader=reader)
+            await send(writer=writer, command='Q')
+            assert await reader.read() == b''
+            writer.close()
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            drill_server.close()
+            return drill_server
+
+        drill_server = asyncio.run(scenario())
+        assert isinstance(drill_server.executor, concurrent.futures.ProcessPoolExecutor)
+        assert drill_server.number_of_sessions == 0
+        assert drill_server.pool.number_of_free_tables == 1
+
+    def test_failed_command_keeps_session(self, monkeypatch):
+        def fail(**kwargs):
+            raise ValueError('No outs here.')
+
+        monkeypatch.setattr(outs, 'multiway_outs', fail)
+
+        async def scenario():
+            drill_server = server.DrillServer(executor=concurrent.futures.ThreadPoolExecutor(max_workers=1))
+            tcp_server, port = await start(drill_server=drill_server)
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await read_prompt(reader=reader)
+            await send(writer=writer, command='F')
+            await read_prompt(reader=reader)
+            await send(writer=writer, command='O')
+            prompt = await read_prompt(reader=reader)
+            await send(writer=writer, command='T')
+            next_prompt = await read_prompt(reader=reader)
+            await send(writer=writer, command='Q')
+            await reader.read()
+            writer.close()
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            return prompt, next_prompt
+
+        prompt, next_prompt = asyncio.run(scenario())
+        assert 'Error: No outs here.' in prompt
+        assert 'R: Deal the river' in next_prompt
+
+    def test_many_concurrent_sessions(self):
+        async def session(port: int) -> None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await read_prompt(reader=reader)
+            await send(writer=writer, command='F')
+            assert 'T: Deal the turn' in await read_prompt(reader=reader)
+            await send(writer=writer, command='Q')
+            await reader.read()
+            writer.close()
+            return
+
+        async def scenario():
+            drill_server = server.DrillServer()
+            tcp_server, port = await start(drill_server=drill_server)
+            await asyncio.gather(*(session(port=port) for _ in range(50)))
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            return drill_server
+
+        drill_server = asyncio.run(scenario())
+        assert drill_server.number_of_sessions == 0
+        assert drill_server.pool.number_of_free_tables == 50
+
+    def test_idle_session_is_closed(self):
+        async def scenario():
+            drill_server = server.DrillServer(idle_timeout=0.05)
+            tcp_server, port = await start(drill_server=drill_server)
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await read_prompt(reader=reader)
+            remaining = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            return remaining, drill_server
+
+        remaining, drill_server = asyncio.run(scenario())
+        assert b'timed out' in remaining
+        assert drill_server.number_of_sessions == 0
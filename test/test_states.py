@@ -12,6 +12,8 @@ prompt_options = {
     'FLOP': 'F',
     'TURN': 'T',
     'RIVER': 'R',
+    'EQUITY': 'E',
+    'OUTS': 'O',
 }
 
 
@@ -173,6 +175,15 @@ class TestPreFlop:
         table.run()
         assert type(table.state) == common.table.PreFlop
 
+    @staticmethod
+    def test_equity_transitions_to_preflop(monkeypatch, table_preflop):
+        monkeypatch.setattr('builtins.input', lambda _: prompt_options['EQUITY'])
+
+        table = table_preflop
+        table.run()
+        assert type(table.state) == common.table.PreFlop
+        assert table.deck.number_of_cards_not_dealt == 50
+
     @staticmethod
     def test_flop_transitions_to_flop(monkeypatch, table_preflop):
         monkeypatch.setattr('builtins.input', lambda _: prompt_options['FLOP'])
@@ -196,6 +207,19 @@ class TestFlop:
         assert table_flop.deck.number_of_cards_not_dealt == 47
 
 
+class TestFlopOuts:
+
+    @staticmethod
+    def test_outs_stays_on_flop(monkeypatch, capsys, table_flop):
+        monkeypatch.setattr('builtins.input', lambda _: prompt_options['OUTS'])
+
+        table = table_flop
+        table.run()
+        assert type(table.state) == common.table.Flop
+        assert table.deck.number_of_cards_not_dealt == 47
+        assert 'Outs:' in capsys.readouterr().out
+
+
 class TestFlopAfterReFlop:
 
     @staticmethod
@@ -229,3 +253,58 @@ class TestRiverAfterReRiver:
     @staticmethod
     def test_deck_stub_has_45_cards(table_river_after_reriver):
         assert table_river_after_reriver.deck.number_of_cards_not_dealt == 45
+
+
+class TestApply:
+
+    @staticmethod
+    def test_apply_without_command_runs_init(table_init):
+        state = table_init.apply()
+        assert type(state) == common.table.PreFlop
+        assert table_init.deck.number_of_cards_not_dealt == 50
+
+    @staticmethod
+    def test_apply_runs_init_then_command(table_init):
+        state = table_init.apply(prompt_options['FLOP'])
+        assert type(state) == common.table.Flop
+        assert table_init.deck.number_of_cards_not_dealt == 47
+
+    @staticmethod
+    def test_apply_commands_to_the_river(table_init):
+        state = table_init.apply_commands(['F', 'F', 'T', 'T', 'R', 'R'])
+        assert type(state) == common.table.River
+        assert table_init.deck.number_of_cards_not_dealt == 45
+        assert len(table_init.board) == 5
+
+    @staticmethod
+    def test_apply_lower_case_command(table_preflop):
+        state = table_preflop.apply('f')
+        assert type(state) == common.table.Flop
+
+    @staticmethod
+    def test_apply_start_over(table_preflop):
+        state = table_preflop.apply(prompt_options['START_OVER'])
+        assert type(state) == common.table.Init
+        state = table_preflop.apply()
+        assert type(state) == common.table.PreFlop
+        assert table_preflop.deck.number_of_cards_not_dealt == 50
+
+    @staticmethod
+    def test_front_end_commands_are_ignored(table_preflop):
+        for i_command in [prompt_options['EQUITY'], prompt_options['QUIT']]:
+            state = table_preflop.apply(i_command)
+            assert type(state) == common.table.PreFlop
+
+    @staticmethod
+    def test_invalid_command_raises_value_error(table_preflop):
+        with pytest.raises(ValueError):
+            table_preflop.apply(prompt_options['RIVER'])
+
+    @staticmethod
+    def test_apply_does_no_io(monkeypatch, capsys, table_init):
+        def fail(*args):
+            raise AssertionError('input() called.')
+
+        monkeypatch.setattr('builtins.input', fail)
+        table_init.apply_commands(['H', 'S', 'V', 'F', 'T', 'R'])
+        assert capsys.readouterr().out == ''
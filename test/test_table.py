@@ -1,6 +1,6 @@
 import pytest
 
-from common import table
+from common import evaluator, ranges, table
 
 
 @pytest.fixture(scope='function')
@@ -140,3 +140,172 @@ class TestGetVillainSeat:
             assert False, 'Wrong exception raised.'
         else:
             assert False, 'No exception raised.'
+
+
+class TestReset:
+
+    def test_reset_reuses_objects(self, t):
+        t.apply_commands(commands=['F', 'T', 'R'])
+        seats = list(t.seats)
+        deck = t.deck
+        init_state = t.get_state(state_class=table.Init)
+        t.reset()
+        assert t.seats == seats
+        assert t.deck is deck
+        assert t.state is init_state
+        assert all(i_seat.role is None and i_seat.hand == [] for i_seat in t.seats)
+        assert t.deck.number_of_cards_not_dealt == 52
+        assert t.board == []
+
+    def test_play_after_reset(self, t):
+        t.apply_commands(commands=['F', 'T'])
+        t.reset()
+        state = t.apply_commands(commands=['F', 'T', 'R'])
+        assert type(state) == table.River
+        assert t.deck.number_of_cards_not_dealt == 45
+
+    def test_states_are_reused(self, t):
+        t.apply(command='F')
+        flop_state = t.state
+        t.apply(command='N')
+        t.apply(command='F')
+        assert t.state is flop_state
+
+
+class TestTablePool:
+
+    def test_released_table_is_reused(self):
+        pool = table.TablePool()
+        first = pool.acquire()
+        first.apply_commands(commands=['F', 'T'])
+        pool.release(table=first)
+        assert pool.number_of_free_tables == 1
+        villain_range = ranges.Range('AA')
+        second = pool.acquire(villain_range=villain_range)
+        assert second is first
+        assert pool.number_of_free_tables == 0
+        assert type(second.state) == table.Init
+        second.apply()
+        assert len(second.get_villain_seat().hand) == 2
+
+    def test_empty_pool_builds_table(self):
+        pool = table.TablePool()
+        assert pool.acquire() is not pool.acquire()
+
+
+class TestSeatIndexes:
+
+    def test_index_follows_direct_role_changes(self, t):
+        seat = t.get_seat_by_number(seat_number=5)
+        seat.role = 'V'
+        assert t.get_villain_seat() is seat
+        assert seat not in t.get_seat_set_by_role(role=None)
+        seat.role = None
+        assert t.get_villain_seat() is None
+        assert len(t.get_seat_set_by_role(role=None)) == 9
+
+    def test_random_empty_seat_is_empty(self, t):
+        for i_seat_number in [1, 2, 4, 7, 9]:
+            t.assign_role_to_seat(seat=t.get_seat_by_number(seat_number=i_seat_number), role='V')
+        for _ in range(100):
+            assert t.get_random_empty_seat().number in [3, 5, 6, 8]
+
+    def test_no_empty_seat(self, t):
+        for i_seat in t.seats:
+            t.assign_role_to_seat(seat=i_seat, role='V')
+        with pytest.raises(IndexError):
+            t.get_random_empty_seat()
+
+    def test_more_seats(self):
+        names = [f'Seat {i_number}' for i_number in range(1, 11)]
+        ten_handed = table.Table(seat_names=names)
+        assert len(ten_handed.seats) == 10
+        assert ten_handed.get_seat_by_number(seat_number=10).name == 'Seat 10'
+        ten_handed.apply_commands(commands=['F', 'T', 'R'])
+        assert ten_handed.get_hero_seat() is not ten_handed.get_villain_seat()
+
+
+class TestHandValues:
+
+    def test_values_match_full_evaluation_across_redeals(self, t):
+        t.apply_commands(commands=['F', 'T', 'R'])
+        for i_command in ['R'] * 5 + ['N', 'F', 'T', 'T', 'R']:
+            t.apply(command=i_command)
+            if t.board:
+                i_seat = t.get_hero_seat()
+                assert t.get_hand_value(seat=i_seat) == evaluator.evaluate(i_seat.hand + t.board)
+
+    def test_redeal_reuses_fixed_state(self, t):
+        t.apply_commands(commands=['F', 'T'])
+        seat = t.get_hero_seat()
+        t.get_hand_value(seat=seat)
+        state = t._hand_states[seat.number][1]
+        t.apply(command='T')
+        t.get_hand_value(seat=seat)
+        assert t._hand_states[seat.number][1] is state
+
+    def test_values_by_card(self):
+        t = table.Table(villain_range=ranges.Range('22+'))
+        t.apply_commands(commands=['F', 'T'])
+        seat = t.get_villain_seat()
+        values = t.get_hand_values_by_card(seat=seat)
+        assert len(values) == 52 - 2 - 2 - 4 + 1
+        for (i_card, i_value) in values.items():
+            assert i_value == evaluator.evaluate(seat.hand + t.flop + [i_card])
+
+    def test_preflop_raises_value_error(self, t):
+        t.apply()
+        with pytest.raises(ValueError):
+            t.get_hand_value(seat=t.get_hero_seat())
+
+
+class TestSnapshots:
+
+    def test_undo_restores_previous_runout(self, t):
+        t.apply_commands(commands=['F', 'T'])
+        board = t.board
+        dealt_mask = t.deck.dealt_mask
+        t.apply(command='T')
+        t.apply(command='R')
+        assert type(t.undo()) == table.Turn
+        assert type(t.undo()) == table.Turn
+        assert t.board == board
+        assert t.deck.dealt_mask == dealt_mask
+
+    def test_undo_new_hand(self, t):
+        t.apply_commands(commands=['F'])
+        hero_seat = t.get_hero_seat()
+        hand = list(hero_seat.hand)
+        t.apply(command='N')
+        t.apply()
+        t.undo()
+        assert t.get_hero_seat() is hero_seat
+        assert hero_seat.hand == hand
+        assert len(t.get_seat_set_by_role(role=None)) == 7
+
+    def test_nothing_to_undo(self, t):
+        t.apply(command='E')
+        with pytest.raises(RuntimeError):
+            t.undo()
+
+    def test_branches_share_structure(self, t):
+        t.apply_commands(commands=['F'])
+        flop_snapshot = t.snapshot()
+        turn_snapshots = []
+        for _ in range(5):
+            t.restore(snapshot=flop_snapshot)
+            t.deal_turn()
+            turn_snapshots.append(t.snapshot())
+        assert len({i_snapshot.turn for i_snapshot in turn_snapshots}) > 1
+        assert all(i_snapshot.hands is flop_snapshot.hands for i_snapshot in turn_snapshots)
+        assert all(i_snapshot.flop is flop_snapshot.flop for i_snapshot in turn_snapshots)
+
+    def test_branch_leaves_table_alone(self, t):
+        t.apply_commands(commands=['F', 'T'])
+        board = t.board
+        branch = t.branch()
+        branch.apply_commands(commands=['T', 'R'])
+        assert t.board == board
+        assert branch.board[:3] == board[:3]
+        assert branch.get_heros_hand() == t.get_heros_hand()
+        assert branch.deck.number_of_cards_not_dealt == 52 - 2 - 5
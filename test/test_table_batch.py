@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import common.table
+import common.table_batch
+
+
+@pytest.fixture(scope='function')
+def batch() -> 'common.table_batch.TableBatch':
+    batch = common.table_batch.TableBatch(number_of_tables=500, rng=np.random.default_rng(7))
+    batch.assign_role_to_random_empty_seats(role='H')
+    batch.assign_role_to_random_empty_seats(role='V')
+    batch.deal_to_role(role='H')
+    batch.deal_to_role(role='V')
+    return batch
+
+
+class TestTableBatch:
+
+    def test_decks_are_permutations(self):
+        batch = common.table_batch.TableBatch(number_of_tables=100)
+        assert (np.sort(batch.decks, axis=1) == np.arange(52)).all()
+
+    def test_roles(self, batch):
+        hero_seats = batch.get_seat_numbers_by_role(role='H')
+        villain_seats = batch.get_seat_numbers_by_role(role='V')
+        assert ((hero_seats >= 1) & (hero_seats <= 9)).all()
+        assert (hero_seats != villain_seats).all()
+        assert ((batch.roles != 0).sum(axis=1) == 2).all()
+
+    def test_invalid_role(self, batch):
+        with pytest.raises(ValueError):
+            batch.assign_role_to_random_empty_seats(role='X')
+
+    def test_cards_unique(self, batch):
+        batch.deal_flop()
+        batch.deal_turn()
+        batch.deal_river()
+        cards = np.concatenate([batch.hands.reshape(len(batch), -1), batch.board], axis=1)
+        for i_row in cards:
+            i_dealt = i_row[i_row >= 0]
+            assert len(i_dealt) == 9
+            assert len(set(i_dealt.tolist())) == 9
+
+    def test_streets_in_order(self, batch):
+        with pytest.raises(RuntimeError):
+            batch.deal_turn()
+        batch.deal_flop()
+        assert batch.board.shape == (500, 3)
+        batch.deal_turn()
+        batch.deal_flop()
+        assert batch.board.shape == (500, 3)
+        assert batch.number_of_cards_dealt == 4 + 3 + 1 + 3
+
+    def test_to_table(self, batch):
+        batch.deal_flop()
+        batch.deal_turn()
+        table = batch.to_table(index=3)
+        assert isinstance(table.state, common.table.Turn)
+        hero_seat = table.get_hero_seat()
+        assert hero_seat.number == batch.get_seat_numbers_by_role(role='H')[3]
+        assert [i_card.code for i_card in hero_seat.hand] == batch.hands[3, hero_seat.number - 1].tolist()
+        assert [i_card.code for i_card in table.board] == batch.board[3].tolist()
+        assert table.deck.number_of_cards_dealt == 8
+        table.apply(command='R')
+        assert len(table.board) == 5
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from common import cards, table, textures
+
+
+def hand(text: str) -> list[cards.Card]:
+    return [cards.Card.from_string(i_card) for i_card in text.split()]
+
+
+class TestClassify:
+
+    @pytest.mark.parametrize('flop,expected', [
+        ('Ah Kh Qh', ['monotone', 'unpaired', 'connected', 'ace-high', 'high']),
+        ('7c 7d 2s', ['rainbow', 'paired', 'disconnected', 'low']),
+        ('5c 4c 3d', ['two-tone', 'unpaired', 'connected', 'low']),
+        ('Ac 2d 4h', ['rainbow', 'unpaired', 'connected', 'ace-high']),
+        ('9s 9d 9h', ['rainbow', 'trips', 'disconnected', 'low']),
+        ('Kd 7c 2c', ['two-tone', 'unpaired', 'disconnected']),
+    ])
+    def test_textures(self, flop, expected):
+        assert textures.texture_names(flags=textures.classify(flop=hand(flop))) == expected
+
+    def test_invalid_flop(self):
+        with pytest.raises(ValueError):
+            textures.classify(flop=hand('Ah Kh'))
+
+    def test_invalid_texture(self):
+        with pytest.raises(ValueError):
+            textures.bucket(texture='wet')
+
+
+class TestBuckets:
+
+    @pytest.mark.parametrize('texture,size', [('monotone', 1144), ('paired', 3744), ('trips', 52),
+                                              ('rainbow', 8788)])
+    def test_bucket_sizes(self, texture, size):
+        assert len(textures.bucket(texture=texture)) == size
+
+    def test_partitions(self):
+        for i_group in [('monotone', 'two-tone', 'rainbow'), ('unpaired', 'paired', 'trips'),
+                        ('connected', 'disconnected')]:
+            assert sum(len(textures.bucket(texture=i_name)) for i_name in i_group) == 22100
+
+    def test_combined_bucket(self):
+        connected_low = textures.bucket(texture=('connected', 'low'))
+        assert connected_low
+        assert all(textures.flop_flags(flop=textures._cards(mask=i_flop)) & textures.texture_mask(
+            texture=('connected', 'low')) == textures.texture_mask(texture=('connected', 'low'))
+            for i_flop in connected_low)
+
+
+class TestDealFlop:
+
+    def test_dealt_flop_has_texture_and_avoids_dead_cards(self):
+        rng = random.Random(1)
+        dead = hand('Ah Kh Qh Jh')
+        dead_mask = cards.to_mask(dead)
+        for _ in range(200):
+            flop = textures.deal_flop(texture=('monotone', 'high'), dead_mask=dead_mask, rng=rng)
+            assert 'monotone' in textures.texture_names(flags=textures.classify(flop=flop))
+            assert not cards.to_mask(flop) & dead_mask
+
+    def test_blocked_texture_raises_value_error(self):
+        # Two suits dead: no rank has three live cards left.
+        dead_mask = cards.to_mask([i_card for i_card in cards.CARDS if i_card.suit in 'cd'])
+        with pytest.raises(ValueError):
+            textures.deal_flop(texture='trips', dead_mask=dead_mask)
+
+    def test_table_deals_textured_flops(self):
+        t = table.Table()
+        t.flop_texture = 'paired'
+        t.apply_commands(commands=['F', 'F', 'F'])
+        assert 'paired' in textures.texture_names(flags=textures.classify(flop=t.flop))
+        assert t.deck.number_of_cards_not_dealt == 47